@@ -11,6 +11,32 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = 10000  # Verified tokens kept in memory; 0 disables the cache
+    AUTH_TOKEN_CACHE_MAX_TTL_SECONDS: int = 600  # Re-verify at least this often even if exp is later
+
+    # Prometheus-format /metrics endpoint and request instrumentation
+    METRICS_ENABLED: bool = True
+
+    # Opt-in request profiling (X-Profile: 1 with an admin token, or random sampling)
+    PROFILING_ENABLED: bool = True
+    PROFILING_SAMPLE_RATE: float = 0.0  # Fraction of all requests profiled without being asked
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_FILES: int = 100
+    PROFILING_MAX_CONCURRENT: int = 2
+
+    # Request moderation (phone/email redaction in JSON string values); opt-in
+    MODERATION_ENABLED: bool = False
+    # Path prefixes left untouched: credentials, contact details and chat sessions must reach the app intact
+    MODERATION_SKIP_PATHS: List[str] = ["/api/auth", "/api/seller/applications", "/api/admin", "/api/chatbot"]
+    # Keys whose string values are never redacted (accounts and sessions are keyed on them)
+    MODERATION_PRESERVED_FIELDS: List[str] = ["email", "user_email", "username", "user_username"]
+    MODERATION_MAX_CARRY_CHARS: int = 320  # Longest phone/email that is still joined across body chunks
+
+    # Password hashing (bcrypt runs on its own executor, not the request threadpool)
+    BCRYPT_ROUNDS: int = 12  # Stored hashes with a different cost are re-hashed on the next login
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64  # Logins waiting beyond this are rejected with 503
     
     # CORS - Allow both localhost and 127.0.0.1 for development
     # Using List[str] type hint for better Pydantic parsing
@@ -39,7 +65,58 @@ class Settings(BaseSettings):
     WATSONX_URL: Optional[str] = None
     WATSONX_MODEL_ID: str = "llama-3-405b-instruct"
     WATSONX_ENABLED: bool = False
-    
+
+    # Watson HTTP client (shared async connection pool for IAM, Orchestrate and watsonx)
+    WATSON_IAM_URL: str = "https://iam.cloud.ibm.com/identity/token"
+    WATSON_HTTP_MAX_CONNECTIONS: int = 50
+    WATSON_HTTP_MAX_KEEPALIVE: int = 20
+    WATSON_HTTP_PER_HOST_LIMIT: int = 10  # Concurrent in-flight requests per upstream host
+    WATSON_HTTP_CONNECT_TIMEOUT: float = 5.0
+    WATSON_IAM_TIMEOUT: float = 10.0
+    WATSON_IAM_REFRESH_MARGIN: int = 300  # Seconds before expiry to refresh cached IAM tokens
+    WATSON_REQUEST_TIMEOUT: float = 30.0
+    WATSON_STREAM_IDLE_TIMEOUT: float = 30.0  # Longest pause between streamed deltas (agent tool calls)
+    WATSON_HEDGE_ENABLED: bool = True  # Race watsonx against a slow Orchestrate data query
+    WATSON_HEDGE_DELAY_SECONDS: float = 2.0  # Orchestrate silence before watsonx is also dispatched
+    WATSON_HEDGE_QUEUE_SIZE: int = 64  # Orchestrate deltas buffered ahead of a slow client
+
+    # Per-backend circuit breakers and adaptive timeouts (WATSON_REQUEST_TIMEOUT is the ceiling)
+    WATSON_BREAKER_WINDOW: int = 20  # Recent calls considered for the failure rate
+    WATSON_BREAKER_MIN_CALLS: int = 5
+    WATSON_BREAKER_FAILURE_RATE: float = 0.5
+    WATSON_BREAKER_OPEN_SECONDS: float = 30.0  # Fail fast this long before probing again
+    WATSON_ADAPTIVE_TIMEOUT_PERCENTILE: float = 0.99
+    WATSON_ADAPTIVE_TIMEOUT_MULTIPLIER: float = 2.0
+    WATSON_ADAPTIVE_TIMEOUT_MIN: float = 5.0
+
+    # Watson response cache (repeated chatbot questions)
+    WATSON_RESPONSE_CACHE_ENABLED: bool = True
+    WATSON_RESPONSE_CACHE_TTL_SECONDS: int = 600
+    WATSON_RESPONSE_CACHE_MAX_ENTRIES: int = 512
+    # Cosine threshold for near-duplicate hits (0 = exact matches only). Even when enabled, a
+    # near hit needs the same content words: a different city, material, number or negation never matches
+    WATSON_RESPONSE_CACHE_SIMILARITY: float = 0.0
+
+    # Bulk listing uploads (POST /api/listings/bulk)
+    LISTINGS_BULK_MAX_ROWS: int = 50000
+    LISTINGS_BULK_CHUNK_ROWS: int = 500  # Rows validated between reads of the request stream
+    LISTINGS_BULK_MAX_ERRORS: int = 1000  # Row errors listed in the report; the count is always exact
+
+    # watsonx prompt budget (long chat sessions are compacted to fit)
+    WATSONX_PROMPT_MAX_TOKENS: int = 3000
+    WATSONX_PROMPT_RECENT_TURNS: int = 6  # Turns kept verbatim; older ones are summarized or dropped
+    WATSONX_PROMPT_CONTEXT_SHARE: float = 0.4  # Share of the free budget for context listings
+
+    # Local listing parser: below this confidence the seller's message is sent to watsonx
+    LISTING_PARSER_MIN_CONFIDENCE: float = 0.9
+
+    # Chatbot listing-flow sessions (sqlite/redis share flows between workers)
+    LISTING_FLOW_STORE: str = "sqlite"  # memory | sqlite | redis
+    LISTING_FLOW_TTL_SECONDS: int = 3600  # Abandoned flows expire after an hour of inactivity
+    LISTING_FLOW_MAX_SESSIONS: int = 1000
+    LISTING_FLOW_SQLITE_PATH: str = "data/listing_flow_sessions.db"
+    LISTING_FLOW_REDIS_URL: Optional[str] = None
+
     class Config:
         env_file = ".env"
 
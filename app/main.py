@@ -1,12 +1,18 @@
+import sys
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.config import settings
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.moderation import ModerationMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.utils.metrics import REGISTRY
+from app.utils.profiler import PROFILE_STORE
 
 # Import routers
-from app.routers import auth, listings, dashboard, chatbot
+from app.routers import auth, listings, dashboard, chatbot, export, admin
 
 try:
     from app.routers import seller
@@ -34,17 +40,14 @@ try:
 except Exception:
     INCLUDE_AUCTIONS = False
 
-try:
-    from app.routers import admin
-    INCLUDE_ADMIN = True
-except Exception:
-    INCLUDE_ADMIN = False
-
-try:
-    from app.routers import websocket
-    INCLUDE_WEBSOCKET = True
-except Exception:
-    INCLUDE_WEBSOCKET = False
+# The websocket router is SQLAlchemy-backed; with the DB disabled none of that is imported
+INCLUDE_WEBSOCKET = False
+if not settings.DISABLE_DB:
+    try:
+        from app.routers import websocket
+        INCLUDE_WEBSOCKET = True
+    except Exception:
+        pass
 
 app = FastAPI(
     title="Waste Material Marketplace API",
@@ -61,6 +64,19 @@ ALLOWED_ORIGINS = [
     "http://127.0.0.1:3001"
 ]
 
+# Metrics are added first (innermost) so the matched route is visible in the scope they see
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=PROFILE_STORE,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        interval=settings.PROFILING_INTERVAL_MS / 1000,
+        max_concurrent=settings.PROFILING_MAX_CONCURRENT,
+    )
+
 # Use FastAPI's built-in CORS middleware with explicit configuration
 # This ensures CORS headers are set for all XHR/fetch requests
 app.add_middleware(
@@ -73,6 +89,14 @@ app.add_middleware(
     max_age=600,
 )
 
+if settings.MODERATION_ENABLED:
+    app.add_middleware(
+        ModerationMiddleware,
+        skip_paths=settings.MODERATION_SKIP_PATHS,
+        max_carry=settings.MODERATION_MAX_CARRY_CHARS,
+        preserved_fields=settings.MODERATION_PRESERVED_FIELDS,
+    )
+
 # Mount uploads directory
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
@@ -81,6 +105,8 @@ app.include_router(auth.router)
 app.include_router(listings.router)
 app.include_router(dashboard.router)
 app.include_router(chatbot.router)
+app.include_router(export.router)
+app.include_router(admin.router)
 if INCLUDE_SELLER:
     app.include_router(seller.router)
 
@@ -91,12 +117,25 @@ if INCLUDE_ORDERS:
     app.include_router(orders.router)
 if INCLUDE_AUCTIONS:
     app.include_router(auctions.router)
-if INCLUDE_ADMIN:
-    app.include_router(admin.router)
 if INCLUDE_WEBSOCKET:
     app.include_router(websocket.router)
 
 
+@app.on_event("shutdown")
+async def close_http_clients():
+    # Release the pooled Watson connections if the service was ever loaded
+    watson_module = sys.modules.get("app.services.watson_service")
+    if watson_module is None:
+        return
+    await watson_module.close_watson_service()
+
+
+@app.on_event("shutdown")
+def stop_password_hasher():
+    from app.utils.auth import PASSWORD_HASHER
+    PASSWORD_HASHER.shutdown()
+
+
 @app.get("/")
 def root():
     return {
@@ -109,3 +148,11 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus text exposition of request, storage and Watson metrics"""
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    return Response(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
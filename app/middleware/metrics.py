@@ -0,0 +1,66 @@
+"""
+Request metrics
+Pure ASGI middleware recording, per route template, request counts by status, latency
+histograms, in-flight requests and request/response body sizes. Routes are labelled by
+their template (/api/orders/{order_id}), never by the raw path, to keep cardinality fixed.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import (
+    HTTP_IN_FLIGHT,
+    HTTP_LATENCY,
+    HTTP_REQUESTS,
+    HTTP_REQUEST_SIZE,
+    HTTP_RESPONSE_SIZE,
+)
+
+
+def _route_label(scope: Scope) -> str:
+    # Set by the router once a route matched; the scope dict is shared with the app
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        request_bytes = 0
+        response_bytes = 0
+
+        async def counting_receive() -> Message:
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message: Message):
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            method = scope.get("method", "")
+            route = _route_label(scope)
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status_code))
+            HTTP_LATENCY.observe(time.perf_counter() - started, method=method, route=route)
+            HTTP_REQUEST_SIZE.observe(request_bytes, method=method, route=route)
+            HTTP_RESPONSE_SIZE.observe(response_bytes, method=method, route=route)
@@ -1,43 +1,177 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+"""
+PII moderation for JSON request bodies
+Phone numbers and emails inside JSON string values are redacted as the body streams
+through, chunk by chunk. Keys, numbers and identity fields (email, username, ...) are
+never touched. Only a short tail of an unterminated string is carried over (a run of
+characters that could still be the start of a match), so memory stays bounded whatever
+the payload size. Routes on the allowlist, and non-JSON bodies, pass through untouched.
+"""
+
+from typing import Iterable, List, Tuple
+import codecs
 import re
 
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
 
+# (pattern, substring every match contains): patterns whose marker is absent are skipped
 REDACT_PATTERNS = [
-    re.compile(r"\b\d{10}\b"),  # simple phone number
-    re.compile(r"[\w\.-]+@[\w\.-]+\.[a-zA-Z]{2,}"),  # email
+    (re.compile(r"\b\d{10}\b"), None),  # simple phone number
+    (re.compile(r"[\w\.-]+@[\w\.-]+\.[a-zA-Z]{2,}"), "@"),  # email
 ]
 
+# String values of these keys are never rewritten: sessions and accounts are keyed on them
+PRESERVED_FIELDS = frozenset({"email", "user_email", "username", "user_username"})
+
+# Every match is made only of these characters, so none can span anything else
+_TOKEN_CHAR = re.compile(r"[\w.@-]")
+# Outside strings only these characters change the parser state
+_STRUCTURAL = re.compile(r'[\[\]{}:,"]')
+# Rest of a JSON string up to and including its closing quote
+_STRING_END = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+_MAX_KEY_CHARS = 128
+
 
 def redact_text(text: str) -> str:
     redacted = text
-    for pat in REDACT_PATTERNS:
-        redacted = pat.sub("[REDACTED]", redacted)
+    for pat, marker in REDACT_PATTERNS:
+        if marker is None or marker in redacted:
+            redacted = pat.sub("[REDACTED]", redacted)
     return redacted
 
 
-class ModerationMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # Only act on JSON requests
-        if request.headers.get("content-type", "").startswith("application/json"):
-            try:
-                body = await request.body()
-                redacted = redact_text(body.decode("utf-8", errors="ignore"))
-                scope = request.scope
-                receive_ = request._receive
+class StreamingRedactor:
+    """
+    Incremental redaction of a JSON byte stream. Only string values are rewritten:
+    object keys, numbers, literals and the values of ``preserved_fields`` pass through
+    byte for byte, so the document stays valid and identity fields stay intact.
+    """
+
+    def __init__(self, max_carry: int = 320, preserved_fields: Iterable[str] = PRESERVED_FIELDS):
+        self.max_carry = max_carry
+        self.preserved_fields = frozenset(preserved_fields)
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        self._containers: List[str] = []  # Open "{" / "[" from the outermost in
+        self._expect_key = False
+        self._in_string = False
+        self._string_is_key = False
+        self._redact_string = False
+        self._carry = ""  # Unterminated string content held back from the last chunk
+        self._key = ""  # Most recent object key
+
+    def _open_string(self):
+        self._in_string = True
+        self._string_is_key = bool(self._containers) and self._containers[-1] == "{" and self._expect_key
+        self._redact_string = not self._string_is_key and self._key not in self.preserved_fields
+        if self._string_is_key:
+            self._key = ""
+
+    def _string_text(self, content: str) -> str:
+        if self._string_is_key:
+            self._key = (self._key + content)[:_MAX_KEY_CHARS]
+            return content
+        return redact_text(content) if self._redact_string else content
+
+    def _structural(self, char: str):
+        if char in "{[":
+            self._containers.append(char)
+            self._expect_key = char == "{"
+        elif char in "}]":
+            if self._containers:
+                self._containers.pop()
+            self._expect_key = False
+        elif char == ":":
+            self._expect_key = False
+        elif char == ",":
+            self._expect_key = bool(self._containers) and self._containers[-1] == "{"
+            if self._expect_key:
+                self._key = ""
+        else:
+            self._open_string()
+
+    def feed(self, chunk: bytes, final: bool = False) -> bytes:
+        text = self._carry + self._decoder.decode(chunk, final=final)
+        self._carry = ""
+        out = []
+        position = 0
+        while position < len(text):
+            if not self._in_string:
+                match = _STRUCTURAL.search(text, position)
+                if match is None:
+                    out.append(text[position:])
+                    break
+                out.append(text[position:match.end()])
+                self._structural(match.group())
+                position = match.end()
+                continue
+
+            match = _STRING_END.match(text, position)
+            if match is not None:
+                out.append(self._string_text(text[position:match.end() - 1]))
+                out.append('"')
+                self._in_string = False
+                position = match.end()
+                continue
+
+            rest = text[position:]
+            split = len(rest)
+            if not final:
+                # Hold back the trailing run that could still grow into a match. A run longer
+                # than max_carry is not a real phone/email; it is cut rather than carried.
+                limit = max(split - self.max_carry, 0)
+                while split > limit and (rest[split - 1] == "\\" or _TOKEN_CHAR.match(rest, split - 1)):
+                    split -= 1
+                # Never separate a backslash from the character it escapes
+                backslashes = len(rest[:split]) - len(rest[:split].rstrip("\\"))
+                if backslashes % 2:
+                    split -= 1
+                self._carry = rest[split:]
+            out.append(self._string_text(rest[:split]))
+            break
+        return "".join(out).encode("utf-8")
+
 
-                async def receive():
-                    nonlocal redacted
-                    return {"type": "http.request", "body": redacted.encode("utf-8"), "more_body": False}
+class ModerationMiddleware:
+    """Pure ASGI middleware: wraps ``receive`` so the app reads redacted body chunks"""
 
-                request._receive = receive  # type: ignore
-            except Exception:
-                pass
+    def __init__(
+        self,
+        app: ASGIApp,
+        skip_paths: Iterable[str] = (),
+        max_carry: int = 320,
+        preserved_fields: Iterable[str] = PRESERVED_FIELDS,
+    ):
+        self.app = app
+        self.skip_paths: Tuple[str, ...] = tuple(skip_paths)
+        self.max_carry = max_carry
+        self.preserved_fields = frozenset(preserved_fields)
 
-        response: Response = await call_next(request)
-        return response
+    def _should_moderate(self, scope: Scope) -> bool:
+        if scope["type"] != "http":
+            return False
+        path = scope.get("path", "")
+        if any(path == prefix or path.startswith(prefix.rstrip("/") + "/") for prefix in self.skip_paths):
+            return False
+        for name, value in scope.get("headers", ()):
+            if name == b"content-type":
+                # Only act on JSON requests
+                return value.startswith(b"application/json")
+        return False
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if not self._should_moderate(scope):
+            await self.app(scope, receive, send)
+            return
 
+        redactor = StreamingRedactor(self.max_carry, self.preserved_fields)
 
+        async def moderated_receive() -> Message:
+            message = await receive()
+            if message["type"] != "http.request":
+                return message
+            more_body = message.get("more_body", False)
+            return {**message, "body": redactor.feed(message.get("body", b""), final=not more_body)}
 
+        # Redaction changes the body length
+        headers = [(name, value) for name, value in scope.get("headers", ()) if name != b"content-length"]
+        await self.app({**scope, "headers": headers}, moderated_receive, send)
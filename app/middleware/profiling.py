@@ -0,0 +1,91 @@
+"""
+Opt-in request profiling
+A request is profiled when it carries ``X-Profile: 1`` or ``?profile=1`` together with
+an admin bearer token, or when it is picked by PROFILING_SAMPLE_RATE. The collapsed-stack
+profile is saved under PROFILING_DIR and its id returned in the X-Profile-Id header;
+admins list and download profiles via /api/admin/profiles.
+"""
+
+from typing import Optional
+from urllib.parse import parse_qs
+import random
+import time
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.auth import resolve_token_user
+from app.utils.profiler import ProfileStore, StackSampler
+
+_TRUTHY = {"1", "true", "yes"}
+
+
+def _header(scope: Scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _requested_by_admin(scope: Scope) -> bool:
+    flag = _header(scope, b"x-profile")
+    if flag is None:
+        values = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("profile")
+        flag = values[-1] if values else None
+    if not flag or flag.strip().lower() not in _TRUTHY:
+        return False
+    authorization = _header(scope, b"authorization") or ""
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    user = resolve_token_user(token.strip())
+    return bool(user and user.get("role") == "admin" and user.get("is_active", True))
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: ProfileStore,
+        sample_rate: float = 0.0,
+        interval: float = 0.005,
+        max_concurrent: int = 2,
+    ):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.max_concurrent = max_concurrent
+        self._active = 0
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if scope["type"] != "http" or self._active >= self.max_concurrent:
+            return False
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return True
+        return _requested_by_admin(scope)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # Named up front so the id can be sent with the response headers
+        profile_id = self.store.new_id(scope.get("method", ""), scope.get("path", ""))
+        sampler = StackSampler(self.interval)
+        started = time.perf_counter()
+
+        async def send_with_header(message: Message):
+            if message["type"] == "http.response.start":
+                headers = [*message.get("headers", []), (b"x-profile-id", profile_id.encode("latin-1"))]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        self._active += 1
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_header)
+        finally:
+            stacks = sampler.stop()
+            self._active -= 1
+            await run_in_threadpool(self.store.save, profile_id, stacks, time.perf_counter() - started, sampler.samples)
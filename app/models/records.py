@@ -0,0 +1,163 @@
+"""
+Compact record types for JSON storage
+- Listings, machinery, auctions and bids are held as __slots__ objects while the API
+  works on them, and become plain dicts only when returned or written back to JSON
+  (JSONStorage.save converts them)
+- Low-cardinality strings (category, status, location, ...) are interned, so every
+  record with the same value shares one string object
+- Records behave as mutable mappings (get, [], in, update, setdefault), so filter and
+  formatting code works on records and dicts alike. Keys outside the declared fields
+  go to a small overflow dict and still round-trip.
+"""
+
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, FrozenSet, Iterator, Tuple
+import sys
+
+_UNSET = object()
+
+
+class Record(MutableMapping):
+    """Base class; subclasses set FIELDS (also their __slots__) and INTERNED"""
+
+    __slots__ = ("_extra",)
+
+    FIELDS: Tuple[str, ...] = ()
+    INTERNED: FrozenSet[str] = frozenset()
+    _FIELD_SET: FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+
+    def __init__(self, data: Mapping = (), **fields):
+        self._extra = None
+        self.update(data, **fields)
+
+    def update(self, data: Mapping = (), **fields):
+        # Hot path (every record is built through here), so no per-key __setitem__ dispatch
+        field_set = self._FIELD_SET
+        interned = self.INTERNED
+        set_slot = object.__setattr__
+        for items in (data.items() if isinstance(data, Mapping) else data, fields.items()):
+            for key, value in items:
+                if key in field_set:
+                    if key in interned and type(value) is str:
+                        value = sys.intern(value)
+                    set_slot(self, key, value)
+                else:
+                    if self._extra is None:
+                        self._extra = {}
+                    self._extra[key] = value
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __setitem__(self, key: str, value: Any):
+        if key in self._FIELD_SET:
+            if key in self.INTERNED and type(value) is str:
+                value = sys.intern(value)
+            object.__setattr__(self, key, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _UNSET)
+        if value is _UNSET:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._FIELD_SET:
+            return getattr(self, key, default)
+        extra = self._extra
+        return default if extra is None else extra.get(key, default)
+
+    def __delitem__(self, key: str):
+        if key in self._FIELD_SET:
+            try:
+                object.__delattr__(self, key)
+                return
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key, _UNSET) is not _UNSET
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self.FIELDS:
+            if hasattr(self, name):
+                yield name
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict in the stored / API shape"""
+        data = {}
+        for name in self.FIELDS:
+            value = getattr(self, name, _UNSET)
+            if value is not _UNSET:
+                data[name] = value
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class ListingRecord(Record):
+    # Master data fields first, then the ones only data/listings.json uses
+    FIELDS = (
+        "id", "listing_type", "title", "material_name", "category", "quantity", "unit",
+        "price_per_unit", "total_value", "sale_type", "status", "location", "seller_company",
+        "date_posted", "views", "inquiries", "description", "images", "quantity_unit", "price",
+        "seller_id", "condition", "created_at", "updated_at",
+    )
+    __slots__ = FIELDS
+    INTERNED = frozenset({
+        "listing_type", "category", "unit", "quantity_unit", "sale_type", "status", "location",
+        "seller_company", "condition",
+    })
+
+
+class MachineryRecord(Record):
+    FIELDS = (
+        "id", "listing_type", "title", "machine_type", "category", "brand", "model",
+        "year_of_manufacture", "condition", "price_inr", "original_price_inr",
+        "depreciation_percentage", "sale_type", "status", "location", "seller_company",
+        "seller_type", "compatible_materials", "target_industries", "date_posted", "views",
+        "inquiries", "negotiable", "description",
+    )
+    __slots__ = FIELDS
+    INTERNED = frozenset({
+        "listing_type", "machine_type", "category", "brand", "condition", "sale_type", "status",
+        "location", "seller_company", "seller_type",
+    })
+
+
+class AuctionRecord(Record):
+    FIELDS = (
+        "id", "listing_id", "starting_bid", "current_highest_bid", "bid_count", "buy_now_price",
+        "end_time", "start_time", "is_active", "winner_id", "created_at", "updated_at",
+        "seller_company", "seller_contact", "watchers", "featured", "listing_title",
+        "material_name", "category", "quantity", "quantity_unit", "location", "image", "status",
+    )
+    __slots__ = FIELDS
+    INTERNED = frozenset({
+        "seller_company", "seller_contact", "material_name", "category", "quantity_unit",
+        "location", "status",
+    })
+
+
+class BidRecord(Record):
+    FIELDS = ("id", "amount", "auction_id", "bidder_id", "is_winning", "created_at")
+    __slots__ = FIELDS
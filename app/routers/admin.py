@@ -1,113 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
-from app.database import get_db
-from app.models.user import User
-from app.models.listing import Listing
-from app.models.order import Order
-from app.models.auction import Auction
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from typing import Dict, List
+
+from app.routers.listings import (
+    format_listing,
+    load_master_data as listings_load_master_data,
+    save_master_data as listings_save_master_data,
+)
 from app.utils.auth import get_admin_user
-import json
+from app.utils.mock_storage import STORAGE_INDEX, get_user_by_id, update_user
+from app.utils.profiler import PROFILE_STORE
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
 
+def _public_user(user: Dict) -> Dict:
+    return {key: value for key, value in user.items() if key != "hashed_password"}
+
+
 @router.get("/stats")
-def get_admin_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_user)
-):
-    total_users = db.query(User).count()
-    total_listings = db.query(Listing).count()
-    total_orders = db.query(Order).count()
-    active_auctions = db.query(Auction).filter(Auction.is_active == True).count()
-    
-    total_revenue = db.query(func.sum(Order.total_price)).filter(
-        Order.status == "completed"
-    ).scalar() or 0
-    
-    recent_users = db.query(User).order_by(User.created_at.desc()).limit(5).all()
-    recent_listings = db.query(Listing).order_by(Listing.created_at.desc()).limit(5).all()
-    
-    for listing in recent_listings:
-        listing.images = json.loads(listing.images) if listing.images else []
-    
+def get_admin_stats(current_user: Dict = Depends(get_admin_user)):
+    # Counters and recency indexes are maintained by the storage layer; nothing is scanned here
+    orders = STORAGE_INDEX["orders"]
     return {
-        "total_users": total_users,
-        "total_listings": total_listings,
-        "total_orders": total_orders,
-        "active_auctions": active_auctions,
-        "total_revenue": float(total_revenue),
-        "recent_users": recent_users,
-        "recent_listings": recent_listings
+        "total_users": STORAGE_INDEX["users"].count(),
+        "total_listings": STORAGE_INDEX["listings"].count(),
+        "total_orders": orders.count(),
+        "active_auctions": int(STORAGE_INDEX["auctions"].counter("active")),
+        "total_revenue": round(float(orders.counter("revenue")), 2),
+        "recent_users": [_public_user(user) for user in STORAGE_INDEX["users"].recent(5)],
+        "recent_listings": [format_listing(listing) for listing in STORAGE_INDEX["listings"].recent(5)],
     }
 
 
 @router.get("/users")
 def get_all_users(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_user)
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: Dict = Depends(get_admin_user)
 ):
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+    return [_public_user(user) for user in STORAGE_INDEX["users"].page(skip, limit)]
 
 
 @router.get("/listings")
 def get_all_listings(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_user)
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: Dict = Depends(get_admin_user)
 ):
-    listings = db.query(Listing).offset(skip).limit(limit).all()
-    for listing in listings:
-        listing.images = json.loads(listing.images) if listing.images else []
-    return listings
+    return [format_listing(listing) for listing in STORAGE_INDEX["listings"].page(skip, limit)]
 
 
 @router.get("/orders")
 def get_all_orders(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_user)
-):
-    orders = db.query(Order).offset(skip).limit(limit).all()
-    return orders
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: Dict = Depends(get_admin_user)
+) -> List[Dict]:
+    return STORAGE_INDEX["orders"].page(skip, limit)
 
 
 @router.put("/users/{user_id}/toggle-active")
-def toggle_user_active(
-    user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_user)
-):
-    user = db.query(User).filter(User.id == user_id).first()
+def toggle_user_active(user_id: int, current_user: Dict = Depends(get_admin_user)):
+    user = get_user_by_id(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    
-    user.is_active = not user.is_active
-    db.commit()
-    db.refresh(user)
-    
-    return user
+
+    updated = update_user(user_id, {"is_active": not user.get("is_active", True)})
+    return _public_user(updated)
 
 
 @router.delete("/listings/{listing_id}")
-def delete_listing_admin(
-    listing_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_user)
-):
-    listing = db.query(Listing).filter(Listing.id == listing_id).first()
-    if not listing:
+def delete_listing_admin(listing_id: int, current_user: Dict = Depends(get_admin_user)):
+    master_data = listings_load_master_data()
+    listings = master_data.get("waste_material_listings", [])
+    remaining = [listing for listing in listings if listing.get("id") != listing_id]
+    if len(remaining) == len(listings):
         raise HTTPException(status_code=404, detail="Listing not found")
-    
-    db.delete(listing)
-    db.commit()
-    
+
+    master_data["waste_material_listings"] = remaining
+    listings_save_master_data(master_data)
+    STORAGE_INDEX["listings"].record_deleted(listing_id)
+
     return {"message": "Listing deleted successfully"}
 
+
+@router.get("/profiles")
+def list_profiles(current_user: Dict = Depends(get_admin_user)):
+    """Saved request profiles, newest first"""
+    return PROFILE_STORE.list()
+
+
+@router.get("/profiles/{profile_id}")
+def download_profile(profile_id: str, current_user: Dict = Depends(get_admin_user)):
+    """Collapsed-stack file, ready for flamegraph.pl or speedscope"""
+    path = PROFILE_STORE.path_for(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=path.name)
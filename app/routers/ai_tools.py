@@ -233,7 +233,7 @@ def negotiation_action(payload: Dict[str, Any]):
 
 
 @router.post("/kb/qa")
-def kb_qa(payload: Dict[str, Any]):
+async def kb_qa(payload: Dict[str, Any]):
     question: str = payload.get("question", "")
     kb_context: Dict[str, Any] = payload.get("context", {})
 
@@ -241,7 +241,7 @@ def kb_qa(payload: Dict[str, Any]):
     answer = None
     try:
         svc = get_watson_service()
-        answer = svc.generate_response(question, conversation_history=[], context_data=kb_context)
+        answer = await svc.generate_response(question, conversation_history=[], context_data=kb_context)
     except Exception:
         answer = None
 
@@ -259,11 +259,24 @@ def kb_qa(payload: Dict[str, Any]):
 
 
 @router.post("/chat/stream")
-def chat_stream(payload: Dict[str, Any]):
+async def chat_stream(payload: Dict[str, Any]):
     message: str = payload.get("message", "")
     context: Dict[str, Any] = payload.get("context", {})
 
-    # Simple server-sent style chunking (no real SSE headers here, but chunked response)
+    svc = get_watson_service()
+    if svc.orchestrate_enabled or svc.watsonx_enabled:
+        # Forward model output chunk by chunk as it is generated
+        async def live_generator():
+            produced = False
+            async for chunk in svc.stream_response(message, conversation_history=[], context_data=context or None):
+                produced = True
+                yield chunk
+            if not produced:
+                yield "Sorry, the assistant is unavailable right now. Please try again shortly.\n"
+
+        return StreamingResponse(live_generator(), media_type="text/plain")
+
+    # Demo mode: canned chunked response when no Watson backend is configured
     chunks = [
         "Thinking about your request...\n",
         "Finding relevant suppliers and price trends...\n",
@@ -1,26 +1,28 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
+from app.models.records import AuctionRecord, ListingRecord
 from app.schemas.auction import BidCreate
 from app.utils.auth import get_current_active_user
 from app.utils.mock_storage import (
+    MASTER_DATA_FILE,
     create_bid,
     get_auction_by_id,
     get_auction_by_listing_id,
     get_bids_by_auction,
     get_listing_by_id,
-    load_auctions,
-    load_bids,
-    load_master_data,
+    load_auction_records,
+    load_bid_records,
     load_listings,
     update_auction,
     save_auctions,
     save_bids,
 )
+from app.utils.shared_catalog import CatalogTable, get_shared_catalog
 
 router = APIRouter(prefix="/api/auctions", tags=["Auctions"])
 
@@ -99,19 +101,23 @@ SEED_AUCTIONS: List[Dict] = [
 ]
 
 
-def _seed_auctions_if_needed() -> List[Dict]:
-    auctions = load_auctions()
+def _master_listings() -> CatalogTable:
+    return get_shared_catalog(MASTER_DATA_FILE).current().table("waste_material_listings")
+
+
+def _seed_auctions_if_needed() -> List[AuctionRecord]:
+    auctions = load_auction_records()
     if auctions:
         return _refresh_auction_state(auctions)
 
     now = _utcnow()
-    seeded: List[Dict] = []
+    seeded: List[AuctionRecord] = []
     for idx, config in enumerate(SEED_AUCTIONS, start=1):
         listing = get_listing_by_id(config["listing_id"]) or {}
         start_time = now - timedelta(hours=config.get("hours_elapsed", 6))
         end_time = now + timedelta(hours=config.get("hours_until_close", 6))
         seeded.append(
-            {
+            AuctionRecord({
                 "id": idx,
                 "listing_id": config["listing_id"],
                 "starting_bid": float(config.get("starting_bid", 0)),
@@ -135,14 +141,14 @@ def _seed_auctions_if_needed() -> List[Dict]:
                 "quantity_unit": listing.get("quantity_unit"),
                 "location": listing.get("location"),
                 "image": (listing.get("images") or [None])[0],
-            }
+            })
         )
 
     save_auctions(seeded)
     return seeded
 
 
-def _refresh_auction_state(auctions: List[Dict]) -> List[Dict]:
+def _refresh_auction_state(auctions: List[AuctionRecord]) -> List[AuctionRecord]:
     now = _utcnow()
     changed = False
     for auction in auctions:
@@ -199,11 +205,10 @@ def _total_value_from_listing(listing: Dict) -> float:
     return round(quantity * unit_price, 2) if quantity and unit_price else 0.0
 
 
-def _merge_with_virtual_auctions(auctions: List[Dict]) -> List[Dict]:
+def _merge_with_virtual_auctions(auctions: List[AuctionRecord]) -> List[AuctionRecord]:
     """Augment persisted auctions with virtual auctions derived from listing data."""
 
-    master_data = load_master_data()
-    listings = master_data.get("waste_material_listings") if isinstance(master_data, dict) else None
+    listings = _master_listings()
     if not listings:
         return auctions
 
@@ -213,7 +218,7 @@ def _merge_with_virtual_auctions(auctions: List[Dict]) -> List[Dict]:
         if auction.get("listing_id") is not None
     }
 
-    virtual_auctions: List[Dict] = []
+    virtual_auctions: List[AuctionRecord] = []
     now = _utcnow()
 
     for listing in listings:
@@ -254,7 +259,7 @@ def _merge_with_virtual_auctions(auctions: List[Dict]) -> List[Dict]:
         images = listing.get("images") or []
 
         virtual_auctions.append(
-            {
+            AuctionRecord({
                 "id": 1000 + int(listing_id),
                 "listing_id": listing_id,
                 "starting_bid": round(max(starting_bid, 1.0), 2),
@@ -278,7 +283,7 @@ def _merge_with_virtual_auctions(auctions: List[Dict]) -> List[Dict]:
                 "quantity_unit": quantity_unit,
                 "location": listing.get("location"),
                 "image": images[0] if images else None,
-            }
+            })
         )
 
     if not virtual_auctions:
@@ -287,48 +292,52 @@ def _merge_with_virtual_auctions(auctions: List[Dict]) -> List[Dict]:
     return auctions + virtual_auctions
 
 
-def _build_listing_index() -> Dict[int, Dict]:
-    index: Dict[int, Dict] = {}
+def _build_listing_index(listing_ids: Set[int]) -> Dict[int, ListingRecord]:
+    """Listings referenced by ``listing_ids``; the rest are never materialized"""
+    persisted: Dict[int, Dict] = {}
 
     try:
         for listing in load_listings():
             listing_id = listing.get("id")
-            if listing_id is None:
+            if listing_id is None or int(listing_id) not in listing_ids:
                 continue
-            index[int(listing_id)] = dict(listing)
+            persisted[int(listing_id)] = listing
     except Exception:
         pass
 
-    master_data = load_master_data()
-    if isinstance(master_data, dict):
-        for listing in master_data.get("waste_material_listings", []):
-            listing_id = listing.get("id")
-            if listing_id is None:
-                continue
-            combined = dict(listing)
-            if listing_id in index:
-                # Allow persisted listing fields (status updates, etc.) to override master defaults
-                combined.update(index[listing_id])
-            sale_type = combined.get("sale_type")
-            listing_type_value = combined.get("listing_type")
-            if listing_type_value and isinstance(listing_type_value, str):
-                lt_lower = listing_type_value.strip().lower()
-                if lt_lower in {"auction", "fixed_price"}:
-                    sale_type = listing_type_value
-            if sale_type:
-                combined["sale_type"] = sale_type
-                combined.setdefault("listing_type", sale_type)
-
-            quantity_unit = combined.get("quantity_unit") or combined.get("unit")
-            if quantity_unit:
-                combined["quantity_unit"] = quantity_unit
-            index[int(listing_id)] = combined
+    index: Dict[int, ListingRecord] = {
+        listing_id: ListingRecord(listing) for listing_id, listing in persisted.items()
+    }
+    for listing in _master_listings():
+        listing_id = listing.get("id")
+        if listing_id is None or int(listing_id) not in listing_ids:
+            continue
+        combined = ListingRecord(listing)
+        if listing_id in persisted:
+            # Allow persisted listing fields (status updates, etc.) to override master defaults
+            combined.update(persisted[listing_id])
+        sale_type = combined.get("sale_type")
+        listing_type_value = combined.get("listing_type")
+        if listing_type_value and isinstance(listing_type_value, str):
+            lt_lower = listing_type_value.strip().lower()
+            if lt_lower in {"auction", "fixed_price"}:
+                sale_type = listing_type_value
+        if sale_type:
+            combined["sale_type"] = sale_type
+            combined.setdefault("listing_type", sale_type)
+
+        quantity_unit = combined.get("quantity_unit") or combined.get("unit")
+        if quantity_unit:
+            combined["quantity_unit"] = quantity_unit
+        index[int(listing_id)] = combined
 
     return index
 
 
-def _apply_listing_context(auctions: List[Dict]) -> List[Dict]:
-    listing_index = _build_listing_index()
+def _apply_listing_context(auctions: List[AuctionRecord]) -> List[AuctionRecord]:
+    listing_index = _build_listing_index({
+        int(auction["listing_id"]) for auction in auctions if auction.get("listing_id") is not None
+    })
     inactive_statuses = {"sold", "inactive", "cancelled", "expired", "completed"}
 
     for auction in auctions:
@@ -336,7 +345,7 @@ def _apply_listing_context(auctions: List[Dict]) -> List[Dict]:
         if listing_id is None:
             continue
 
-        listing: Optional[Dict] = listing_index.get(int(listing_id))
+        listing: Optional[ListingRecord] = listing_index.get(int(listing_id))
         if not listing:
             continue
 
@@ -369,7 +378,7 @@ def _apply_listing_context(auctions: List[Dict]) -> List[Dict]:
     return auctions
 
 
-def _get_all_seeded() -> List[Dict]:
+def _get_all_seeded() -> List[AuctionRecord]:
     auctions = _seed_auctions_if_needed()
     refreshed = _refresh_auction_state(auctions)
     merged = _merge_with_virtual_auctions(refreshed)
@@ -384,7 +393,7 @@ def get_active_auctions(skip: int = 0, limit: int = 100):
         0 if item.get("is_active", False) else 1,
         item.get("end_time"),
     ))
-    return auctions[skip : skip + limit]
+    return [auction.to_dict() for auction in auctions[skip : skip + limit]]
 
 
 @router.get("/{listing_id}")
@@ -395,7 +404,7 @@ def get_auction_for_listing(listing_id: int):
         auction = get_auction_by_listing_id(listing_id)
     if not auction:
         raise HTTPException(status_code=404, detail="Auction not found")
-    return auction
+    return dict(auction)
 
 
 @router.post("/{auction_id}/bid", status_code=status.HTTP_201_CREATED)
@@ -431,7 +440,7 @@ def place_bid(auction_id: int, bid: BidCreate, current_user=Depends(get_current_
         )
     
     # Update all previous bids to not winning
-    bids = load_bids()
+    bids = load_bid_records()
     for existing_bid in bids:
         if existing_bid.get('auction_id') == auction_id:
             existing_bid['is_winning'] = False
@@ -1,26 +1,47 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
 from app.schemas.auth import Token, UserCreate, UserResponse
-from app.utils.auth import verify_password, get_password_hash, create_access_token, get_current_active_user
-from app.utils.mock_storage import get_user_by_email, get_user_by_username, create_user
+from app.utils.auth import PASSWORD_HASHER, create_access_token, get_admin_user, get_current_active_user
+from app.utils.mock_storage import get_user_by_email, get_user_by_username, create_user, update_user
+from app.utils.password_hasher import PasswordHasherBusy
 from datetime import timedelta
 from app.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts in progress, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _user_exists(email: str, username: str) -> bool:
+    return bool(get_user_by_email(email) or get_user_by_username(username))
+
+
+# bcrypt runs on PASSWORD_HASHER's own workers; only the quick storage lookups use the threadpool
 @router.post("/register", response_model=UserResponse)
-def register(user_data: UserCreate):
+async def register(user_data: UserCreate):
     # Check if user already exists
-    if get_user_by_email(user_data.email) or get_user_by_username(user_data.username):
+    if await run_in_threadpool(_user_exists, user_data.email, user_data.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email or username already registered"
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
-    db_user = create_user({
+    try:
+        hashed_password = await PASSWORD_HASHER.hash(user_data.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+    db_user = await run_in_threadpool(create_user, {
         'email': user_data.email,
         'username': user_data.username,
         'hashed_password': hashed_password,
@@ -33,10 +54,17 @@ def register(user_data: UserCreate):
 
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = get_user_by_email(form_data.username)
-    
-    if not user or not verify_password(form_data.password, user.get('hashed_password')):
+async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+    user = await run_in_threadpool(get_user_by_email, form_data.username)
+
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await PASSWORD_HASHER.verify(form_data.password, user.get('hashed_password'))
+        except PasswordHasherBusy:
+            raise _hasher_busy()
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -45,7 +73,12 @@ def login(form_data: OAuth2PasswordRequestForm = Depends()):
     
     if not user.get('is_active', True):
         raise HTTPException(status_code=400, detail="Inactive user")
-    
+
+    if new_hash:
+        # Stored hash used outdated cost parameters; replace it now that we know the password
+        await run_in_threadpool(update_user, user['id'], {'hashed_password': new_hash})
+        logger.info(f"🔐 Re-hashed password for user {user['id']} with current bcrypt cost")
+
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user['email']}, expires_delta=access_token_expires
@@ -58,3 +91,9 @@ def login(form_data: OAuth2PasswordRequestForm = Depends()):
 def get_current_user_info(current_user = Depends(get_current_active_user)):
     return current_user
 
+
+
+@router.get("/hasher-metrics")
+def get_password_hasher_metrics(current_user = Depends(get_admin_user)):
+    """Queue depth and latency of the password hashing executor"""
+    return PASSWORD_HASHER.metrics()
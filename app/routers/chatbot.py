@@ -1,16 +1,26 @@
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
 import json
 import logging
 import re
-from pathlib import Path
-from jose import JWTError, jwt
 
 from app.config import settings
 from app.schemas.listing import ListingSubmission
-from app.utils.mock_storage import get_user_by_email
+from app.services.catalog_index import get_catalog_index
+from app.services.intent_classifier import (
+    BUSINESS_TYPES,
+    GENERIC_MACHINERY_TERMS,
+    MANUFACTURING_TERMS,
+    classify_message,
+)
+from app.services.listing_parser import SALE_TYPE_ALIASES, SELLER_LISTING_CATEGORIES, parse_listing_message
+from app.services.session_store import create_session_store
+from app.utils.auth import resolve_token_user
+from app.utils.mock_storage import STORAGE_INDEX
+from app.utils.single_flight import SingleFlight, normalize_key
 from app.routers.listings import (
     load_master_data as listings_load_master_data,
     save_master_data as listings_save_master_data,
@@ -20,15 +30,22 @@ from app.routers.listings import (
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Try to import Watson service
-try:
-    from app.services.watson_service import get_watson_service
-    WATSON_AVAILABLE = True
-    logger.info("✅ Watson service imported successfully")
-except ImportError as e:
-    WATSON_AVAILABLE = False
-    get_watson_service = None
-    logger.warning(f"⚠️  Watson service not available: {e}")
+# Watson service factory; imported on first use so startup skips its HTTP client stack
+_watson_factory = None
+
+
+def _watson_service():
+    """The shared Watson service, or None when it cannot be imported"""
+    global _watson_factory
+    if _watson_factory is None:
+        try:
+            from app.services.watson_service import get_watson_service
+            _watson_factory = get_watson_service
+            logger.info("✅ Watson service imported successfully")
+        except ImportError as e:
+            _watson_factory = False
+            logger.warning(f"⚠️  Watson service not available: {e}")
+    return _watson_factory() if _watson_factory else None
 
 router = APIRouter(prefix="/api/chatbot", tags=["Chatbot"])
 
@@ -54,26 +71,6 @@ class ChatResponse(BaseModel):
     listings: Optional[List[dict]] = []  # Include relevant listings
 
 
-SELLER_LISTING_CATEGORIES = [
-    "Agricultural/Biomass",
-    "Industrial Ash",
-    "Plastic Waste",
-    "Metal Scrap",
-    "Paper & Cardboard",
-    "Construction & Demolition",
-    "Glass",
-    "Textile Waste",
-    "Rubber & Tires",
-    "Organic/Food Waste",
-]
-
-
-SALE_TYPE_ALIASES = {
-    "fixed_price": {"fixed price", "fixed", "fixed-price", "direct", "direct sale", "set price"},
-    "auction": {"auction", "bid", "bidding", "auction listing", "open bidding"},
-}
-
-
 LISTING_FLOW_PLAN = [
     {"field": "material_name", "label": "Material name", "optional": False},
     {"field": "title", "label": "Listing title", "optional": True},
@@ -108,7 +105,15 @@ LISTING_STEP_INSTRUCTIONS = {
 }
 
 
-LISTING_FLOW_SESSIONS: Dict[str, Dict[str, Any]] = {}
+# Per-seller listing flow state; bounded, expiring and (with sqlite/redis) shared across workers
+LISTING_FLOW_SESSIONS = create_session_store(
+    settings.LISTING_FLOW_STORE,
+    ttl_seconds=settings.LISTING_FLOW_TTL_SECONDS,
+    max_entries=settings.LISTING_FLOW_MAX_SESSIONS,
+    sqlite_path=settings.LISTING_FLOW_SQLITE_PATH,
+    redis_url=settings.LISTING_FLOW_REDIS_URL,
+    prefix="listing-flow:",
+)
 
 
 def _get_user_from_request(http_request: Request) -> Optional[Dict]:
@@ -134,19 +139,9 @@ def _get_user_from_request(http_request: Request) -> Optional[Dict]:
     if token.lower() in {"null", "none", "undefined"}:
         return None
 
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-    except JWTError:
-        logger.warning("⚠️  Invalid authentication token presented at chatbot endpoint")
-        return None
-
-    email = payload.get("sub")
-    if not email:
-        return None
-
-    user = get_user_by_email(email)
+    user = resolve_token_user(token)
     if not user:
-        logger.warning("⚠️  Chatbot request token resolved to unknown user")
+        logger.warning("⚠️  Chatbot request token is invalid or resolves to an unknown user")
     return user
 
 
@@ -160,15 +155,15 @@ def _get_listing_flow_key(user: Optional[Dict]) -> Optional[str]:
 
 
 def _reset_listing_flow(flow_key: str):
-    LISTING_FLOW_SESSIONS.pop(flow_key, None)
+    LISTING_FLOW_SESSIONS.delete(flow_key)
 
 
 def _start_listing_flow(flow_key: str):
-    LISTING_FLOW_SESSIONS[flow_key] = {
+    LISTING_FLOW_SESSIONS.set(flow_key, {
         "step_index": 0,
         "data": {},
         "started_at": datetime.utcnow().isoformat(),
-    }
+    })
     logger.info(f"🧾 Listing flow started for {flow_key}")
 
 
@@ -195,14 +190,14 @@ def _format_structured_listing_preview(data: Dict[str, Any]) -> str:
     return "\n".join(parts)
 
 
-def _call_watson_listing_parser(raw_message: str) -> Optional[Dict[str, Any]]:
+async def _call_watson_listing_parser(raw_message: str) -> Optional[Dict[str, Any]]:
     logger.info("🤖 Attempting watsonx structured listing parse")
     try:
-        watson_service = get_watson_service() if get_watson_service else None
+        watson_service = _watson_service()
         if not watson_service:
             logger.info("❌ Watson service unavailable for structured listing parse")
             return None
-        parsed = watson_service.generate_structured_listing(raw_message)
+        parsed = await watson_service.generate_structured_listing(raw_message)
         if parsed:
             logger.info("✅ watsonx returned structured listing data")
         else:
@@ -213,6 +208,17 @@ def _call_watson_listing_parser(raw_message: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+async def _parse_structured_listing(raw_message: str) -> Optional[Dict[str, Any]]:
+    """Parse the listing locally; only loosely worded messages are sent to watsonx"""
+    parsed = parse_listing_message(raw_message)
+    if parsed.confidence >= settings.LISTING_PARSER_MIN_CONFIDENCE and parsed.complete:
+        logger.info(f"⚡ Listing parsed locally (confidence {parsed.confidence:.2f})")
+        return parsed.to_record()
+
+    logger.info(f"🧾 Local listing parse confidence {parsed.confidence:.2f} (missing: {parsed.missing})")
+    return await _call_watson_listing_parser(raw_message)
+
+
 def _get_step_instruction(field: str, step_index: int) -> str:
     label = LISTING_FLOW_STEP_MAP[field]["label"]
     optional_suffix = " (optional)" if LISTING_FLOW_STEP_MAP[field]["optional"] else ""
@@ -226,86 +232,39 @@ def _get_step_instruction(field: str, step_index: int) -> str:
 def _should_start_listing_flow(message: str) -> bool:
     if not message:
         return False
-    text = message.lower()
-    normalized = re.sub(r"[^a-z0-9\s]", " ", text)
-    normalized = re.sub(r"\s+", " ", normalized).strip()
+    intents = classify_message(message)
     
     # First, check if this is a query about EXISTING listings (not creating new ones)
     # These patterns indicate the user is asking about available/existing listings
-    querying_existing_patterns = [
-        "do we have", "do you have", "are there", "is there", "can we see",
-        "show me", "show us", "find", "search", "browse", "get listings",
-        "see listings", "available listings", "existing listings", 
-        "current listings", "any listings", "what listings", "listings available"
-    ]
-    if any(pattern in normalized for pattern in querying_existing_patterns):
+    if intents.has_normalized("flow_existing_query"):
         return False  # This is a query about existing data, not creation intent
     
-    keywords = [
-        "list an item",
-        "list my item",
-        "list a new item",
-        "list this item",
-        "list material",
-        "list my material",
-        "list items",
-        "list my items",
-        "list items for sale",
-        "create a listing",
-        "create new listing",
-        "new listing",
-        "publish listing",
-        "post a listing",
-        "sell this material",
-        "sell my material",
-        "sell an item",
-        "add new listing",
-        "add a listing",
-        "add listing",
-        "list for sale",
-        "list your item",
-    ]
-    if any(trigger in normalized for trigger in keywords):
+    if intents.has_normalized("flow_create"):
         return True
 
-    sale_phrases = [
-        "available for sale",
-        "for sale",
-        "ready for sale",
-        "up for auction",
-        "priced at",
-        "fixed sale",
-        "fixed price",
-    ]
-
-    if any(phrase in normalized for phrase in sale_phrases):
-        # Only trigger if it's clearly a creation intent, not a query about existing items
-        # Check that it's NOT a question about existing listings
-        if not any(qword in normalized for qword in ["do we have", "are there", "do you have", "show me", "find"]):
-            if any(word in normalized for word in ["have", "selling", "providing", "offering", "available"]):
-                if any(unit in normalized for unit in ["ton", "tons", "kg", "kilogram", "metric", "bale", "mt", "quantity"]):
-                    return True
+    # Sale phrasing only counts when the seller also describes supply and a quantity unit
+    if (
+        intents.has_normalized("flow_sale")
+        and intents.has_normalized("flow_supply")
+        and intents.has_normalized("flow_units")
+    ):
+        return True
 
     # More specific check: "list" should be combined with action words, not just "material"
     # This prevents informational queries like "what can I do with material" from triggering
-    if "list" in normalized:
-        # Check for explicit listing creation phrases
-        listing_actions = ["list", "create", "add", "post", "publish", "sell"]
-        listing_objects = ["listing", "item", "items"]
-        
+    if intents.has_normalized("flow_list"):
         # Only trigger if "list" appears with another action word or listing object
         # AND it's not part of a question
-        has_action = any(action in normalized for action in listing_actions if action != "list")
-        has_listing_object = any(obj in normalized for obj in listing_objects)
-        is_question = any(q in normalized for q in ["what", "how", "when", "where", "why", "can", "should"])
+        has_action = intents.has_normalized("flow_actions")
+        has_listing_object = intents.has_normalized("flow_objects")
+        is_question = intents.has_normalized("flow_question")
         
         if (has_action or has_listing_object) and not is_question:
             return True
 
-    if "create" in normalized and "listing" in normalized:
-        return True
-
-    if "publish" in normalized and "listing" in normalized:
+    if intents.has_normalized("flow_listing_noun") and (
+        intents.has_normalized("flow_create_verb") or intents.has_normalized("flow_publish_verb")
+    ):
         return True
 
     return False
@@ -499,6 +458,7 @@ def _submit_listing_from_flow(flow_data: Dict[str, Any], user: Dict) -> dict:
     listings.append(new_listing)
     master_data["waste_material_listings"] = listings
     listings_save_master_data(master_data)
+    STORAGE_INDEX["listings"].record_created(new_listing)
 
     logger.info(
         "🧾 New listing created via chatbot for seller %s (listing ID %s)",
@@ -643,6 +603,9 @@ def _handle_listing_flow_message(flow_key: str, user: Dict, user_message: str) -
             listings=[listing],
         )
 
+    # The store hands out copies, so persist the advanced state for the next turn
+    LISTING_FLOW_SESSIONS.set(flow_key, state)
+
     next_field = LISTING_FLOW_FIELDS[state["step_index"]]
     prompt = _get_step_instruction(next_field, state["step_index"])
     message_parts = []
@@ -660,77 +623,21 @@ def extract_keywords_from_message(message: str) -> List[str]:
     Extract keywords from user message for searching listings.
     Returns a list of keywords that might match waste materials or categories.
     """
-    message_lower = message.lower()
-    keywords = []
-    
-    # Material keywords
-    material_keywords = [
-        "plastic", "hdpe", "ldpe", "pp", "pet", "pvc",
-        "metal", "steel", "aluminum", "copper", "brass", "iron",
-        "paper", "cardboard", "paper",
-        "glass", "glassware",
-        "rubber", "tire",
-        "textile", "fabric", "cotton",
-        "ash", "fly ash", "bottom ash",
-        "bagasse", "rice husk", "coconut shell", "straw",
-        "construction", "concrete", "rubble", "brick",
-        "organic", "food waste", "vegetable waste"
-    ]
-    
-    # Check which keywords are in the message
-    for keyword in material_keywords:
-        if keyword in message_lower:
-            keywords.append(keyword)
-    
-    return keywords
+    return classify_message(message).terms("materials")
 
 
 def search_listings_by_keywords(keywords: List[str], location: Optional[str] = None, limit: int = 5) -> List[dict]:
     """
     Search listings based on keywords and return relevant materials.
+    Results come from the shared in-memory catalog index, ranked by relevance.
     """
     try:
         if getattr(settings, "DISABLE_DB", False):
-            mock_path = Path(__file__).resolve().parents[2] / "mock_data" / "waste_streams_dashboard_data.json"
-            with open(mock_path, "r") as f:
-                master_data = json.load(f)
-            
-            listings = master_data.get("waste_material_listings", [])
-            # Don't filter by status - show all listings for search
-            
-            # If no keywords provided, return all active listings
-            if not keywords:
-                matched_listings = listings.copy()
-            else:
-                # Filter by keywords
-                matched_listings = []
-                for listing in listings:
-                    title = listing.get("title", "").lower()
-                    material = listing.get("material_name", "").lower()
-                    category = listing.get("category", "").lower()
-                    description = listing.get("description", "").lower() if listing.get("description") else ""
-                    
-                    # Check if any keyword matches
-                    for keyword in keywords:
-                        keyword_lower = keyword.lower()
-                        if (keyword_lower in title or 
-                            keyword_lower in material or 
-                            keyword_lower in category or
-                            keyword_lower in description):
-                            matched_listings.append(listing)
-                            break
-            
-            # Filter by location if provided (prioritize location matches)
-            if location:
-                location_lower = location.lower()
-                location_matches = [l for l in matched_listings if location_lower in l.get("location", "").lower()]
-                if location_matches:
-                    # Show location matches first, then others if needed
-                    matched_listings = location_matches + [l for l in matched_listings if l not in location_matches]
+            matched_listings = get_catalog_index().search_listings(keywords, location, limit)
             
             # Format listings
             formatted = []
-            for listing in matched_listings[:limit]:
+            for listing in matched_listings:
                 formatted.append({
                     "id": listing.get("id"),
                     "card_type": "material",
@@ -754,79 +661,18 @@ def search_listings_by_keywords(keywords: List[str], location: Optional[str] = N
     return []
 
 
-# Machinery query keywords for detection
-MACHINERY_QUERY_KEYWORDS = [
-    "machinery", "machine", "equipment", "industrial equipment",
-    "shredder", "dual-shaft", "extruder", "processing line", "pulp line",
-    "carbonization", "furnace", "baler", "spinning", "loom",
-    "compressor", "chiller", "boiler", "bottling", "injection", "molding",
-    "cnc", "laser", "press brake", "water treatment", "ro plant",
-    "shutdown machinery", "liquidation machinery"
-]
-
-GENERIC_MACHINERY_TERMS = {
-    "machinery", "machine", "equipment", "industrial equipment",
-    "shutdown machinery", "liquidation machinery"
-}
-
-KNOWN_LOCATIONS = [
-    "mumbai", "delhi", "bangalore", "chennai", "kolkata", "hyderabad", "pune", "ahmedabad",
-    "coimbatore", "nagpur", "surat", "jaipur", "lucknow", "kanpur", "kochi"
-]
-
-
 def extract_machinery_keywords(message: str) -> List[str]:
-    message_lower = message.lower()
-    return [keyword for keyword in MACHINERY_QUERY_KEYWORDS if keyword in message_lower]
+    return classify_message(message).terms("machinery")
 
 
 def search_machinery_by_keywords(keywords: List[str], location: Optional[str] = None, limit: int = 5) -> List[dict]:
-    """Search machinery listings using master data."""
+    """Search machinery listings using the shared catalog index (brands, machine types, descriptions)."""
     try:
         if getattr(settings, "DISABLE_DB", False):
-            mock_path = Path(__file__).resolve().parents[2] / "mock_data" / "waste_streams_dashboard_data.json"
-            with open(mock_path, "r") as f:
-                master_data = json.load(f)
-
-            machinery_sources = master_data.get("machinery_listings", []) + master_data.get("all_shutdown_machinery", [])
-
-            # Deduplicate by ID (shutdown listings share IDs with base list)
-            machinery_map = {}
-            for machine in machinery_sources:
-                machine_id = str(machine.get("id"))
-                machinery_map[machine_id] = machine
-
-            machinery_list = list(machinery_map.values())
-
-            if not keywords:
-                matched = machinery_list.copy()
-            else:
-                matched = []
-                for machine in machinery_list:
-                    fields = " ".join([
-                        str(machine.get("title", "")),
-                        str(machine.get("machine_type", "")),
-                        str(machine.get("category", "")),
-                        str(machine.get("brand", "")),
-                        str(machine.get("model", "")),
-                        str(machine.get("seller_type", "")),
-                        str(machine.get("description", ""))
-                    ]).lower()
-
-                    for keyword in keywords:
-                        keyword_lower = keyword.lower()
-                        if keyword_lower and keyword_lower in fields:
-                            matched.append(machine)
-                            break
-
-            if location:
-                location_lower = location.lower()
-                location_matches = [m for m in matched if location_lower in str(m.get("location", "")).lower()]
-                if location_matches:
-                    matched = location_matches + [m for m in matched if m not in location_matches]
+            matched = get_catalog_index().search_machinery(keywords, location, limit)
 
             formatted = []
-            for machine in matched[:limit]:
+            for machine in matched:
                 price = machine.get("price_inr") or machine.get("price")
                 formatted.append({
                     "id": machine.get("id"),
@@ -933,71 +779,12 @@ def extract_business_intent(message: str) -> dict:
     Extract business idea and requirements from user message.
     Returns dict with business type, keywords, location, and required materials.
     """
-    message_lower = message.lower()
-    
-    # Business idea mapping with related materials
-    business_map = {
-        "plastic_recycling": {
-            "keywords": ["plastic", "polymer", "recycling", "hdpe", "ldpe", "pp", "pet", "pvc", "plastic recycling", "recycle plastic"],
-            "materials": ["HDPE Scrap", "PET Bottles", "PP Scrap", "LDPE Film"],
-            "category": "Plastic Waste",
-            "use": "Recycle into pellets, sheets, or new products like containers, bags, pipes"
-        },
-        "paper_products": {
-            "keywords": ["paper", "cardboard", "packaging", "printing"],
-            "materials": ["Cardboard Bales", "Mixed Paper", "Newspaper"],
-            "category": "Paper & Cardboard",
-            "use": "Make packaging boxes, tissue paper, or recycled paper products"
-        },
-        "construction_materials": {
-            "keywords": ["construction", "concrete", "cement", "building"],
-            "materials": ["Fly Ash", "Bottom Ash", "Concrete Rubble", "Brick Waste"],
-            "category": "Industrial Ash",
-            "use": "Use as additives in concrete, or process into building blocks"
-        },
-        "biofuel_energy": {
-            "keywords": ["biofuel", "biomass", "energy", "fuel"],
-            "materials": ["Bagasse", "Rice Husk", "Straw/Hay", "Coconut Shell"],
-            "category": "Agricultural/Biomass",
-            "use": "Convert to biofuel, briquettes, or biomass pellets for energy generation"
-        },
-        "textile_manufacturing": {
-            "keywords": ["textile", "fabric", "clothing", "garment"],
-            "materials": ["Cotton Scrap", "Textile Waste"],
-            "category": "Textile Waste",
-            "use": "Recycle into new fabrics, insulation material, or stuffing"
-        },
-        "metal_refining": {
-            "keywords": ["metal", "steel", "aluminum", "copper", "smelting"],
-            "materials": ["Steel Scrap", "Aluminum Scrap", "Copper Wire", "Brass Scrap"],
-            "category": "Metal Scrap",
-            "use": "Smelt and refine into pure metals for manufacturing"
-        },
-        "glass_production": {
-            "keywords": ["glass", "glassware", "bottles"],
-            "materials": ["Clear Glass", "Mixed Glass"],
-            "category": "Glass",
-            "use": "Melt and remold into new glass products or use as aggregate"
-        },
-        "rubber_production": {
-            "keywords": ["rubber", "tire", "mat"],
-            "materials": ["Rubber Crumb", "Tire Waste"],
-            "category": "Rubber & Tires",
-            "use": "Process into rubber mats, flooring, or raw rubber material"
-        }
-    }
-    
-    # Extract location if mentioned
-    location = None
-    for loc in KNOWN_LOCATIONS:
-        if loc in message_lower:
-            location = loc
-            break
+    intents = classify_message(message)
     
     # Find matching business types
     matched_businesses = []
-    for business_type, details in business_map.items():
-        if any(keyword in message_lower for keyword in details["keywords"]):
+    for business_type, details in BUSINESS_TYPES.items():
+        if intents.has(f"business:{business_type}"):
             matched_businesses.append({
                 "type": business_type,
                 "keywords": details["keywords"],
@@ -1008,7 +795,7 @@ def extract_business_intent(message: str) -> dict:
     
     return {
         "businesses": matched_businesses,
-        "location": location,
+        "location": intents.location,
         "keywords": [kw for biz in matched_businesses for kw in biz["keywords"]] if matched_businesses else []
     }
 
@@ -1018,32 +805,13 @@ def extract_manufacturing_intent(message: str) -> dict:
     Extract manufacturing type and requirements from user message.
     Returns dict with keywords, location, and material categories.
     """
-    message_lower = message.lower()
-    
-    # Manufacturing keywords mapping
-    manufacturing_map = {
-        "plastic": ["plastic", "polymer", "hdpe", "ldpe", "pp", "pet", "pvc", "plastic manufacturing", "plastic products"],
-        "metal": ["metal", "steel", "aluminum", "copper", "brass", "iron", "metalworking", "foundry", "metal products"],
-        "construction": ["construction", "concrete", "cement", "building", "fly ash", "ash", "construction material"],
-        "paper": ["paper", "cardboard", "packaging", "paper products", "paper manufacturing"],
-        "textile": ["textile", "fabric", "clothing", "garment", "textile manufacturing"],
-        "biofuel": ["biofuel", "biomass", "bagasse", "agricultural", "crop", "organic", "energy"],
-        "glass": ["glass", "glassware", "glass manufacturing"],
-        "rubber": ["rubber", "tire", "rubber products"],
-    }
-    
-    # Extract location if mentioned
-    location = None
-    for loc in KNOWN_LOCATIONS:
-        if loc in message_lower:
-            location = loc
-            break
+    intents = classify_message(message)
     
     # Find matching manufacturing types
     keywords = []
     categories = []
-    for category, terms in manufacturing_map.items():
-        if any(term in message_lower for term in terms):
+    for category, terms in MANUFACTURING_TERMS.items():
+        if intents.has(f"manufacturing:{category}"):
             keywords.extend(terms[:3])  # Add first 3 terms
             categories.append(category)
     
@@ -1051,8 +819,8 @@ def extract_manufacturing_intent(message: str) -> dict:
     # The search function will handle empty keywords by returning all listings
     
     return {
-        "keywords": list(set(keywords))[:5],  # Unique keywords, max 5
-        "location": location,
+        "keywords": list(dict.fromkeys(keywords))[:5],  # Unique keywords, max 5
+        "location": intents.location,
         "categories": categories
     }
 
@@ -1061,15 +829,10 @@ def get_chatbot_response(user_message: str, conversation_history: List[ChatMessa
     """
     Generate intelligent responses based on user queries about the waste marketplace.
     """
-    message_lower = user_message.lower()
+    intents = classify_message(user_message)
     
     # Check for BUSINESS IDEA intent first
-    business_indicators = [
-        "business idea", "start business", "business venture", "entrepreneurship",
-        "want to start", "planning to start", "new business", "looking to start"
-    ]
-    
-    if any(indicator in message_lower for indicator in business_indicators):
+    if intents.has("business_idea"):
         # Extract business intent
         intent = extract_business_intent(user_message)
         
@@ -1172,13 +935,9 @@ def get_chatbot_response(user_message: str, conversation_history: List[ChatMessa
             )
     
     # Machinery specific queries
-    machinery_keywords = extract_machinery_keywords(user_message)
-    if machinery_keywords or "machinery" in message_lower or "equipment" in message_lower:
-        location = None
-        for loc in KNOWN_LOCATIONS:
-            if loc in message_lower:
-                location = loc
-                break
+    if intents.has("machinery"):
+        machinery_keywords = intents.terms("machinery")
+        location = intents.location
 
         search_terms = [kw for kw in machinery_keywords if kw not in GENERIC_MACHINERY_TERMS]
         machinery_results = search_machinery_by_keywords(search_terms, location, limit=5)
@@ -1263,13 +1022,7 @@ def get_chatbot_response(user_message: str, conversation_history: List[ChatMessa
             )
 
     # Check for manufacturing/manufacturing unit/raw material intent
-    manufacturing_indicators = [
-        "manufacturing", "manufacturing unit", "factory", "production", 
-        "raw material", "raw materials", "need material", "need materials",
-        "looking for material", "looking for materials", "sourcing", "procure"
-    ]
-    
-    if any(indicator in message_lower for indicator in manufacturing_indicators):
+    if intents.has("manufacturing"):
         # Extract intent
         intent = extract_manufacturing_intent(user_message)
         
@@ -1333,73 +1086,73 @@ def get_chatbot_response(user_message: str, conversation_history: List[ChatMessa
     
     # Continue with existing responses...
     # Context-aware responses
-    if any(word in message_lower for word in ["hello", "hi", "hey", "greetings"]):
+    if intents.has("reply:greeting"):
         return ChatResponse(
             message="Hello! 👋 I'm your waste material marketplace assistant. I can help you with:\n\n• Finding waste materials\n• Understanding how to list materials\n• Learning about auctions and bidding\n• Navigating the platform\n• Answering questions about the marketplace\n\nWhat would you like to know?",
             suggestions=["How do I list materials?", "How does bidding work?", "What materials are available?"]
         )
     
-    elif any(word in message_lower for word in ["list", "sell", "create listing", "post"]):
+    elif intents.has("reply:listing"):
         return ChatResponse(
             message="To list waste materials on our marketplace:\n\n1️⃣ **Sign up** as a seller account\n2️⃣ **Navigate** to your dashboard\n3️⃣ **Click** 'Create New Listing'\n4️⃣ **Fill in** details:\n   - Material name and description\n   - Quantity and unit\n   - Price or set as auction\n   - Location\n   - Availability dates\n\n5️⃣ **Submit** your listing for review\n\nListings can be fixed-price or auction-based. Would you like to know more about either option?",
             suggestions=["What's the difference between fixed price and auction?", "How long does listing approval take?"]
         )
     
-    elif any(word in message_lower for word in ["buy", "purchase", "order", "how to buy"]):
+    elif intents.has("reply:buying"):
         return ChatResponse(
             message="Buying waste materials is simple:\n\n**For Fixed-Price Listings:**\n1️⃣ Browse available materials\n2️⃣ Click on a listing to view details\n3️⃣ Enter desired quantity\n4️⃣ Place your order\n5️⃣ Wait for seller confirmation\n\n**For Auction Listings:**\n1️⃣ Find auction listings\n2️⃣ View current highest bid\n3️⃣ Place your bid\n4️⃣ Monitor until auction ends\n\n💡 Tip: Check the seller's company info and material quality ratings before purchasing!",
             suggestions=["How does bidding work?", "What payment methods are accepted?"]
         )
     
-    elif any(word in message_lower for word in ["auction", "bid", "bidding", "how to bid"]):
+    elif intents.has("reply:auction"):
         return ChatResponse(
             message="Our auction system allows real-time bidding:\n\n🎯 **How it works:**\n• Sellers create auction listings with a starting bidשר\n• Buyers place bids higher than the current highest bid\n• Auctions have an end time - highest这是我们 bid at that time wins\n• Real-time updates via WebSocket\n\n⚡ **Tips for bidding:**\n• Set a maximum budget beforehand\n• Bid early to establish interest\n• Monitor auctions closely near end time\n• Your bid must be higher than current highest\n\n💰 **Winning:**\nWhen auction ends, you'll be notified if you won and can proceed with payment.",
             suggestions=["Can I retract a bid?", "What happens if I win an auction?"]
         )
     
-    elif any(word in message_lower for word in ["material", "materials", "what materials", "available"]):
+    elif intents.has("reply:materials"):
         return ChatResponse(
             message="We have a wide variety of waste materials available:\n\n📦 **Categories:**\n• Agricultural/Biomass (bagasse, crop residue)\n• Industrial Ash (fly ash, bottom ash)\n• Plastic Waste (HDPE, LDPE, PP)\n• Metal Scrap (aluminum, steel, copper)\n• Paper & Cardboard\n• Construction & Demolition waste\n• Glass waste\n• Textile Waste\n• Rubber & Tires\n• Organic/Food Waste\n\n🔍 You can browse all materials using our search and filter system. Need help finding something specific?",
             suggestions=["How do I search for materials?", "What are the most popular materials?"]
         )
     
-    elif any(word in message_lower for word in ["search", "filter", "find", "browse"]):
+    elif intents.has("reply:search"):
         return ChatResponse(
             message="Our search and filter system helps you find exactly what you need:\n\n🔍 **Search options:**\n• Material name (e.g., 'fly ash', 'plastic')\n• Location\n• Category\n• Price range\n• Listing type (fixed price or auction)\n\n💡 **Tips:**\n• Use the search bar at the top of listings page\n• Combine multiple filters for precise results\n• Check the map view for nearby materials\n• Save searches for quick access later\n\nTry it out on the Listings page!",
             suggestions=["How do I save a search?", "Can I get notifications for new listings?"]
         )
     
-    elif any(word in message_lower for word in ["price", "cost", "expensive", "cheap", "pricing"]):
+    elif intents.has("reply:pricing"):
         return ChatResponse(
             message="Pricing on our marketplace:\n\n💰 **Pricing Models:**\n• **Fixed Price:** Set price per unit, shown upfront\n• **Auction:** Starting bid set, final price determined by bidding\n\n💵 **Factors affecting price:**\n• Material quality and grade\n• Quantity available (bulk discounts may apply)\n• Location (transportation costs)\n• Market demand\n• Material type and rarity\n\n📊 Prices are shown per unit (tons, kg, etc.) and total value for the lot.\n\nWould you like to know how to negotiate prices with sellers?",
             suggestions=["How do I contact sellers?", "Are there bulk discounts?"]
         )
     
-    elif any(word in message_lower for word in ["contact", "seller", "message", "communicate"]):
+    elif intents.has("reply:contact"):
         return ChatResponse(
             message="Contacting sellers:\n\n💬 **Ways to communicate:**\n• View seller company info on listing page\n• Send inquiries through the listing inquiry feature\n• Check seller ratings and reviews\n\n📧 **Inquiry feature:**\n• Click 'Contact Seller' on any listing\n• Send a message with your questions\n• Receive responses via email or dashboard notifications\n\n⭐ **Before contacting:**\n• Review the listing details thoroughly\n• Check seller's response time and ratings\n• Prepare specific questions about material quality, quantity, or logistics\n\nNeed help with something else?",
             suggestions=["How do I see seller ratings?", "What information should I include in an inquiry?"]
         )
     
-    elif any(word in message_lower for word in ["account", "profile", "dashboard", "my account"]):
+    elif intents.has("reply:account"):
         return ChatResponse(
             message="Your account dashboard provides comprehensive insights:\n\n👤 **For Sellers:**\n• View all your listings and their status\n• Track sales and revenue\n• Manage orders and inquiries\n• See auction performance\n• Analytics and statistics\n\n🛒 **For Buyers:**\n• View your orders and purchase history\n• Track your bids and auction activity\n• Saved listings and searches\n• Inquiries you've sent\n\n🔐 **Account Settings:**\n• Update profile information\n• Change password\n• Manage notifications\n• View transaction history\n\nAccess your dashboard from the top navigation menu!",
             suggestions=["How do I update my profile?", "What notifications can I receive?"]
         )
     
-    elif any(word in message_lower for word in ["help", "support", "question", "problem"]):
+    elif intents.has("reply:help"):
         return ChatResponse(
             message="I'm here to help! 🌟\n\n**Common topics I can assist with:**\n• Listing materials for sale\n• Browsing and buying materials\n• Understanding auctions and bidding\n• Account management\n• Searching and filtering\n• Platform navigation\n\n**If you need further assistance:**\n• Check our FAQ section (link in footer)\n• Contact support via email: support@wastemarket.com\n• Review our Help Center articles\n\nJust ask me anything about the marketplace and I'll do my best to help!",
             suggestions=["How do I report a problem?", "Where is the FAQ section?"]
         )
     
-    elif any(word in message_lower for word in ["thank", "thanks", "appreciate"]):
+    elif intents.has("reply:thanks"):
         return ChatResponse(
             message="You're welcome! 😊\n\nI'm always here to help you navigate the waste material marketplace. Feel free to ask if you have any other questions!\n\nHappy trading! ♻️",
             suggestions=["How do I get started?", "What are the benefits of using this platform?"]
         )
     
-    elif any(word in message_lower for word in ["benefits", "why", "advantage", "why use"]):
+    elif intents.has("reply:benefits"):
         return ChatResponse(
             message="Why use our waste material marketplace? 🌟\n\n✅ **For Sellers:**\n• Turn waste into revenue\n• Reach larger buyer network\n• Flexible pricing options\n• Easy listing management\n• Real-time analytics\n\n✅ **For Buyers:**\n• Wide variety of materials\n• Competitive pricing\n• Quality verified sellers\n• Easy search and comparison\n• Secure transactions\n\n🌍 **Environmental Impact:**\n• Promotes circular economy\n• Reduces landfill waste\n• Supports sustainable practices\n• Contributes to ESG goals\n\nReady to get started?",
             suggestions=["How do I sign up?", "Is it free to list materials?"]
@@ -1413,6 +1166,174 @@ def get_chatbot_response(user_message: str, conversation_history: List[ChatMessa
         )
 
 
+async def _resolve_local_turn(request: ChatRequest, http_request: Request) -> Tuple[Optional[ChatResponse], Optional[str]]:
+    """
+    Handle everything that does not need an AI backend: the seller listing flow
+    and listing-creation intents. Returns (response, user_role); the response is
+    None when the message should go to Watson or the rule-based fallback.
+    """
+    current_user = _get_user_from_request(http_request)
+    user_role = current_user.get("role") if current_user else None
+
+    if not current_user and request.user_role:
+        current_user = {
+            "role": request.user_role,
+            "email": request.user_email,
+            "username": request.user_username,
+            "company_name": request.user_company,
+        }
+        user_role = request.user_role
+        logger.info("👤 Using request-provided user context (no auth token detected)")
+    if user_role:
+        logger.info(f"👤 Chatbot invoked by user role: {user_role}")
+
+    flow_key = _get_listing_flow_key(current_user)
+    
+    # Check if this is an informational query first (questions, asking for help/info)
+    # Informational queries should go to Watson services, not listing flow
+    intents = classify_message(request.message)
+    
+    # First, check if this is a QUESTION (informational) - prioritize this over listing creation
+    is_question = intents.has("question")
+    
+    # Check if this is a listing creation query (NOT informational)
+    # Listing creation queries should use WatsonX for parsing, not Orchestrate
+    # But only if it's NOT a question
+    is_listing_creation = (not is_question) and intents.has("listing_creation")
+    
+    # Check if it's asking about existing listings/data (not creating new ones)
+    is_querying_existing = intents.has("querying_existing")
+    
+    # If it's a question OR querying existing, it's informational
+    # Questions take priority over listing creation detection
+    is_informational_query = is_question or is_querying_existing
+    
+    # Only check for listing intent if it's not clearly an informational query
+    if is_listing_creation:
+        logger.info("📝 Detected listing creation query - will use WatsonX for parsing")
+    
+    if is_informational_query:
+        logger.info(f"📝 Detected informational query (question: {is_question}, querying existing: {is_querying_existing}) - routing to Watson services")
+        seller_intent = False
+    else:
+        seller_intent = _should_start_listing_flow(request.message) or is_listing_creation
+        if seller_intent:
+            logger.info("📋 Detected listing creation intent - starting listing flow")
+
+    if user_role == "seller" and flow_key:
+        # Continue ongoing listing flow if present
+        flow_response = _handle_listing_flow_message(flow_key, current_user, request.message)
+        if flow_response:
+            return flow_response, user_role
+
+    if seller_intent:
+        if not current_user:
+            return ChatResponse(
+                message="You're almost there! Please sign in as a seller so I can publish the listing on your behalf.",
+                suggestions=["Log in", "How do I become a seller?"],
+            ), user_role
+
+        if user_role != "seller":
+            return ChatResponse(
+                message="Listing creation is available for seller accounts. Switch to your seller profile (or apply to become one) and ask me again when you're ready!",
+                suggestions=["How do I become a seller?", "Show me seller benefits"],
+            ), user_role
+
+        structured = await _parse_structured_listing(request.message)
+
+        if not flow_key:
+            flow_key = _get_listing_flow_key(current_user)
+            if not flow_key:
+                flow_key = f"seller-{current_user.get('id') or current_user.get('username') or datetime.utcnow().timestamp()}"
+
+        if structured:
+            LISTING_FLOW_SESSIONS.set(flow_key, {
+                "step_index": LISTING_FLOW_TOTAL_STEPS,
+                "data": structured,
+                "started_at": datetime.utcnow().isoformat(),
+                "pending_confirmation": True,
+            })
+            preview = _format_structured_listing_preview(structured)
+            return ChatResponse(
+                message="Great! I'll collect the details to publish your listing.\n\n" + preview,
+                suggestions=["Yes, publish it", "No, start over"],
+            ), user_role
+
+        _start_listing_flow(flow_key)
+        prompt = _get_step_instruction(LISTING_FLOW_FIELDS[0], 0)
+        return ChatResponse(
+            message="Great! I'll collect the details to publish your listing.\n\n" + prompt,
+            suggestions=_default_listing_flow_suggestions(),
+        ), user_role
+
+    return None, user_role
+
+
+def _get_enabled_watson_service():
+    """Return the Watson service when at least one backend is enabled, else None"""
+    watson_service = _watson_service()
+    if watson_service is None:
+        logger.warning("⚠️  Watson services not available - using rule-based fallback")
+        return None
+
+    if not (watson_service.orchestrate_enabled or watson_service.watsonx_enabled):
+        logger.warning("⚠️  Watson services available but not enabled - check configuration")
+        return None
+    if not watson_service.has_available_backend():
+        logger.warning("⚠️  Watson backends unhealthy (circuit open) - using rule-based fallback")
+        return None
+
+    logger.info("🤖 Using Watson services for response")
+    logger.info(f"   Orchestrate enabled: {watson_service.orchestrate_enabled}")
+    logger.info(f"   WatsonX enabled: {watson_service.watsonx_enabled}")
+    return watson_service
+
+
+# Concurrent identical messages share one context lookup (built in a worker thread)
+_context_flight = SingleFlight()
+
+
+def _build_watson_context(message: str) -> Dict[str, Any]:
+    """Prepare context data (listings, machinery) to ground the Watson answer"""
+    intents = classify_message(message)
+    context_data = {}
+    keywords = intents.terms("materials")
+    
+    if keywords:
+        listings = search_listings_by_keywords(keywords, limit=5)
+        if listings:
+            context_data["listings"] = listings
+
+    # Add machinery context if applicable
+    if intents.has("machinery"):
+        search_terms = [kw for kw in intents.terms("machinery") if kw not in GENERIC_MACHINERY_TERMS]
+        machinery_results = search_machinery_by_keywords(search_terms, intents.location, limit=5)
+        if machinery_results:
+            context_data["machinery"] = machinery_results
+
+    return context_data
+
+
+def _context_listing_cards(context_data: Dict[str, Any]) -> List[dict]:
+    """Pick up to two cards from the Watson context to show next to the answer"""
+    listings_payload = []
+    machinery_context = context_data.get("machinery")
+    if machinery_context:
+        listings_payload.extend(machinery_context[:2])
+    if len(listings_payload) < 2:
+        material_context = context_data.get("listings")
+        if material_context:
+            listings_payload.extend(material_context[: 2 - len(listings_payload)])
+    return listings_payload
+
+
+WATSON_RESPONSE_SUGGESTIONS = [
+    "Tell me about waste materials",
+    "What are the prices?",
+    "How do I start a business?",
+]
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest, http_request: Request):
     """
@@ -1425,198 +1346,37 @@ async def chat(request: ChatRequest, http_request: Request):
         if not request.message or not request.message.strip():
             raise HTTPException(status_code=400, detail="Message cannot be empty")
         
-        current_user = _get_user_from_request(http_request)
-        user_role = current_user.get("role") if current_user else None
-
-        if not current_user and request.user_role:
-            current_user = {
-                "role": request.user_role,
-                "email": request.user_email,
-                "username": request.user_username,
-                "company_name": request.user_company,
-            }
-            user_role = request.user_role
-            logger.info("👤 Using request-provided user context (no auth token detected)")
-        if user_role:
-            logger.info(f"👤 Chatbot invoked by user role: {user_role}")
-
-        flow_key = _get_listing_flow_key(current_user)
-        
-        # Check if this is an informational query first (questions, asking for help/info)
-        # Informational queries should go to Watson services, not listing flow
-        message_lower = request.message.lower()
-        
-        # First, check if this is a QUESTION (informational) - prioritize this over listing creation
-        # Question words that indicate informational queries
-        question_indicators = [
-            "what", "how", "where", "when", "why", "can i", "should i",
-            "what can i do", "what can i", "how can i", "how do", "how is", "how are",
-            "what is", "what are", "how does", "how did",
-            "tell me", "explain", "describe", "help me", "i want to know",
-            "do we have", "do you have", "are there", "can you", "can we",
-            "do they have", "is there", "are there any", "show me"
-        ]
-        is_question = any(qword in message_lower for qword in question_indicators)
-        
-        # Check if this is a listing creation query (NOT informational)
-        # Listing creation queries should use WatsonX for parsing, not Orchestrate
-        # But only if it's NOT a question
-        listing_creation_indicators = [
-            "i have", "i've got", "we have", "we've got",
-            "available for sale", "for sale", "priced at", "price per",
-            "tons available", "kg available", "material available",
-            "fixed sale", "fixed price", "selling"
-        ]
-        # Only treat as listing creation if it's not a question
-        is_listing_creation = (not is_question) and any(phrase in message_lower for phrase in listing_creation_indicators)
-        
-        # Keywords that indicate informational queries about existing data
-        informational_indicators = [
-            "existing", "current", "list of", "find", "search",
-            "show", "display", "get", "fetch", "browse"
-        ]
-        
-        # Check if it's asking about existing listings/data (not creating new ones)
-        is_querying_existing = any(indicator in message_lower for indicator in [
-            "existing", "current", "do we have", "are there",
-            "show me", "find", "search", "browse", "get listings", "see listings"
-        ])
-        
-        # If it's a question OR querying existing, it's informational
-        # Questions take priority over listing creation detection
-        is_informational_query = is_question or is_querying_existing
-        
-        # Only check for listing intent if it's not clearly an informational query
-        if is_listing_creation:
-            logger.info("📝 Detected listing creation query - will use WatsonX for parsing")
-        
-        if is_informational_query:
-            logger.info(f"📝 Detected informational query (question: {is_question}, querying existing: {is_querying_existing}) - routing to Watson services")
-            seller_intent = False
-        else:
-            seller_intent = _should_start_listing_flow(request.message) or is_listing_creation
-            if seller_intent:
-                logger.info("📋 Detected listing creation intent - starting listing flow")
-
-        if user_role == "seller" and flow_key:
-            # Continue ongoing listing flow if present
-            existing_flow = LISTING_FLOW_SESSIONS.get(flow_key)
-            if existing_flow:
-                flow_response = _handle_listing_flow_message(flow_key, current_user, request.message)
-                if flow_response:
-                    return flow_response
-
-        if seller_intent:
-            if not current_user:
-                return ChatResponse(
-                    message="You're almost there! Please sign in as a seller so I can publish the listing on your behalf.",
-                    suggestions=["Log in", "How do I become a seller?"],
-                )
-
-            if user_role != "seller":
-                return ChatResponse(
-                    message="Listing creation is available for seller accounts. Switch to your seller profile (or apply to become one) and ask me again when you're ready!",
-                    suggestions=["How do I become a seller?", "Show me seller benefits"],
-                )
-
-            structured = _call_watson_listing_parser(request.message)
-
-            if not flow_key:
-                flow_key = _get_listing_flow_key(current_user)
-                if not flow_key:
-                    flow_key = f"seller-{current_user.get('id') or current_user.get('username') or datetime.utcnow().timestamp()}"
-
-            if structured:
-                LISTING_FLOW_SESSIONS[flow_key] = {
-                    "step_index": LISTING_FLOW_TOTAL_STEPS,
-                    "data": structured,
-                    "started_at": datetime.utcnow().isoformat(),
-                    "pending_confirmation": True,
-                }
-                preview = _format_structured_listing_preview(structured)
-                return ChatResponse(
-                    message="Great! I'll collect the details to publish your listing.\n\n" + preview,
-                    suggestions=["Yes, publish it", "No, start over"],
-                )
-
-            _start_listing_flow(flow_key)
-            prompt = _get_step_instruction(LISTING_FLOW_FIELDS[0], 0)
-            return ChatResponse(
-                message="Great! I'll collect the details to publish your listing.\n\n" + prompt,
-                suggestions=_default_listing_flow_suggestions(),
-            )
+        local_response, user_role = await _resolve_local_turn(request, http_request)
+        if local_response:
+            return local_response
 
         # Try Watson services first if available
-        # Skip this if it's a listing creation query (already handled above with WatsonX)
-        if not seller_intent and WATSON_AVAILABLE and get_watson_service:
-            watson_service = get_watson_service()
+        watson_service = _get_enabled_watson_service()
+        if watson_service:
+            # IAM tokens are fetched in the background while context is retrieved off the event loop
+            watson_service.prefetch_tokens(request.message)
+            context_data = await _context_flight.do(normalize_key(request.message), _build_watson_context, request.message)
             
-            # Check if watson services are enabled
-            if watson_service.orchestrate_enabled or watson_service.watsonx_enabled:
-                logger.info("🤖 Using Watson services for response")
-                logger.info(f"   Orchestrate enabled: {watson_service.orchestrate_enabled}")
-                logger.info(f"   WatsonX enabled: {watson_service.watsonx_enabled}")
-                message_lower = request.message.lower()
-                
-                # Prepare context data (listings, materials, etc.)
-                context_data = {}
-                keywords = extract_keywords_from_message(request.message)
-                
-                if keywords:
-                    listings = search_listings_by_keywords(keywords, limit=5)
-                    if listings:
-                        context_data["listings"] = listings
-
-                # Add machinery context if applicable
-                machinery_keywords = extract_machinery_keywords(request.message)
-                if machinery_keywords or "machinery" in message_lower or "equipment" in message_lower:
-                    search_terms = [kw for kw in machinery_keywords if kw not in GENERIC_MACHINERY_TERMS]
-                    machinery_location = None
-                    for loc in KNOWN_LOCATIONS:
-                        if loc in message_lower:
-                            machinery_location = loc
-                            break
-                    machinery_results = search_machinery_by_keywords(search_terms, machinery_location, limit=5)
-                    if machinery_results:
-                        context_data["machinery"] = machinery_results
-                
-                # Generate AI response
-                ai_response = watson_service.generate_response(
-                    message=request.message,
-                    conversation_history=[
-                        {"role": msg.role, "content": msg.content} 
-                        for msg in request.conversation_history
-                    ],
-                    context_data=context_data if context_data else None,
-                    user_role=user_role
+            # Generate AI response
+            ai_response = await watson_service.generate_response(
+                message=request.message,
+                conversation_history=[
+                    {"role": msg.role, "content": msg.content} 
+                    for msg in request.conversation_history
+                ],
+                context_data=context_data if context_data else None,
+                user_role=user_role
+            )
+            
+            if ai_response:
+                logger.info("✅ Returned AI-generated response from Watson")
+                return ChatResponse(
+                    message=ai_response,
+                    suggestions=list(WATSON_RESPONSE_SUGGESTIONS),
+                    listings=_context_listing_cards(context_data)
                 )
-                
-                if ai_response:
-                    logger.info("✅ Returned AI-generated response from Watson")
-                    listings_payload = []
-                    machinery_context = context_data.get("machinery")
-                    if machinery_context:
-                        listings_payload.extend(machinery_context[:2])
-                    if len(listings_payload) < 2:
-                        material_context = context_data.get("listings")
-                        if material_context:
-                            listings_payload.extend(material_context[: 2 - len(listings_payload)])
-
-                    return ChatResponse(
-                        message=ai_response,
-                        suggestions=[
-                            "Tell me about waste materials",
-                            "What are the prices?",
-                            "How do I start a business?",
-                        ],
-                        listings=listings_payload
-                    )
-                else:
-                    logger.warning("⚠️  Watson returned no response, falling back to rules")
             else:
-                logger.warning("⚠️  Watson services available but not enabled - check configuration")
-        else:
-            logger.warning("⚠️  Watson services not available - using rule-based fallback")
+                logger.warning("⚠️  Watson returned no response, falling back to rules")
         
         # Fallback to rule-based response
         logger.info("📝 Using rule-based response (fallback)")
@@ -1628,6 +1388,79 @@ async def chat(request: ChatRequest, http_request: Request):
         raise HTTPException(status_code=500, detail=f"Error processing chat message: {str(e)}")
 
 
+def _ndjson(event: Dict[str, Any]) -> bytes:
+    return (json.dumps(event, default=str) + "\n").encode("utf-8")
+
+
+async def _stream_complete_response(response: ChatResponse) -> AsyncIterator[bytes]:
+    yield _ndjson({"event": "delta", "text": response.message})
+    yield _ndjson({"event": "done", "suggestions": response.suggestions or [], "listings": response.listings or []})
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest, http_request: Request):
+    """
+    Streaming variant of /chat returning NDJSON events:
+    - {"event": "delta", "text": ...} for every chunk of the answer, forwarded as Watson produces it
+    - {"event": "done", "suggestions": [...], "listings": [...]} once the answer is complete
+    The upstream stream is read only as fast as the client consumes it, and is
+    cancelled when the client disconnects.
+    """
+    if not request.message or not request.message.strip():
+        raise HTTPException(status_code=400, detail="Message cannot be empty")
+
+    local_response, user_role = await _resolve_local_turn(request, http_request)
+    if local_response:
+        return StreamingResponse(_stream_complete_response(local_response), media_type="application/x-ndjson")
+
+    watson_service = _get_enabled_watson_service()
+    if not watson_service:
+        response = get_chatbot_response(request.message, request.conversation_history)
+        return StreamingResponse(_stream_complete_response(response), media_type="application/x-ndjson")
+
+    watson_service.prefetch_tokens(request.message)
+    context_data = await _context_flight.do(normalize_key(request.message), _build_watson_context, request.message)
+    conversation_history = [
+        {"role": msg.role, "content": msg.content}
+        for msg in request.conversation_history
+    ]
+
+    async def events() -> AsyncIterator[bytes]:
+        produced = False
+        async for chunk in watson_service.stream_response(
+            message=request.message,
+            conversation_history=conversation_history,
+            context_data=context_data if context_data else None,
+            user_role=user_role,
+        ):
+            produced = True
+            yield _ndjson({"event": "delta", "text": chunk})
+
+        if produced:
+            yield _ndjson({
+                "event": "done",
+                "suggestions": list(WATSON_RESPONSE_SUGGESTIONS),
+                "listings": _context_listing_cards(context_data),
+            })
+            return
+
+        logger.warning("⚠️  Watson stream returned no response, falling back to rules")
+        fallback = get_chatbot_response(request.message, request.conversation_history)
+        async for line in _stream_complete_response(fallback):
+            yield line
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@router.get("/backends")
+async def get_backend_health():
+    """Circuit breaker state, failure rate, latency percentiles and timeout per Watson backend"""
+    watson_service = _watson_service()
+    if watson_service is None:
+        return {"available": False, "backends": {}}
+    return {"available": True, "backends": watson_service.backend_health()}
+
+
 @router.get("/suggestions")
 async def get_suggestions():
     """
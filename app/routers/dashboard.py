@@ -5,6 +5,7 @@ import json
 from pathlib import Path
 
 from app.utils import mock_storage
+from app.utils.catalog_snapshot import load_catalog
 
 router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
 
@@ -24,8 +25,7 @@ def get_seller_dashboard(current_user = Depends(get_mock_or_current_user)):
     # Enrich with master analytics if available
     if master_path.exists():
         try:
-            with open(master_path, "r") as mf:
-                master = json.load(mf)
+            master = load_catalog(master_path)
             data["analytics"] = master
         except Exception:
             pass
@@ -53,8 +53,7 @@ def get_buyer_dashboard(current_user = Depends(get_mock_or_current_user)):
     # Enrich with master analytics if available
     if master_path.exists():
         try:
-            with open(master_path, "r") as mf:
-                master = json.load(mf)
+            master = load_catalog(master_path)
             data["analytics"] = master
         except Exception:
             pass
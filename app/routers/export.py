@@ -0,0 +1,161 @@
+"""
+Streaming data export
+Listings, orders and bids are streamed record by record from the JSON storage files
+as CSV or NDJSON, so memory use does not grow with the size of the collection.
+A malformed source file aborts the stream rather than ending it early, so a cut-short
+export is never mistaken for a complete one.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Dict, Iterator, List, Optional
+from datetime import date, datetime
+import csv
+import io
+import json
+
+from app.utils.auth import get_seller_user
+from app.utils.mock_storage import iter_auctions, iter_bids, iter_master_records, iter_orders
+
+router = APIRouter(prefix="/api/export", tags=["Export"])
+
+# Rows are sent in small batches: one chunk per row costs a threadpool hop each
+FLUSH_ROWS = 200
+
+EXPORT_COLUMNS = {
+    "listings": [
+        "id", "title", "material_name", "category", "quantity", "unit", "price_per_unit", "total_value",
+        "sale_type", "status", "location", "seller_company", "date_posted", "views", "inquiries", "description",
+    ],
+    "orders": [
+        "id", "external_id", "listing_id", "status", "quantity", "unit", "price_per_unit", "total_price",
+        "payment_status", "buyer_id", "buyer_company", "seller_company", "material_name", "delivery_location",
+        "created_at", "updated_at",
+    ],
+    "bids": ["id", "auction_id", "bidder_id", "amount", "status", "is_winning", "seller_company", "created_at"],
+}
+
+# Field holding each record's date for the date_from/date_to filters
+DATE_FIELDS = {"listings": "date_posted", "orders": "created_at", "bids": "created_at"}
+
+
+def _record_date(value) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).date()
+    except ValueError:
+        return None
+
+
+def _iter_bid_records() -> Iterator[Dict]:
+    """Bids carry no seller, so they are joined to their auction's seller_company"""
+    # One small entry per auction; bids themselves are still streamed
+    auction_sellers = {auction.get("id"): auction.get("seller_company") for auction in iter_auctions(strict=True)}
+    for bid in iter_bids(strict=True):
+        yield {
+            **bid,
+            "status": bid.get("status") or ("winning" if bid.get("is_winning") else "outbid"),
+            "seller_company": auction_sellers.get(bid.get("auction_id")),
+        }
+
+
+def _source(collection: str) -> Iterator[Dict]:
+    if collection == "listings":
+        return iter_master_records("waste_material_listings", strict=True)
+    if collection == "orders":
+        return iter_orders(strict=True)
+    return _iter_bid_records()
+
+
+def _filtered(
+    records: Iterator[Dict],
+    collection: str,
+    seller: Optional[str],
+    status: Optional[str],
+    date_from: Optional[date],
+    date_to: Optional[date],
+) -> Iterator[Dict]:
+    seller_lower = seller.lower() if seller else None
+    status_lower = status.lower() if status else None
+    date_field = DATE_FIELDS[collection]
+    for record in records:
+        if seller_lower and str(record.get("seller_company") or "").lower() != seller_lower:
+            continue
+        if status_lower and str(record.get("status") or "").lower() != status_lower:
+            continue
+        if date_from or date_to:
+            record_date = _record_date(record.get(date_field))
+            if record_date is None:
+                continue
+            if date_from and record_date < date_from:
+                continue
+            if date_to and record_date > date_to:
+                continue
+        yield record
+
+
+def _csv_chunks(records: Iterator[Dict], columns: List[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    pending = 0
+    for record in records:
+        writer.writerow(record)
+        pending += 1
+        if pending >= FLUSH_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
+
+
+def _ndjson_chunks(records: Iterator[Dict], columns: List[str]) -> Iterator[str]:
+    lines = []
+    for record in records:
+        lines.append(json.dumps({column: record.get(column) for column in columns}, default=str))
+        if len(lines) >= FLUSH_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+FORMATS: Dict[str, tuple] = {
+    "csv": ("text/csv", _csv_chunks),
+    "ndjson": ("application/x-ndjson", _ndjson_chunks),
+}
+
+
+@router.get("/{collection}")
+def export_collection(
+    collection: str,
+    format: str = Query("csv", description="csv or ndjson"),
+    seller: Optional[str] = Query(None, description="Seller company (admins only; sellers always get their own)"),
+    status: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    current_user = Depends(get_seller_user),
+):
+    """Stream a whole collection as CSV or NDJSON"""
+    if collection not in EXPORT_COLUMNS:
+        raise HTTPException(status_code=404, detail=f"Unknown collection. Choose from: {', '.join(EXPORT_COLUMNS)}")
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail="format must be csv or ndjson")
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+
+    # Sellers can only export their own records
+    if current_user.get("role") != "admin":
+        seller = current_user.get("company_name") or current_user.get("username")
+
+    media_type, render = FORMATS[format]
+    columns = EXPORT_COLUMNS[collection]
+    records = _filtered(_source(collection), collection, seller, status, date_from, date_to)
+    filename = f"{collection}-{datetime.utcnow().strftime('%Y%m%d')}.{format}"
+    return StreamingResponse(
+        render(records, columns),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,25 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from pydantic import ValidationError
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from app.schemas.listing import ListingCreate, ListingUpdate, ListingResponse, ListingSubmission
 from app.utils.auth import get_current_active_user, get_seller_user
+from app.utils.catalog_snapshot import load_catalog
+from app.utils.mock_storage import STORAGE_INDEX, JSONStorage
 from app.config import settings
-import json
+from app.utils.record_stream import RecordTooLarge, detect_format, iter_rows
+from app.utils.shared_catalog import CatalogTable, get_shared_catalog
+from app.utils.single_flight import SingleFlight, normalize_key
+import asyncio
 from pathlib import Path
 
 router = APIRouter(prefix="/api/listings", tags=["Listings"])
 
 DATA_PATH = Path(__file__).resolve().parents[2] / "mock_data" / "waste_streams_dashboard_data.json"
 
+# Identical concurrent searches share one filter pass
+_search_flight = SingleFlight()
+
+# Read path: the mmap-shared catalog, identical across workers
+_catalog = get_shared_catalog(DATA_PATH)
+
 
 def load_master_data() -> dict:
-    with open(DATA_PATH, "r") as f:
-        return json.load(f)
+    return load_catalog(DATA_PATH)
 
 
 def save_master_data(data: dict):
-    with open(DATA_PATH, "w") as f:
-        json.dump(data, f, indent=2)
+    JSONStorage.save(DATA_PATH, data)
+
+
+def catalog_listings() -> CatalogTable:
+    return _catalog.current().table("waste_material_listings")
 
 
 def format_listing(listing: dict) -> dict:
@@ -51,7 +65,7 @@ def format_listing(listing: dict) -> dict:
 
 
 @router.get("")
-def get_listings(
+async def get_listings(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     search: Optional[str] = None,
@@ -60,11 +74,27 @@ def get_listings(
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
     listing_type: Optional[str] = None
+):
+    # Text filters are case-insensitive; listing_type is matched exactly so it stays out of the normalized part
+    key = normalize_key("list", skip, limit, search, material_name, location, min_price, max_price) + (listing_type,)
+    return await _search_flight.do(
+        key, _search_listings, skip, limit, search, material_name, location, min_price, max_price, listing_type
+    )
+
+
+def _search_listings(
+    skip: int,
+    limit: int,
+    search: Optional[str],
+    material_name: Optional[str],
+    location: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    listing_type: Optional[str]
 ):
     # Using JSON storage (always enabled)
     if True:
-        master_data = load_master_data()
-        listings = master_data.get("waste_material_listings", [])
+        listings = list(catalog_listings())
         
         # For demo/POC: Show ALL listings to showcase all 20 materials
         # No filtering - show everything including expired listings
@@ -95,21 +125,15 @@ def get_listings(
         if max_price is not None:
             listings = [l for l in listings if l.get("price_per_unit", 0) <= max_price]
         
-        # Convert to expected format
-        formatted_listings = [format_listing(listing) for listing in listings]
-
-        # Apply pagination
-        formatted_listings = formatted_listings[skip:skip + limit]
-        return formatted_listings
+        # Apply pagination, then convert only the page to the response format
+        return [format_listing(listing) for listing in listings[skip:skip + limit]]
 
 
 @router.get("/{listing_id}")
 def get_listing(listing_id: int):
     # Using JSON storage (always enabled)
     if True:
-        master_data = load_master_data()
-        listings = master_data.get("waste_material_listings", [])
-        listing = next((l for l in listings if l.get("id") == listing_id), None)
+        listing = catalog_listings().find("id", listing_id)
         
         if not listing:
             raise HTTPException(status_code=404, detail="Listing not found")
@@ -119,15 +143,8 @@ def get_listing(listing_id: int):
     raise HTTPException(status_code=404, detail="Listing not found")
 
 
-@router.post("", status_code=status.HTTP_201_CREATED)
-def create_listing(listing: ListingSubmission, current_user = Depends(get_seller_user)):
-    master_data = load_master_data()
-    listings = master_data.get("waste_material_listings", [])
-
-    new_id = max((item.get("id", 0) for item in listings), default=0) + 1
+def _build_listing_record(listing: ListingSubmission, new_id: int, current_user: Dict, date_posted: str) -> dict:
     seller_company = listing.seller_company or current_user.get("company_name") or current_user.get("username") or "Independent Seller"
-    date_posted = datetime.utcnow().date().isoformat()
-
     new_listing = {
         "id": new_id,
         "listing_type": "waste_material",
@@ -151,13 +168,152 @@ def create_listing(listing: ListingSubmission, current_user = Depends(get_seller
         new_listing["description"] = listing.description
     if listing.images:
         new_listing["images"] = listing.images
+    return new_listing
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+def create_listing(listing: ListingSubmission, current_user = Depends(get_seller_user)):
+    master_data = load_master_data()
+    listings = master_data.get("waste_material_listings", [])
+
+    new_id = max((item.get("id", 0) for item in listings), default=0) + 1
+    new_listing = _build_listing_record(listing, new_id, current_user, datetime.utcnow().date().isoformat())
 
     listings.append(new_listing)
     master_data["waste_material_listings"] = listings
     save_master_data(master_data)
+    STORAGE_INDEX["listings"].record_created(new_listing)
 
     return format_listing(new_listing)
 
 
+def _bulk_row_to_submission(row: Dict) -> Tuple[Optional[ListingSubmission], List[Dict]]:
+    """Validate one uploaded row; server-assigned columns (id, status, views, ...) are ignored"""
+    # Blank CSV cells mean "not provided"
+    row = {key: value for key, value in row.items() if key and value not in ("", None)}
+    # listings.csv carries the sale type in its listing_type column
+    if "sale_type" not in row and row.get("listing_type") in ("fixed_price", "auction"):
+        row["sale_type"] = row["listing_type"]
+    if isinstance(row.get("images"), str):
+        row["images"] = [url.strip() for url in row["images"].split("|") if url.strip()]
+
+    try:
+        submission = ListingSubmission(**row)
+    except ValidationError as exc:
+        return None, [
+            {"field": ".".join(str(part) for part in error.get("loc", ())), "message": error.get("msg")}
+            for error in exc.errors()
+        ]
+
+    errors = []
+    if submission.quantity <= 0:
+        errors.append({"field": "quantity", "message": "Quantity must be greater than zero"})
+    if submission.price_per_unit < 0:
+        errors.append({"field": "price_per_unit", "message": "Price cannot be negative"})
+    return (None, errors) if errors else (submission, [])
+
+
+def _append_listings(submissions: List[ListingSubmission], current_user: Dict) -> List[dict]:
+    """Allocate a contiguous ID range and persist every listing in a single write"""
+    master_data = load_master_data()
+    listings = master_data.get("waste_material_listings", [])
+    first_id = max((item.get("id", 0) for item in listings), default=0) + 1
+    date_posted = datetime.utcnow().date().isoformat()
+
+    new_listings = [
+        _build_listing_record(submission, first_id + offset, current_user, date_posted)
+        for offset, submission in enumerate(submissions)
+    ]
+    listings.extend(new_listings)
+    master_data["waste_material_listings"] = listings
+    save_master_data(master_data)
+    STORAGE_INDEX["listings"].records_created(new_listings)
+    return new_listings
+
+
+@router.post("/bulk", status_code=status.HTTP_201_CREATED)
+async def bulk_create_listings(
+    request: Request,
+    format: Optional[str] = Query(None, description="csv or ndjson; defaults to the Content-Type"),
+    atomic: bool = Query(False, description="Reject the whole upload if any row is invalid"),
+    current_user = Depends(get_seller_user),
+):
+    """
+    Create many listings from a streamed CSV (columns as in mock_data/listings.csv) or
+    NDJSON body. Rows are validated in chunks as they arrive and every valid row is
+    committed in one write; invalid rows are reported by row number.
+    """
+    fmt = detect_format(request.headers.get("content-type"), format)
+    if fmt is None:
+        raise HTTPException(
+            status_code=415,
+            detail="Upload text/csv or application/x-ndjson (or pass ?format=csv|ndjson)",
+        )
+
+    max_rows = settings.LISTINGS_BULK_MAX_ROWS
+    chunk_size = settings.LISTINGS_BULK_CHUNK_ROWS
+    submissions: List[ListingSubmission] = []
+    errors: List[Dict] = []
+    error_count = 0
+    total_rows = 0
+    chunk: List[Tuple[int, Dict]] = []
+
+    def record_error(row_number: int, row_errors: List[Dict]):
+        nonlocal error_count
+        error_count += 1
+        if len(errors) < settings.LISTINGS_BULK_MAX_ERRORS:
+            errors.append({"row": row_number, "errors": row_errors})
+
+    def validate_chunk():
+        for row_number, row in chunk:
+            submission, row_errors = _bulk_row_to_submission(row)
+            if submission is None:
+                record_error(row_number, row_errors)
+            else:
+                submissions.append(submission)
+        chunk.clear()
+
+    try:
+        async for row_number, row, parse_error in iter_rows(fmt, request.stream()):
+            total_rows += 1
+            if total_rows > max_rows:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Bulk uploads are limited to {max_rows} rows",
+                )
+            if parse_error:
+                record_error(row_number, [{"field": None, "message": parse_error}])
+                continue
+            chunk.append((row_number, row))
+            if len(chunk) >= chunk_size:
+                validate_chunk()
+                # Let other requests run between chunks of a large upload
+                await asyncio.sleep(0)
+    except RecordTooLarge as exc:
+        raise HTTPException(status_code=413, detail=str(exc))
+    validate_chunk()
+    # Parse errors are recorded as rows arrive, validation errors per chunk
+    errors.sort(key=lambda entry: entry["row"])
+
+    report = {
+        "total_rows": total_rows,
+        "created": 0,
+        "failed": error_count,
+        "first_id": None,
+        "last_id": None,
+        "errors": errors,
+        "errors_truncated": error_count > len(errors),
+    }
+
+    if not submissions or (atomic and error_count):
+        raise HTTPException(status_code=422, detail=report)
+
+    created = await asyncio.to_thread(_append_listings, submissions, current_user)
+    report["created"] = len(created)
+    report["first_id"] = created[0]["id"]
+    report["last_id"] = created[-1]["id"]
+    return report
+
+
 # PUT and DELETE endpoints removed - using JSON storage only
 # These endpoints would need to be reimplemented using mock_storage functions
@@ -2,11 +2,25 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import List, Optional
 from app.utils.auth import get_current_active_user
 from app.config import settings
-import json
+from app.utils.shared_catalog import CatalogMap, get_shared_catalog
+from app.utils.single_flight import SingleFlight, normalize_key
 from pathlib import Path
 
 router = APIRouter(prefix="/api/machinery", tags=["Machinery"])
 
+MASTER_DATA_PATH = Path(__file__).resolve().parents[2] / "mock_data" / "waste_streams_dashboard_data.json"
+
+# Identical concurrent requests (dashboard polling, repeated filters) share one computation
+_flight = SingleFlight()
+
+# The mmap-shared catalog, identical across workers
+_catalog = get_shared_catalog(MASTER_DATA_PATH)
+
+
+def load_catalog_map() -> CatalogMap:
+    """Current catalog mapping, rebuilt (once, under a lock) after the master file changed"""
+    return _catalog.current()
+
 
 def get_mock_or_current_user():
     # In mock mode, return a minimal user object without validating a token
@@ -16,7 +30,7 @@ def get_mock_or_current_user():
 
 
 @router.get("")
-def get_machinery(
+async def get_machinery(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     search: Optional[str] = None,
@@ -29,13 +43,33 @@ def get_machinery(
     seller_type: Optional[str] = None
 ):
     """Get all machinery listings including regular and shutdown machinery"""
-    mock_path = Path(__file__).resolve().parents[2] / "mock_data" / "waste_streams_dashboard_data.json"
-    with open(mock_path, "r") as f:
-        master_data = json.load(f)
+    key = normalize_key(
+        "list", skip, limit, search, machine_type, category, location,
+        min_price, max_price, condition, seller_type,
+    )
+    return await _flight.do(
+        key, _list_machinery, skip, limit, search, machine_type, category, location,
+        min_price, max_price, condition, seller_type,
+    )
+
+
+def _list_machinery(
+    skip: int,
+    limit: int,
+    search: Optional[str],
+    machine_type: Optional[str],
+    category: Optional[str],
+    location: Optional[str],
+    min_price: Optional[float],
+    max_price: Optional[float],
+    condition: Optional[str],
+    seller_type: Optional[str]
+):
+    catalog = load_catalog_map()
     
     # Get both regular and shutdown machinery
-    regular_machinery = master_data.get("machinery_listings", [])
-    shutdown_machinery = master_data.get("all_shutdown_machinery", [])
+    regular_machinery = list(catalog.table("machinery_listings"))
+    shutdown_machinery = list(catalog.table("all_shutdown_machinery"))
     all_machinery = regular_machinery + shutdown_machinery
     
     # Apply filters
@@ -71,8 +105,7 @@ def get_machinery(
         all_machinery = [m for m in all_machinery if seller_type_lower in m.get("seller_type", "").lower()]
     
     # Apply pagination
-    all_machinery = all_machinery[skip:skip + limit]
-    return all_machinery
+    return [machine.to_dict() for machine in all_machinery[skip:skip + limit]]
 
 
 @router.get("/shutdown")
@@ -81,66 +114,54 @@ def get_shutdown_machinery(
     limit: int = Query(100, ge=1, le=100)
 ):
     """Get only shutdown/liquidation machinery"""
-    mock_path = Path(__file__).resolve().parents[2] / "mock_data" / "waste_streams_dashboard_data.json"
-    with open(mock_path, "r") as f:
-        master_data = json.load(f)
+    catalog = load_catalog_map()
     
-    shutdown_machinery = master_data.get("all_shutdown_machinery", [])
-    return shutdown_machinery[skip:skip + limit]
+    shutdown_machinery = catalog.table("all_shutdown_machinery")
+    return [machine.to_dict() for machine in shutdown_machinery[skip:skip + limit]]
 
 
 @router.get("/packages")
 def get_bundled_packages():
     """Get bundled packages (complete setups with discounts)"""
-    mock_path = Path(__file__).resolve().parents[2] / "mock_data" / "waste_streams_dashboard_data.json"
-    with open(mock_path, "r") as f:
-        master_data = json.load(f)
+    catalog = load_catalog_map()
     
-    packages = master_data.get("bundled_packages", [])
+    packages = catalog.document("bundled_packages", [])
     return packages
 
 
 @router.get("/shutdown-companies")
 def get_shutdown_companies():
     """Get companies that are liquidating"""
-    mock_path = Path(__file__).resolve().parents[2] / "mock_data" / "waste_streams_dashboard_data.json"
-    with open(mock_path, "r") as f:
-        master_data = json.load(f)
+    catalog = load_catalog_map()
     
-    companies = master_data.get("company_shutdowns", [])
+    companies = catalog.document("company_shutdowns", [])
     return companies
 
 
 @router.get("/{machinery_id}")
 def get_machinery_detail(machinery_id: str):
     """Get details of a specific machinery"""
-    mock_path = Path(__file__).resolve().parents[2] / "mock_data" / "waste_streams_dashboard_data.json"
-    with open(mock_path, "r") as f:
-        master_data = json.load(f)
+    catalog = load_catalog_map()
     
     # Check in regular machinery
-    regular_machinery = master_data.get("machinery_listings", [])
-    machinery = next((m for m in regular_machinery if m.get("id") == machinery_id), None)
+    machinery = catalog.table("machinery_listings").find("id", machinery_id)
     
     # If not found, check in shutdown machinery
     if not machinery:
-        shutdown_machinery = master_data.get("all_shutdown_machinery", [])
-        machinery = next((m for m in shutdown_machinery if m.get("id") == machinery_id), None)
+        machinery = catalog.table("all_shutdown_machinery").find("id", machinery_id)
     
     if not machinery:
         raise HTTPException(status_code=404, detail="Machinery not found")
     
-    return machinery
+    return machinery.to_dict()
 
 
 @router.get("/associations/{material_name}")
 def get_compatible_machinery(material_name: str):
     """Get machinery that can process a specific material"""
-    mock_path = Path(__file__).resolve().parents[2] / "mock_data" / "waste_streams_dashboard_data.json"
-    with open(mock_path, "r") as f:
-        master_data = json.load(f)
+    catalog = load_catalog_map()
     
-    associations = master_data.get("material_machinery_associations", [])
+    associations = catalog.document("material_machinery_associations", [])
     
     material_assoc = next(
         (assoc for assoc in associations if assoc.get("material_name", "").lower() == material_name.lower()),
@@ -154,17 +175,19 @@ def get_compatible_machinery(material_name: str):
 
 
 @router.get("/stats/summary")
-def get_machinery_stats():
+async def get_machinery_stats():
     """Get summary statistics of machinery listings"""
-    mock_path = Path(__file__).resolve().parents[2] / "mock_data" / "waste_streams_dashboard_data.json"
-    with open(mock_path, "r") as f:
-        master_data = json.load(f)
+    return await _flight.do("stats-summary", _machinery_stats)
+
+
+def _machinery_stats():
+    catalog = load_catalog_map()
     
-    summary = master_data.get("summary_metrics", {})
-    shutdown_summary = master_data.get("shutdown_companies_summary", {})
+    summary = catalog.document("summary_metrics", {})
+    shutdown_summary = catalog.document("shutdown_companies_summary", {})
     
-    regular_machinery = master_data.get("machinery_listings", [])
-    shutdown_machinery = master_data.get("all_shutdown_machinery", [])
+    regular_machinery = catalog.table("machinery_listings")
+    shutdown_machinery = catalog.table("all_shutdown_machinery")
     
     return {
         "total_regular_machinery": len(regular_machinery),
@@ -3,11 +3,12 @@ from pathlib import Path
 import csv
 from typing import Dict, List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse
 
 from app.config import settings
-from app.models.order import OrderStatus
 from app.schemas.order import OrderResponse
+from app.services.order_repository import OrderRepository
 from app.utils.auth import get_current_active_user
 from app.utils.mock_storage import load_orders as storage_load_orders, save_orders as storage_save_orders
 
@@ -58,60 +59,22 @@ def _bootstrap_orders_if_needed() -> List[Dict]:
     return orders
 
 
-def _load_orders() -> List[Dict]:
-    orders = _bootstrap_orders_if_needed()
-    # Ensure status values align with enum when possible
-    for order in orders:
-        status_value = (order.get("status") or "").lower().strip()
-        if status_value not in {status.value for status in OrderStatus}:
-            order["status"] = OrderStatus.PENDING.value
-    return orders
-
-
-def _coerce_order(payload: Dict) -> OrderResponse:
-    try:
-        status = OrderStatus(payload.get("status", "pending"))
-    except ValueError:
-        status = OrderStatus.PENDING
-
-    created_at_raw = payload.get("created_at")
-    updated_at_raw = payload.get("updated_at")
-
-    created_at = (
-        datetime.fromisoformat(created_at_raw)
-        if isinstance(created_at_raw, str)
-        else created_at_raw or datetime.utcnow()
-    )
-    updated_at = (
-        datetime.fromisoformat(updated_at_raw)
-        if isinstance(updated_at_raw, str) and updated_at_raw
-        else None
-    )
-
-    return OrderResponse(
-        id=int(payload.get("id", 0)),
-        listing_id=int(payload.get("listing_id", 0)),
-        quantity=float(payload.get("quantity", 0)),
-        total_price=float(payload.get("total_price", 0)),
-        buyer_notes=payload.get("buyer_notes"),
-        status=status,
-        buyer_id=int(payload.get("buyer_id", 0)),
-        created_at=created_at,
-        updated_at=updated_at,
-    )
+# Indexed view over orders.json; reloaded only when the file changes
+ORDER_REPOSITORY = OrderRepository(_bootstrap_orders_if_needed)
 
 
-def _filter_orders_for_company(
-    orders: List[Dict],
-    company_name: str,
-    perspective: str,
-) -> List[Dict]:
+def _orders_for_company(company_name: str, perspective: str) -> List[Dict]:
     if not company_name:
-        return orders
+        return ORDER_REPOSITORY.all()
 
     key = "buyer_company" if perspective == "buyer" else "seller_company"
-    filtered = [order for order in orders if order.get(key, "").lower() == company_name.lower()]
-    return filtered or orders
+    # Demo accounts without orders of their own see the whole book
+    return ORDER_REPOSITORY.find(key, company_name) or ORDER_REPOSITORY.all()
+
+
+def _paginated(orders: List[Dict], skip: int, limit: int) -> JSONResponse:
+    page = ORDER_REPOSITORY.responses(orders[skip:skip + limit])
+    return JSONResponse(content=page, headers={"X-Total-Count": str(len(orders))})
 
 
 def _get_mock_user(role: str) -> Dict:
@@ -157,30 +120,35 @@ def get_view_user():
 
 
 @router.get("", response_model=List[OrderResponse])
-def get_orders(current_user: Dict = Depends(get_buyer_user)):
-    orders = _load_orders()
-    orders = _filter_orders_for_company(orders, current_user.get("company_name", ""), "buyer")
-    return [_coerce_order(order) for order in orders]
+def get_orders(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: Dict = Depends(get_buyer_user),
+):
+    orders = _orders_for_company(current_user.get("company_name", ""), "buyer")
+    return _paginated(orders, skip, limit)
 
 
 @router.get("/my-orders", response_model=List[OrderResponse])
-def get_my_orders(current_user: Dict = Depends(get_seller_user)):
-    orders = _load_orders()
-    orders = _filter_orders_for_company(orders, current_user.get("company_name", ""), "seller")
-    return [_coerce_order(order) for order in orders]
+def get_my_orders(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: Dict = Depends(get_seller_user),
+):
+    orders = _orders_for_company(current_user.get("company_name", ""), "seller")
+    return _paginated(orders, skip, limit)
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
 def get_order(order_id: int, current_user: Dict = Depends(get_view_user)):
-    orders = _load_orders()
-    match = next((order for order in orders if int(order.get("id", 0)) == order_id), None)
+    match = ORDER_REPOSITORY.get(order_id)
     if not match:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
 
     if current_user.get("role") not in {"admin", "seller", "buyer"}:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view this order")
 
-    return _coerce_order(match)
+    return JSONResponse(content=ORDER_REPOSITORY.response(match))
 
 
 @router.post("", status_code=status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -0,0 +1,201 @@
+"""
+Catalog search index for chatbot context retrieval
+- In-memory inverted index over waste listings and machinery from the master JSON
+- BM25 ranking with per-field weights; listings in the requested location rank first
+- Rebuilt lazily when the master file changes on disk (mtime/size), so any writer
+  (listings router, storage helpers, chatbot listing flow) is picked up
+- Indexed records are kept as compact ListingRecord / MachineryRecord objects
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+import heapq
+import logging
+import math
+import re
+import threading
+
+from app.models.records import ListingRecord, MachineryRecord, Record
+from app.utils.catalog_snapshot import load_catalog
+from app.utils.file_signature import FileSignature, file_signature
+
+logger = logging.getLogger(__name__)
+
+MASTER_DATA_PATH = Path(__file__).resolve().parents[2] / "mock_data" / "waste_streams_dashboard_data.json"
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Field weights: a match in the title or material counts more than one in the description
+LISTING_FIELDS = {
+    "title": 2.0,
+    "material_name": 2.0,
+    "category": 1.0,
+    "description": 1.0,
+}
+MACHINERY_FIELDS = {
+    "title": 2.0,
+    "machine_type": 2.0,
+    "brand": 1.5,
+    "model": 1.0,
+    "category": 1.0,
+    "seller_type": 1.0,
+    "compatible_materials": 1.0,
+    "description": 1.0,
+}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased alphanumeric tokens with a light plural strip (bottles -> bottle)"""
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _field_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return " ".join(str(item) for item in value)
+    return str(value)
+
+
+@dataclass
+class _Collection:
+    """Inverted index over one record type"""
+
+    records: List[Record] = field(default_factory=list)
+    locations: List[str] = field(default_factory=list)
+    postings: Dict[str, Dict[int, float]] = field(default_factory=dict)
+    lengths: List[float] = field(default_factory=list)
+    average_length: float = 0.0
+
+    @classmethod
+    def build(cls, records: Iterable[Dict], fields: Dict[str, float], record_type: Type[Record]) -> "_Collection":
+        collection = cls()
+        postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        for doc_id, record in enumerate(records):
+            length = 0.0
+            for name, weight in fields.items():
+                for token in tokenize(_field_text(record.get(name))):
+                    postings[token][doc_id] = postings[token].get(doc_id, 0.0) + weight
+                    length += weight
+            collection.records.append(record_type(record))
+            collection.locations.append(_field_text(record.get("location")).lower())
+            collection.lengths.append(length)
+        collection.postings = dict(postings)
+        if collection.lengths:
+            collection.average_length = sum(collection.lengths) / len(collection.lengths) or 1.0
+        return collection
+
+    def _idf(self, token: str) -> float:
+        matches = len(self.postings.get(token, ()))
+        total = len(self.records)
+        return math.log(1 + (total - matches + 0.5) / (matches + 0.5))
+
+    def search(self, keywords: List[str], location: Optional[str], limit: int) -> List[Record]:
+        if keywords:
+            scores: Dict[int, float] = defaultdict(float)
+            for keyword in keywords:
+                tokens = list(dict.fromkeys(tokenize(keyword)))
+                if not tokens:
+                    continue
+                token_postings = [self.postings.get(token) for token in tokens]
+                if not all(token_postings):
+                    continue
+                # A multi-word keyword ("fly ash") only matches records containing every word
+                candidates = set(token_postings[0])
+                for doc_postings in token_postings[1:]:
+                    candidates.intersection_update(doc_postings)
+                for token, doc_postings in zip(tokens, token_postings):
+                    idf = self._idf(token)
+                    for doc_id in candidates:
+                        tf = doc_postings[doc_id]
+                        norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[doc_id] / self.average_length)
+                        scores[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+            ranked: List[Tuple[int, float]] = list(scores.items())
+        else:
+            # No keywords: every record, in catalog order
+            ranked = [(doc_id, 0.0) for doc_id in range(len(self.records))]
+
+        location_lower = (location or "").lower()
+
+        def sort_key(item: Tuple[int, float]):
+            doc_id, score = item
+            local = bool(location_lower) and location_lower in self.locations[doc_id]
+            return (not local, -score, doc_id)
+
+        return [self.records[doc_id] for doc_id, _ in heapq.nsmallest(limit, ranked, key=sort_key)]
+
+
+def _unique_machinery(master_data: Dict) -> List[Dict]:
+    # Shutdown listings share IDs with the base machinery list; the later entry wins
+    machinery_map: Dict[str, Dict] = {}
+    for machine in master_data.get("machinery_listings", []) + master_data.get("all_shutdown_machinery", []):
+        machinery_map[str(machine.get("id"))] = machine
+    return list(machinery_map.values())
+
+
+class CatalogIndex:
+    """Listings and machinery indexes kept in sync with the master data file"""
+
+    def __init__(self, path: Path = MASTER_DATA_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._built = False
+        self._signature: Optional[FileSignature] = None
+        self._listings = _Collection()
+        self._machinery = _Collection()
+        self.builds = 0
+
+    def invalidate(self):
+        """Force a rebuild on the next search"""
+        with self._lock:
+            self._built = False
+
+    def _ensure_current(self):
+        signature = file_signature(self.path)
+        if self._built and signature == self._signature:
+            return
+        with self._lock:
+            if self._built and signature == self._signature:
+                return
+            master_data = {}
+            if signature is not None:
+                master_data = load_catalog(self.path)
+            self._listings = _Collection.build(master_data.get("waste_material_listings", []), LISTING_FIELDS, ListingRecord)
+            self._machinery = _Collection.build(_unique_machinery(master_data), MACHINERY_FIELDS, MachineryRecord)
+            self._signature = signature
+            self._built = True
+            self.builds += 1
+            logger.info(
+                f"🔎 Catalog index built: {len(self._listings.records)} listings, "
+                f"{len(self._machinery.records)} machines"
+            )
+
+    def search_listings(self, keywords: List[str], location: Optional[str] = None, limit: int = 5) -> List[Record]:
+        self._ensure_current()
+        return self._listings.search(keywords, location, limit)
+
+    def search_machinery(self, keywords: List[str], location: Optional[str] = None, limit: int = 5) -> List[Record]:
+        self._ensure_current()
+        return self._machinery.search(keywords, location, limit)
+
+
+_catalog_index: Optional[CatalogIndex] = None
+
+
+def get_catalog_index() -> CatalogIndex:
+    """Get or create the shared catalog index"""
+    global _catalog_index
+    if _catalog_index is None:
+        _catalog_index = CatalogIndex()
+    return _catalog_index
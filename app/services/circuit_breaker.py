@@ -0,0 +1,187 @@
+"""
+Circuit breaker with adaptive timeouts for upstream AI backends
+- Tracks the outcome of the last N calls; opens when the failure rate crosses a threshold
+- While open, calls are rejected immediately; after a cool-down a few probe calls are
+  let through (half-open) and their outcome closes or re-opens the circuit
+- Request timeouts follow the observed latency percentile instead of a fixed 30s
+"""
+
+from collections import deque
+from typing import Deque, Dict, Optional
+import logging
+import math
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is attempted while the backend's circuit is open"""
+
+    def __init__(self, name: str):
+        super().__init__(f"Circuit for {name} is open")
+        self.name = name
+
+
+def percentile(samples, fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of ``samples`` (None when empty)"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(math.ceil(fraction * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def _rounded(value: Optional[float]) -> Optional[float]:
+    return round(value, 4) if value is not None else None
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker for one backend"""
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 20,
+        minimum_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        timeout_percentile: float = 0.99,
+        timeout_multiplier: float = 2.0,
+        min_timeout: float = 5.0,
+        max_timeout: float = 30.0,
+        latency_window: int = 100,
+        min_latency_samples: int = 10,
+    ):
+        self.name = name
+        self.window_size = window_size
+        self.minimum_calls = minimum_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.timeout_percentile = timeout_percentile
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_latency_samples = min_latency_samples
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+
+        # Counters for metrics
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes_in_flight = 0
+            logger.info(f"🟡 Circuit for {self.name} half-open - probing backend")
+        return self._state
+
+    def available(self) -> bool:
+        """Whether a call would currently be let through (does not reserve a probe slot)"""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == OPEN:
+                return False
+            if state == HALF_OPEN:
+                return self._probes_in_flight < self.half_open_max_calls
+            return True
+
+    def acquire(self) -> bool:
+        """Reserve permission for one call; every True must be followed by record_* or release"""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes_in_flight < self.half_open_max_calls:
+                self._probes_in_flight += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def release(self):
+        """Give back a reserved call that ended without a verdict (e.g. cancelled)"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes_in_flight:
+                self._probes_in_flight -= 1
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self.successes += 1
+            self._latencies.append(latency)
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._outcomes.clear()
+                self._probes_in_flight = 0
+                logger.info(f"🟢 Circuit for {self.name} closed - backend recovered")
+            self._outcomes.append(True)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._state == HALF_OPEN:
+                self._trip(time.monotonic())
+                return
+            self._outcomes.append(False)
+            if len(self._outcomes) >= self.minimum_calls and self._failure_rate() >= self.failure_rate_threshold:
+                self._trip(time.monotonic())
+
+    def _trip(self, now: float):
+        if self._state != OPEN:
+            self.times_opened += 1
+            logger.warning(f"🔴 Circuit for {self.name} opened - failing fast for {self.open_seconds:.0f}s")
+        self._state = OPEN
+        self._opened_at = now
+        self._probes_in_flight = 0
+        self._outcomes.clear()
+
+    def _failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def timeout(self) -> float:
+        """Request timeout derived from recent successful latencies"""
+        with self._lock:
+            if len(self._latencies) < self.min_latency_samples:
+                return self.max_timeout
+            observed = percentile(self._latencies, self.timeout_percentile)
+        return min(max(observed * self.timeout_multiplier, self.min_timeout), self.max_timeout)
+
+    def snapshot(self) -> Dict:
+        """Metrics for health endpoints"""
+        timeout = self.timeout()
+        with self._lock:
+            latencies = list(self._latencies)
+            return {
+                "state": self._current_state(time.monotonic()),
+                "failure_rate": round(self._failure_rate(), 3),
+                "window_calls": len(self._outcomes),
+                "successes": self.successes,
+                "failures": self.failures,
+                "rejected": self.rejected,
+                "times_opened": self.times_opened,
+                "latency_p50": _rounded(percentile(latencies, 0.5)),
+                "latency_p95": _rounded(percentile(latencies, 0.95)),
+                "latency_p99": _rounded(percentile(latencies, 0.99)),
+                "timeout_seconds": round(timeout, 3),
+            }
@@ -0,0 +1,97 @@
+"""
+IAM token cache
+- Keeps one IBM Cloud access token per API key until shortly before it expires
+- Refreshes in the background once a token enters its refresh window
+- Single-flight: concurrent callers share one in-flight token request per key
+"""
+
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+TokenFetcher = Callable[[], Awaitable[Optional[Dict]]]
+
+# Tokens are never handed out this close to their expiry
+EXPIRY_SKEW_SECONDS = 30
+# Used when the IAM response does not say how long the token lives
+DEFAULT_EXPIRES_IN = 600
+
+
+@dataclass
+class _CachedToken:
+    access_token: str
+    refresh_at: float
+    usable_until: float
+
+
+class IAMTokenCache:
+    """Per-key access token cache honouring the IAM ``expires_in`` value"""
+
+    def __init__(self, refresh_margin: float = 300):
+        self.refresh_margin = refresh_margin
+        self._tokens: Dict[str, _CachedToken] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def get(self, key: str, fetch: TokenFetcher) -> Optional[str]:
+        """Return a valid token for ``key``, calling ``fetch`` only when none is cached"""
+        now = time.monotonic()
+        cached = self._tokens.get(key)
+        if cached and now < cached.usable_until:
+            if now >= cached.refresh_at:
+                # Still valid: serve it and renew behind the scenes
+                self._refresh(key, fetch)
+            return cached.access_token
+
+        # Shield the shared task so one cancelled caller does not abort it for the others
+        return await asyncio.shield(self._refresh(key, fetch))
+
+    def invalidate(self, key: str):
+        """Drop a token the upstream rejected so the next call fetches a new one"""
+        self._tokens.pop(key, None)
+
+    def clear(self):
+        self._tokens.clear()
+
+    def _refresh(self, key: str, fetch: TokenFetcher) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            return task
+
+        task = asyncio.ensure_future(self._fetch_and_store(key, fetch))
+        self._inflight[key] = task
+        task.add_done_callback(lambda finished: self._release(key, finished))
+        return task
+
+    def _release(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"IAM token refresh failed: {task.exception()}")
+
+    async def _fetch_and_store(self, key: str, fetch: TokenFetcher) -> Optional[str]:
+        payload = await fetch()
+        if not payload or not payload.get("access_token"):
+            cached = self._tokens.get(key)
+            # Keep serving the previous token while it is still usable
+            if cached and time.monotonic() < cached.usable_until:
+                return cached.access_token
+            return None
+
+        try:
+            expires_in = float(payload.get("expires_in") or DEFAULT_EXPIRES_IN)
+        except (TypeError, ValueError):
+            expires_in = DEFAULT_EXPIRES_IN
+
+        now = time.monotonic()
+        usable_for = max(expires_in - EXPIRY_SKEW_SECONDS, 0)
+        refresh_after = max(expires_in - self.refresh_margin, expires_in / 2)
+        self._tokens[key] = _CachedToken(
+            access_token=payload["access_token"],
+            refresh_at=now + min(refresh_after, usable_for),
+            usable_until=now + usable_for,
+        )
+        return payload["access_token"]
@@ -0,0 +1,334 @@
+"""
+Chatbot intent classifier
+- Every routing vocabulary (questions, listing creation, materials, machinery,
+  locations, business and manufacturing terms, canned-reply topics) lives here
+- All phrases are compiled once at import into a single trie-shaped regex
+- One pass over a message tags every phrase it contains; routing code then asks
+  the result which groups matched instead of re-scanning the text per list
+
+Matching keeps the substring semantics of ``phrase in message.lower()`` that the
+routers relied on, so "hi" still matches inside "this".
+"""
+
+from functools import cached_property, lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+import re
+
+
+# Business idea mapping with related materials
+BUSINESS_TYPES = {
+    "plastic_recycling": {
+        "keywords": ["plastic", "polymer", "recycling", "hdpe", "ldpe", "pp", "pet", "pvc", "plastic recycling", "recycle plastic"],
+        "materials": ["HDPE Scrap", "PET Bottles", "PP Scrap", "LDPE Film"],
+        "category": "Plastic Waste",
+        "use": "Recycle into pellets, sheets, or new products like containers, bags, pipes"
+    },
+    "paper_products": {
+        "keywords": ["paper", "cardboard", "packaging", "printing"],
+        "materials": ["Cardboard Bales", "Mixed Paper", "Newspaper"],
+        "category": "Paper & Cardboard",
+        "use": "Make packaging boxes, tissue paper, or recycled paper products"
+    },
+    "construction_materials": {
+        "keywords": ["construction", "concrete", "cement", "building"],
+        "materials": ["Fly Ash", "Bottom Ash", "Concrete Rubble", "Brick Waste"],
+        "category": "Industrial Ash",
+        "use": "Use as additives in concrete, or process into building blocks"
+    },
+    "biofuel_energy": {
+        "keywords": ["biofuel", "biomass", "energy", "fuel"],
+        "materials": ["Bagasse", "Rice Husk", "Straw/Hay", "Coconut Shell"],
+        "category": "Agricultural/Biomass",
+        "use": "Convert to biofuel, briquettes, or biomass pellets for energy generation"
+    },
+    "textile_manufacturing": {
+        "keywords": ["textile", "fabric", "clothing", "garment"],
+        "materials": ["Cotton Scrap", "Textile Waste"],
+        "category": "Textile Waste",
+        "use": "Recycle into new fabrics, insulation material, or stuffing"
+    },
+    "metal_refining": {
+        "keywords": ["metal", "steel", "aluminum", "copper", "smelting"],
+        "materials": ["Steel Scrap", "Aluminum Scrap", "Copper Wire", "Brass Scrap"],
+        "category": "Metal Scrap",
+        "use": "Smelt and refine into pure metals for manufacturing"
+    },
+    "glass_production": {
+        "keywords": ["glass", "glassware", "bottles"],
+        "materials": ["Clear Glass", "Mixed Glass"],
+        "category": "Glass",
+        "use": "Melt and remold into new glass products or use as aggregate"
+    },
+    "rubber_production": {
+        "keywords": ["rubber", "tire", "mat"],
+        "materials": ["Rubber Crumb", "Tire Waste"],
+        "category": "Rubber & Tires",
+        "use": "Process into rubber mats, flooring, or raw rubber material"
+    }
+}
+
+# Manufacturing keywords mapping
+MANUFACTURING_TERMS = {
+    "plastic": ["plastic", "polymer", "hdpe", "ldpe", "pp", "pet", "pvc", "plastic manufacturing", "plastic products"],
+    "metal": ["metal", "steel", "aluminum", "copper", "brass", "iron", "metalworking", "foundry", "metal products"],
+    "construction": ["construction", "concrete", "cement", "building", "fly ash", "ash", "construction material"],
+    "paper": ["paper", "cardboard", "packaging", "paper products", "paper manufacturing"],
+    "textile": ["textile", "fabric", "clothing", "garment", "textile manufacturing"],
+    "biofuel": ["biofuel", "biomass", "bagasse", "agricultural", "crop", "organic", "energy"],
+    "glass": ["glass", "glassware", "glass manufacturing"],
+    "rubber": ["rubber", "tire", "rubber products"],
+}
+
+# Machinery query keywords for detection
+MACHINERY_QUERY_KEYWORDS = [
+    "machinery", "machine", "equipment", "industrial equipment",
+    "shredder", "dual-shaft", "extruder", "processing line", "pulp line",
+    "carbonization", "furnace", "baler", "spinning", "loom",
+    "compressor", "chiller", "boiler", "bottling", "injection", "molding",
+    "cnc", "laser", "press brake", "water treatment", "ro plant",
+    "shutdown machinery", "liquidation machinery"
+]
+
+GENERIC_MACHINERY_TERMS = {
+    "machinery", "machine", "equipment", "industrial equipment",
+    "shutdown machinery", "liquidation machinery"
+}
+
+KNOWN_LOCATIONS = [
+    "mumbai", "delhi", "bangalore", "chennai", "kolkata", "hyderabad", "pune", "ahmedabad",
+    "coimbatore", "nagpur", "surat", "jaipur", "lucknow", "kanpur", "kochi"
+]
+
+MATERIAL_KEYWORDS = [
+    "plastic", "hdpe", "ldpe", "pp", "pet", "pvc",
+    "metal", "steel", "aluminum", "copper", "brass", "iron",
+    "paper", "cardboard",
+    "glass", "glassware",
+    "rubber", "tire",
+    "textile", "fabric", "cotton",
+    "ash", "fly ash", "bottom ash",
+    "bagasse", "rice husk", "coconut shell", "straw",
+    "construction", "concrete", "rubble", "brick",
+    "organic", "food waste", "vegetable waste"
+]
+
+
+# Groups matched against the lower-cased message
+PHRASE_GROUPS: Dict[str, List[str]] = {
+    # Chat endpoint routing
+    "question": [
+        "what", "how", "where", "when", "why", "can i", "should i",
+        "what can i do", "what can i", "how can i", "how do", "how is", "how are",
+        "what is", "what are", "how does", "how did",
+        "tell me", "explain", "describe", "help me", "i want to know",
+        "do we have", "do you have", "are there", "can you", "can we",
+        "do they have", "is there", "are there any", "show me"
+    ],
+    "listing_creation": [
+        "i have", "i've got", "we have", "we've got",
+        "available for sale", "for sale", "priced at", "price per",
+        "tons available", "kg available", "material available",
+        "fixed sale", "fixed price", "selling"
+    ],
+    "querying_existing": [
+        "existing", "current", "do we have", "are there",
+        "show me", "find", "search", "browse", "get listings", "see listings"
+    ],
+    # Orchestrate vs watsonx routing (WatsonHybridService.is_data_query)
+    "data_question": [
+        "what", "how", "where", "when", "why", "can i", "should i",
+        "what can i do", "what can i", "how can i", "tell me", "explain",
+        "describe", "help me", "i want to know"
+    ],
+    "data_listing_creation": [
+        "available for sale", "for sale", "ready for sale", "up for sale",
+        "priced at", "price per", "selling", "i have", "i've got",
+        "we have", "we've got", "material available", "tons available",
+        "kg available", "fixed sale", "fixed price", "i want to sell",
+        "i want to list", "create a listing", "list my"
+    ],
+    "data_keywords": [
+        "waste", "material", "listing", "plastic", "metal", "paper", "biomass",
+        "machinery", "equipment", "price", "quantity", "buy", "sell",
+        "seller", "location", "category", "auction", "bid",
+        "bagasse", "rice husk", "coconut shell", "straw", "hay", "fly ash",
+        "bottom ash", "coal ash", "hdpe", "hdpe scrap", "pet", "pet bottles",
+        "pp scrap", "ldpe", "ldpe film", "mixed plastic", "steel", "steel scrap",
+        "aluminum", "aluminum scrap", "copper wire", "brass scrap", "cast iron",
+        "cardboard", "cardboard bales", "mixed paper", "newspaper", "concrete rubble",
+        "brick waste", "scrap wood", "gypsum waste", "clear glass", "mixed glass",
+        "broken glass", "cotton scrap", "fabric remnants", "industrial rags",
+        "tire scrap", "rubber crumb", "food processing waste", "vegetable waste",
+        "dual-shaft", "shredder", "pulp processing", "twin screw", "extruder",
+        "carbonization furnace", "hydraulic baler", "ring spinning", "rotary screw",
+        "projectile weaving", "injection molding", "blow molding",
+        "water cooled chiller", "fourdrinier", "paper machine", "coal fired boiler",
+        "bottling line", "reverse osmosis", "ro plant", "fiber laser", "press brake",
+        "briquetting", "pelletizing", "gasification", "de-inking", "granulator",
+        "washing line", "fiber spinning", "weaving loom", "alligator shear",
+        "baling press"
+    ],
+    # Entities
+    "materials": MATERIAL_KEYWORDS,
+    "machinery": MACHINERY_QUERY_KEYWORDS,
+    "locations": KNOWN_LOCATIONS,
+    # Rule-based reply topics (get_chatbot_response)
+    "business_idea": [
+        "business idea", "start business", "business venture", "entrepreneurship",
+        "want to start", "planning to start", "new business", "looking to start"
+    ],
+    "manufacturing": [
+        "manufacturing", "manufacturing unit", "factory", "production",
+        "raw material", "raw materials", "need material", "need materials",
+        "looking for material", "looking for materials", "sourcing", "procure"
+    ],
+    "reply:greeting": ["hello", "hi", "hey", "greetings"],
+    "reply:listing": ["list", "sell", "create listing", "post"],
+    "reply:buying": ["buy", "purchase", "order", "how to buy"],
+    "reply:auction": ["auction", "bid", "bidding", "how to bid"],
+    "reply:materials": ["material", "materials", "what materials", "available"],
+    "reply:search": ["search", "filter", "find", "browse"],
+    "reply:pricing": ["price", "cost", "expensive", "cheap", "pricing"],
+    "reply:contact": ["contact", "seller", "message", "communicate"],
+    "reply:account": ["account", "profile", "dashboard", "my account"],
+    "reply:help": ["help", "support", "question", "problem"],
+    "reply:thanks": ["thank", "thanks", "appreciate"],
+    "reply:benefits": ["benefits", "why", "advantage", "why use"],
+}
+PHRASE_GROUPS.update({f"business:{name}": details["keywords"] for name, details in BUSINESS_TYPES.items()})
+PHRASE_GROUPS.update({f"manufacturing:{name}": terms for name, terms in MANUFACTURING_TERMS.items()})
+
+# Groups matched against the message with punctuation stripped (listing flow triggers)
+NORMALIZED_PHRASE_GROUPS: Dict[str, List[str]] = {
+    "flow_existing_query": [
+        "do we have", "do you have", "are there", "is there", "can we see",
+        "show me", "show us", "find", "search", "browse", "get listings",
+        "see listings", "available listings", "existing listings",
+        "current listings", "any listings", "what listings", "listings available"
+    ],
+    "flow_create": [
+        "list an item", "list my item", "list a new item", "list this item",
+        "list material", "list my material", "list items", "list my items",
+        "list items for sale", "create a listing", "create new listing",
+        "new listing", "publish listing", "post a listing", "sell this material",
+        "sell my material", "sell an item", "add new listing", "add a listing",
+        "add listing", "list for sale", "list your item",
+    ],
+    "flow_sale": [
+        "available for sale", "for sale", "ready for sale", "up for auction",
+        "priced at", "fixed sale", "fixed price",
+    ],
+    "flow_supply": ["have", "selling", "providing", "offering", "available"],
+    "flow_units": ["ton", "tons", "kg", "kilogram", "metric", "bale", "mt", "quantity"],
+    "flow_list": ["list"],
+    "flow_actions": ["create", "add", "post", "publish", "sell"],
+    "flow_objects": ["listing", "item", "items"],
+    "flow_question": ["what", "how", "when", "where", "why", "can", "should"],
+    "flow_create_verb": ["create"],
+    "flow_publish_verb": ["publish"],
+    "flow_listing_noun": ["listing"],
+}
+
+_NORMALIZE_PATTERN = re.compile(r"[^a-z0-9\s]")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def _trie_pattern(phrases: Iterable[str]) -> str:
+    """
+    Regex source for a character trie of ``phrases``. Optional branches are greedy,
+    so at any position the regex matches the longest phrase starting there.
+    """
+    trie: Dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+
+class _PhraseMatcher:
+    """All-occurrences substring matcher over a fixed vocabulary"""
+
+    def __init__(self, phrases: Iterable[str]):
+        vocabulary = sorted(set(phrases))
+        # The lookahead makes every start position a candidate, so overlapping hits are found
+        self._pattern = re.compile(f"(?=({_trie_pattern(vocabulary)}))")
+        # The regex reports the longest phrase per position; shorter phrases starting at the
+        # same position are necessarily its prefixes
+        self._prefix_closure: Dict[str, Tuple[str, ...]] = {
+            phrase: tuple(other for other in vocabulary if phrase.startswith(other))
+            for phrase in vocabulary
+        }
+
+    def match(self, text: str) -> FrozenSet[str]:
+        found = set()
+        for hit in self._pattern.finditer(text):
+            longest = hit.group(1)
+            if longest and longest not in found:
+                found.update(self._prefix_closure[longest])
+        return frozenset(found)
+
+
+def _group_sets(groups: Dict[str, List[str]]) -> Dict[str, FrozenSet[str]]:
+    return {name: frozenset(phrases) for name, phrases in groups.items()}
+
+
+_MATCHER = _PhraseMatcher(phrase for phrases in PHRASE_GROUPS.values() for phrase in phrases)
+_NORMALIZED_MATCHER = _PhraseMatcher(phrase for phrases in NORMALIZED_PHRASE_GROUPS.values() for phrase in phrases)
+_GROUP_SETS = _group_sets(PHRASE_GROUPS)
+_NORMALIZED_GROUP_SETS = _group_sets(NORMALIZED_PHRASE_GROUPS)
+
+
+def normalize_text(text: str) -> str:
+    """Lower-case, replace punctuation with spaces and collapse whitespace"""
+    normalized = _NORMALIZE_PATTERN.sub(" ", text.lower())
+    return _WHITESPACE_PATTERN.sub(" ", normalized).strip()
+
+
+class MessageIntents:
+    """Phrases found in one chat message, queried by group name"""
+
+    def __init__(self, message: str):
+        self.text = (message or "").lower()
+        self.phrases = _MATCHER.match(self.text)
+
+    @cached_property
+    def normalized_phrases(self) -> FrozenSet[str]:
+        return _NORMALIZED_MATCHER.match(normalize_text(self.text))
+
+    def has(self, group: str) -> bool:
+        return not self.phrases.isdisjoint(_GROUP_SETS[group])
+
+    def has_normalized(self, group: str) -> bool:
+        return not self.normalized_phrases.isdisjoint(_NORMALIZED_GROUP_SETS[group])
+
+    def terms(self, group: str) -> List[str]:
+        """Matched phrases of ``group`` in the order the group declares them"""
+        return [phrase for phrase in PHRASE_GROUPS[group] if phrase in self.phrases]
+
+    @property
+    def location(self) -> Optional[str]:
+        """First known location mentioned, in KNOWN_LOCATIONS order"""
+        locations = self.terms("locations")
+        return locations[0] if locations else None
+
+
+@lru_cache(maxsize=1024)
+def classify_message(message: str) -> MessageIntents:
+    """
+    Classify a message once; the chat endpoint, rule-based replies and the Watson
+    router all ask about the same message, so results are memoised.
+    """
+    return MessageIntents(message)
@@ -0,0 +1,343 @@
+"""
+Local structured-listing extractor for the chatbot seller flow
+- Pulls material, quantity, unit, price, sale type, location and category out of a
+  free-text listing message with regular expressions (no network call)
+- Returns a confidence score so the caller only asks watsonx when the message is
+  too loose to parse locally
+- Output matches the watsonx extractor's normalized listing record
+"""
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+from app.services.intent_classifier import KNOWN_LOCATIONS
+
+SELLER_LISTING_CATEGORIES = [
+    "Agricultural/Biomass",
+    "Industrial Ash",
+    "Plastic Waste",
+    "Metal Scrap",
+    "Paper & Cardboard",
+    "Construction & Demolition",
+    "Glass",
+    "Textile Waste",
+    "Rubber & Tires",
+    "Organic/Food Waste",
+]
+
+
+SALE_TYPE_ALIASES = {
+    "fixed_price": {"fixed price", "fixed", "fixed-price", "direct", "direct sale", "set price"},
+    "auction": {"auction", "bid", "bidding", "auction listing", "open bidding"},
+}
+
+# Material keywords per category; multi-word terms are matched before their last word
+CATEGORY_MATERIALS = {
+    "Plastic Waste": [
+        "plastic", "plastics", "hdpe", "ldpe", "lldpe", "pp", "pet", "pvc", "abs", "polypropylene",
+        "polyethylene", "polythene", "pet bottles", "plastic bottles",
+    ],
+    "Metal Scrap": [
+        "metal", "steel", "stainless steel", "aluminum", "aluminium", "copper", "brass", "iron",
+        "cast iron", "scrap metal", "ms scrap", "zinc", "lead",
+    ],
+    "Paper & Cardboard": ["paper", "cardboard", "carton", "cartons", "occ", "newspaper", "kraft paper", "mixed paper"],
+    "Glass": ["glass", "cullet", "glassware", "glass bottles"],
+    "Textile Waste": ["textile", "textiles", "fabric", "cotton", "yarn", "cotton waste"],
+    "Rubber & Tires": ["rubber", "tire", "tires", "tyre", "tyres", "crumb rubber"],
+    "Industrial Ash": ["fly ash", "bottom ash", "ash", "slag"],
+    "Agricultural/Biomass": [
+        "biomass", "rice husk", "husk", "straw", "bagasse", "stubble", "sawdust", "coconut shells",
+        "agricultural waste", "crop residue",
+    ],
+    "Organic/Food Waste": ["food waste", "organic waste", "compost", "organic", "food"],
+    "Construction & Demolition": ["construction waste", "demolition", "debris", "concrete", "rubble", "c&d"],
+}
+
+# Words that may precede or follow a material keyword inside its name
+_MATERIAL_MODIFIERS = [
+    "mixed", "clean", "washed", "shredded", "baled", "used", "recycled", "post-consumer",
+    "post-industrial", "industrial", "virgin", "sorted", "white", "brown", "clear", "colored",
+    "coloured", "green", "heavy", "light", "hms",
+]
+_TRADE_CODES = {"hdpe", "ldpe", "lldpe", "pp", "pet", "pvc", "abs", "occ", "hms", "ms", "c&d"}
+_MATERIAL_SUFFIXES = [
+    "scrap", "bales", "bale", "waste", "bottles", "flakes", "granules", "regrind", "sheets",
+    "powder", "pellets", "chips", "film", "films", "drums", "containers", "rolls", "offcuts",
+    "cuttings", "turnings", "wire", "pipes", "lumps",
+]
+
+UNIT_ALIASES = {
+    "tons": ["tons", "ton", "tonnes", "tonne", "mt", "metric tons", "metric ton", "t"],
+    "kg": ["kg", "kgs", "kilogram", "kilograms", "kilo", "kilos"],
+    "quintals": ["quintals", "quintal", "qtl"],
+    "liters": ["liters", "liter", "litres", "litre", "ltr", "l"],
+    "units": ["units", "unit", "pieces", "piece", "pcs", "nos"],
+    "bales": ["bales", "bale"],
+    "cubic meters": ["cubic meters", "cubic meter", "cubic metres", "m3", "cbm"],
+}
+
+_MULTIPLIERS = {"k": 1_000, "thousand": 1_000, "lakh": 100_000, "lakhs": 100_000, "lac": 100_000, "crore": 10_000_000}
+
+# Confidence weights; the four required fields alone reach 0.8
+FIELD_WEIGHTS = {
+    "material_name": 0.25,
+    "quantity": 0.2,
+    "price_per_unit": 0.2,
+    "location": 0.15,
+    "category": 0.1,
+    "unit": 0.05,
+    "sale_type": 0.05,
+}
+REQUIRED_FIELDS = ("material_name", "quantity", "price_per_unit", "location")
+
+
+def _alternation(terms: List[str]) -> str:
+    # Longest first so "metric tons" wins over "t" and "fly ash" over "ash"
+    return "|".join(re.escape(term) for term in sorted(set(terms), key=len, reverse=True))
+
+
+_UNIT_LOOKUP = {alias: unit for unit, aliases in UNIT_ALIASES.items() for alias in aliases}
+_UNIT = _alternation(list(_UNIT_LOOKUP))
+_NUMBER = r"\d[\d,]*(?:\.\d+)?"
+_MULTIPLIER = _alternation(list(_MULTIPLIERS))
+_CURRENCY = r"(?:₹|rs\.?|inr|rupees?)"
+
+_QUANTITY_PATTERN = re.compile(
+    rf"(?<![\w₹.])(?P<number>{_NUMBER})\s*(?P<mult>{_MULTIPLIER})?\s*(?P<unit>{_UNIT})\b(?!\s*(?:/|per\b))",
+    re.IGNORECASE,
+)
+_PRICE_PATTERNS = [
+    # ₹45/kg, rs 5,000 per ton, inr 2 lakh per lot
+    re.compile(
+        rf"{_CURRENCY}\s*(?P<number>{_NUMBER})\s*(?P<mult>{_MULTIPLIER})?"
+        rf"(?:\s*(?:/|per|a|an|each)\s*(?P<unit>{_UNIT})\b)?",
+        re.IGNORECASE,
+    ),
+    # 5000 rupees per ton, 45 inr/kg
+    re.compile(
+        rf"(?<![\w.])(?P<number>{_NUMBER})\s*(?P<mult>{_MULTIPLIER})?\s*{_CURRENCY}"
+        rf"(?:\s*(?:/|per|a|an|each)\s*(?P<unit>{_UNIT})\b)?",
+        re.IGNORECASE,
+    ),
+    # at 5000 per ton, price 45/kg, @ 12 per unit
+    re.compile(
+        rf"(?:(?:\bat|@|\bprice(?:d)?(?:\s+(?:at|of|is))?|\brate(?:\s+(?:of|is))?|\bfor)\s*:?\s*)"
+        rf"(?P<number>{_NUMBER})\s*(?P<mult>{_MULTIPLIER})?\s*(?:/|per|a|each)\s*(?P<unit>{_UNIT})\b",
+        re.IGNORECASE,
+    ),
+]
+
+_MATERIAL_LOOKUP = {term: category for category, terms in CATEGORY_MATERIALS.items() for term in terms}
+_MATERIAL_PATTERN = re.compile(
+    rf"(?:\b(?:{_alternation(_MATERIAL_MODIFIERS)})\s+)*"
+    rf"(?<![\w-])(?P<term>{_alternation(list(_MATERIAL_LOOKUP))})(?![\w-])"
+    rf"(?:\s+(?:{_alternation(_MATERIAL_SUFFIXES)})\b)*",
+    re.IGNORECASE,
+)
+_OF_MATERIAL_PATTERN = re.compile(
+    rf"\b(?:{_UNIT})\s+of\s+(?P<name>[a-z][\w&/-]*(?:\s+[a-z][\w&/-]*){{0,3}}?)"
+    rf"(?=\s*(?:$|[,.;!]|\b(?:at|for|in|from|located|priced|@|available|on|with|per|rs|inr)\b|₹))",
+    re.IGNORECASE,
+)
+_LOCATION_PATTERN = re.compile(rf"\b(?P<city>{_alternation(KNOWN_LOCATIONS)})\b", re.IGNORECASE)
+_PLACE = r"(?P<place>[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)?)"
+# "in"/"from" phrases name a place far more often than "at", which also introduces prices
+_LOCATION_PHRASES = [
+    re.compile(rf"\b(?:located (?:in|at)|pickup (?:in|from|at)|available in|based in|from|in)\s+{_PLACE}"),
+    re.compile(rf"\bat\s+{_PLACE}"),
+]
+# Capitalised words that follow "at"/"in" without being places ("at Rs 3000", "in INR")
+_NOT_PLACES = {"rs", "inr", "usd", "rupee", "rupees", "dollars", "price", "total", "lump", "per"}
+_NUMBER_AFTER = re.compile(r"^\.?\s*\d")
+_SALE_TYPE_PATTERNS = [
+    (sale_type, re.compile(rf"(?<![\w-])(?:{_alternation(list(aliases))})(?![\w-])", re.IGNORECASE))
+    for sale_type, aliases in SALE_TYPE_ALIASES.items()
+]
+# "not an auction", "no bidding", "non-auction", "isn't fixed price" right before an alias
+_NEGATED_BEFORE = re.compile(
+    r"(?:\b(?:not|no|never|without)|n't|\bnon)[\s-]*(?:(?:an?|the|by|via|through|for|up for|open to)\s+)?$",
+    re.IGNORECASE,
+)
+# A price quoted for the whole lot rather than per unit
+_TOTAL_AFTER = re.compile(
+    r"^\s*(?:in\s+)?(?:total|altogether|overall|lump\s*-?\s*sum|for\s+(?:all|everything|the\s+(?:whole\s+)?lot|the\s+entire\s+lot))\b",
+    re.IGNORECASE,
+)
+_TOTAL_BEFORE = re.compile(r"\b(?:total(?:\s+(?:price|cost|value|amount))?|lump\s*-?\s*sum)\s*(?:of|is|:|=)?\s*$", re.IGNORECASE)
+
+
+def _to_number(raw: str, multiplier: Optional[str]) -> Optional[float]:
+    try:
+        value = float(raw.replace(",", ""))
+    except ValueError:
+        return None
+    if multiplier:
+        value *= _MULTIPLIERS[multiplier.lower()]
+    return value
+
+
+@dataclass
+class ParsedListing:
+    """Fields found in a listing message and how sure the parser is about them"""
+
+    fields: Dict[str, Any] = field(default_factory=dict)
+    confidence: float = 0.0
+    missing: List[str] = field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        return not self.missing
+
+    def to_record(self) -> Optional[Dict[str, Any]]:
+        """Normalized listing record (same shape as the watsonx extractor), or None if incomplete"""
+        if not self.complete:
+            return None
+        material = self.fields["material_name"]
+        return {
+            "material_name": material,
+            "title": material,
+            "category": self.fields.get("category") or "Other",
+            "quantity": self.fields["quantity"],
+            "unit": self.fields.get("unit") or "tons",
+            "price_per_unit": self.fields["price_per_unit"],
+            "sale_type": self.fields.get("sale_type") or "fixed_price",
+            "location": self.fields["location"],
+            "description": None,
+            "images": [],
+        }
+
+
+def _find_price(
+    text: str, quantity_span: Optional[Tuple[int, int]]
+) -> Tuple[Optional[float], Optional[str], bool]:
+    """Price, the unit it is quoted per, and whether it is a total for the whole lot"""
+    for pattern in _PRICE_PATTERNS:
+        for match in pattern.finditer(text):
+            if quantity_span and match.start("number") == quantity_span[0]:
+                continue
+            value = _to_number(match.group("number"), match.group("mult"))
+            if value is not None:
+                unit = match.group("unit")
+                is_total = not unit and bool(
+                    _TOTAL_AFTER.search(text[match.end():]) or _TOTAL_BEFORE.search(text[:match.start()])
+                )
+                return value, _UNIT_LOOKUP.get(unit.lower()) if unit else None, is_total
+    return None, None, False
+
+
+def _find_material(text: str) -> Tuple[Optional[str], Optional[str]]:
+    """Material name and its category"""
+    match = _MATERIAL_PATTERN.search(text)
+    category = _MATERIAL_LOOKUP[match.group("term").lower()] if match else None
+
+    of_match = _OF_MATERIAL_PATTERN.search(text)
+    if of_match:
+        name = of_match.group("name").strip()
+        if not category:
+            inner = _MATERIAL_PATTERN.search(name)
+            category = _MATERIAL_LOOKUP[inner.group("term").lower()] if inner else None
+        return name, category
+
+    if match:
+        return " ".join(match.group(0).split()), category
+    return None, None
+
+
+def _find_location(text: str) -> Tuple[Optional[str], bool]:
+    """Location and whether it is one of the known cities"""
+    match = _LOCATION_PATTERN.search(text)
+    if match:
+        return match.group("city").title(), True
+    for pattern in _LOCATION_PHRASES:
+        for phrase in pattern.finditer(text):
+            place = phrase.group("place")
+            words = place.lower().split()
+            if (
+                place.lower() in _UNIT_LOOKUP
+                or place.lower() in _MATERIAL_LOOKUP
+                or words[0] in _NOT_PLACES
+                or words[0] in _MULTIPLIERS
+                # "at Xyz 3000" is a price, not a place
+                or _NUMBER_AFTER.search(text[phrase.end():])
+            ):
+                continue
+            return place, False
+    return None, False
+
+
+def _find_category(text: str, material_category: Optional[str]) -> Optional[str]:
+    lowered = text.lower()
+    for category in SELLER_LISTING_CATEGORIES:
+        if category.lower() in lowered:
+            return category
+    return material_category
+
+
+def _find_sale_type(text: str) -> Optional[str]:
+    found = [
+        sale_type
+        for sale_type, pattern in _SALE_TYPE_PATTERNS
+        # "not an auction" rules auction out; it does not say what the sale type is
+        if any(not _NEGATED_BEFORE.search(text[:match.start()]) for match in pattern.finditer(text))
+    ]
+    # Both mentioned ("fixed price or open bidding") is ambiguous
+    return found[0] if len(found) == 1 else None
+
+
+def _display_material(name: str) -> str:
+    # Polymer and trade codes stay upper-case (HDPE, PET, OCC); everything else is capitalized
+    return " ".join(word.upper() if word.lower() in _TRADE_CODES else word.capitalize() for word in name.split())
+
+
+@lru_cache(maxsize=512)
+def parse_listing_message(message: str) -> ParsedListing:
+    """Extract listing fields from a seller's free-text message"""
+    text = " ".join((message or "").split())
+    fields: Dict[str, Any] = {}
+
+    quantity_match = _QUANTITY_PATTERN.search(text)
+    quantity_span = None
+    if quantity_match:
+        quantity = _to_number(quantity_match.group("number"), quantity_match.group("mult"))
+        if quantity and quantity > 0:
+            fields["quantity"] = quantity
+            fields["unit"] = _UNIT_LOOKUP[quantity_match.group("unit").lower()]
+            quantity_span = quantity_match.span("number")
+
+    price, price_unit, price_is_total = _find_price(text, quantity_span)
+    if price is not None and price_is_total:
+        # "30000 rupees total" for 5 tons is 6000 per ton; without a quantity it cannot be split
+        price = round(price / fields["quantity"], 2) if "quantity" in fields else None
+    if price is not None and price >= 0:
+        fields["price_per_unit"] = price
+        if price_unit and "unit" not in fields:
+            fields["unit"] = price_unit
+
+    material, material_category = _find_material(text)
+    if material:
+        fields["material_name"] = _display_material(material)
+
+    category = _find_category(text, material_category)
+    if category:
+        fields["category"] = category
+
+    location, location_known = _find_location(text)
+    if location:
+        fields["location"] = location
+
+    sale_type = _find_sale_type(text)
+    if sale_type:
+        fields["sale_type"] = sale_type
+
+    confidence = sum(weight for name, weight in FIELD_WEIGHTS.items() if name in fields)
+    # A price quoted per a different unit than the quantity needs a conversion we do not guess
+    if price_unit and fields.get("unit") and price_unit != fields["unit"]:
+        confidence -= 0.2
+    # Any capitalised word after "in"/"at" is a guess; only known cities count fully
+    if location and not location_known:
+        confidence -= FIELD_WEIGHTS["location"]
+    missing = [name for name in REQUIRED_FIELDS if name not in fields]
+    return ParsedListing(fields=fields, confidence=round(max(confidence, 0.0), 3), missing=missing)
@@ -0,0 +1,149 @@
+"""
+Order repository
+- Orders are loaded once per change of orders.json and indexed by id, buyer/seller
+  company, buyer id and status
+- Validated OrderResponse payloads are cached per record version, so unchanged orders
+  are never coerced or serialised twice
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+import threading
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.order import OrderStatus
+from app.schemas.order import OrderResponse
+from app.utils import mock_storage
+from app.utils.file_signature import file_signature
+
+logger = logging.getLogger(__name__)
+
+ORDER_STATUS_VALUES = frozenset(status.value for status in OrderStatus)
+
+# Fields OrderResponse is built from; together they are the record's version
+RESPONSE_FIELDS = (
+    "id", "listing_id", "quantity", "total_price", "buyer_notes", "status", "buyer_id", "created_at", "updated_at",
+)
+
+
+def _normalize_status(order: Dict) -> Dict:
+    status_value = (order.get("status") or "").lower().strip()
+    order["status"] = status_value if status_value in ORDER_STATUS_VALUES else OrderStatus.PENDING.value
+    return order
+
+
+def coerce_order(payload: Dict) -> OrderResponse:
+    try:
+        status = OrderStatus(payload.get("status", "pending"))
+    except ValueError:
+        status = OrderStatus.PENDING
+
+    created_at_raw = payload.get("created_at")
+    updated_at_raw = payload.get("updated_at")
+
+    created_at = (
+        datetime.fromisoformat(created_at_raw)
+        if isinstance(created_at_raw, str)
+        else created_at_raw or datetime.utcnow()
+    )
+    updated_at = (
+        datetime.fromisoformat(updated_at_raw)
+        if isinstance(updated_at_raw, str) and updated_at_raw
+        else None
+    )
+
+    return OrderResponse(
+        id=int(payload.get("id", 0)),
+        listing_id=int(payload.get("listing_id", 0)),
+        quantity=float(payload.get("quantity", 0)),
+        total_price=float(payload.get("total_price", 0)),
+        buyer_notes=payload.get("buyer_notes"),
+        status=status,
+        buyer_id=int(payload.get("buyer_id", 0)),
+        created_at=created_at,
+        updated_at=updated_at,
+    )
+
+
+def _version(order: Dict) -> Tuple:
+    return tuple(order.get(field) for field in RESPONSE_FIELDS)
+
+
+class OrderRepository:
+    """Indexed, read-mostly view over orders.json"""
+
+    INDEXED_FIELDS = ("buyer_company", "seller_company", "buyer_id", "status")
+
+    def __init__(self, loader: Callable[[], List[Dict]]):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._built = False
+        self._signature = None
+        self._orders: List[Dict] = []
+        self._by_id: Dict[int, Dict] = {}
+        self._indexes: Dict[str, Dict[Any, List[Dict]]] = {}
+        # id -> (version, jsonable OrderResponse payload)
+        self._responses: Dict[int, Tuple[Tuple, Dict]] = {}
+        self.loads = 0
+
+    @staticmethod
+    def _index_key(field: str, value: Any) -> Any:
+        return value.lower() if isinstance(value, str) else value
+
+    def _ensure_current(self):
+        signature = file_signature(mock_storage.ORDERS_FILE)
+        if self._built and signature == self._signature:
+            return
+        with self._lock:
+            if self._built and file_signature(mock_storage.ORDERS_FILE) == self._signature:
+                return
+            orders = [_normalize_status(order) for order in self._loader()]
+            # Taken after loading: the loader may bootstrap (write) the file itself
+            self._signature = file_signature(mock_storage.ORDERS_FILE)
+            indexes: Dict[str, Dict[Any, List[Dict]]] = {field: defaultdict(list) for field in self.INDEXED_FIELDS}
+            by_id: Dict[int, Dict] = {}
+            for order in orders:
+                try:
+                    by_id[int(order.get("id", 0))] = order
+                except (TypeError, ValueError):
+                    pass
+                for field in self.INDEXED_FIELDS:
+                    indexes[field][self._index_key(field, order.get(field))].append(order)
+            self._orders = orders
+            self._by_id = by_id
+            self._indexes = {field: dict(index) for field, index in indexes.items()}
+            # Keep cached responses only for records that still exist
+            self._responses = {order_id: entry for order_id, entry in self._responses.items() if order_id in by_id}
+            self._built = True
+            self.loads += 1
+            logger.info(f"📦 Order repository loaded {len(orders)} orders")
+
+    def all(self) -> List[Dict]:
+        self._ensure_current()
+        return self._orders
+
+    def get(self, order_id: int) -> Optional[Dict]:
+        self._ensure_current()
+        return self._by_id.get(order_id)
+
+    def find(self, field: str, value: Any) -> List[Dict]:
+        """Orders whose indexed ``field`` equals ``value`` (strings compare case-insensitively)"""
+        self._ensure_current()
+        return self._indexes.get(field, {}).get(self._index_key(field, value), [])
+
+    def response(self, order: Dict) -> Dict:
+        """JSON-ready OrderResponse for ``order``, validated once per record version"""
+        order_id = int(order.get("id", 0))
+        version = _version(order)
+        cached = self._responses.get(order_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        payload = jsonable_encoder(coerce_order(order))
+        self._responses[order_id] = (version, payload)
+        return payload
+
+    def responses(self, orders: List[Dict]) -> List[Dict]:
+        return [self.response(order) for order in orders]
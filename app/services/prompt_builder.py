@@ -0,0 +1,243 @@
+"""
+Token-budgeted prompt assembly for watsonx
+- Token counts are estimated locally (no tokenizer download, no network call)
+- The system prompt and the latest question are always kept
+- Recent turns are kept verbatim; older turns are reduced to a one-line topic summary
+  and dropped entirely once the budget runs out
+- Context listings are compacted to their key fields and trimmed to a share of the budget
+- Pure and deterministic: the same inputs always produce the same prompt
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import math
+import re
+
+# Fields worth sending to the model; views, inquiries etc. only cost tokens
+CONTEXT_FIELDS = (
+    "title",
+    "material_name",
+    "machine_type",
+    "category",
+    "brand",
+    "model",
+    "condition",
+    "quantity",
+    "unit",
+    "price_per_unit",
+    "price_inr",
+    "sale_type",
+    "status",
+    "location",
+    "seller_company",
+    "compatible_materials",
+)
+
+REPLY_INSTRUCTION = (
+    "Reply with one helpful assistant response in plain text, without adding role prefixes "
+    "or follow-up questions unless the user explicitly asks for them."
+)
+
+_WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+_ELLIPSIS = " …"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count for Llama-style BPE vocabularies: about four characters per token,
+    but never fewer than one token per word or punctuation mark.
+    """
+    if not text:
+        return 0
+    return max(math.ceil(len(text) / 4), len(_WORD_PATTERN.findall(text)))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut ``text`` at a word boundary so it fits ``max_tokens``"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 1:
+        return ""
+    words = text.split()
+    low, high = 0, len(words)
+    # Binary search for the longest word prefix that still fits
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(" ".join(words[:mid]) + _ELLIPSIS) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    if low == 0:
+        return text[: max(max_tokens - 1, 0) * 4].rstrip() + _ELLIPSIS
+    return " ".join(words[:low]) + _ELLIPSIS
+
+
+@dataclass
+class BuiltPrompt:
+    """Assembled prompt plus what was kept or cut, for logging and tests"""
+
+    text: str
+    estimated_tokens: int
+    turns_verbatim: int = 0
+    turns_summarized: int = 0
+    turns_dropped: int = 0
+    context_items: int = 0
+    context_items_dropped: int = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "estimated_tokens": self.estimated_tokens,
+            "turns_verbatim": self.turns_verbatim,
+            "turns_summarized": self.turns_summarized,
+            "turns_dropped": self.turns_dropped,
+            "context_items": self.context_items,
+            "context_items_dropped": self.context_items_dropped,
+        }
+
+
+class PromptBuilder:
+    """Builds watsonx prompts that stay within a fixed token budget"""
+
+    def __init__(
+        self,
+        max_tokens: int = 3000,
+        recent_turns: int = 6,
+        max_turn_tokens: int = 300,
+        context_share: float = 0.4,
+        summary_words: int = 12,
+        max_summary_tokens: int = 200,
+    ):
+        self.max_tokens = max_tokens
+        self.recent_turns = recent_turns
+        self.max_turn_tokens = max_turn_tokens
+        self.context_share = context_share
+        self.summary_words = summary_words
+        self.max_summary_tokens = max_summary_tokens
+
+    def build(
+        self,
+        system_prompt: str,
+        message: str,
+        conversation_history: Optional[List[Dict]] = None,
+        context_data: Optional[Dict[str, Any]] = None,
+    ) -> BuiltPrompt:
+        header = system_prompt
+        # The question itself may use at most half the budget
+        question = truncate_to_tokens(message, self.max_tokens // 2)
+        footer = f"\nLatest user question:\n{question}\n\n{REPLY_INSTRUCTION}\n"
+        remaining = self.max_tokens - estimate_tokens(header) - estimate_tokens(footer)
+
+        context_block, context_items, context_dropped = self._context_block(
+            context_data, max(int(remaining * self.context_share), 0)
+        )
+        remaining -= estimate_tokens(context_block)
+
+        history_block, verbatim, summarized, dropped = self._history_block(conversation_history, remaining)
+
+        text = "".join([header, context_block, history_block, footer])
+        return BuiltPrompt(
+            text=text,
+            estimated_tokens=estimate_tokens(text),
+            turns_verbatim=verbatim,
+            turns_summarized=summarized,
+            turns_dropped=dropped,
+            context_items=context_items,
+            context_items_dropped=context_dropped,
+        )
+
+    # Context listings
+
+    @staticmethod
+    def _compact(record: Any) -> Any:
+        if not isinstance(record, dict):
+            return record
+        return {key: record[key] for key in CONTEXT_FIELDS if record.get(key) not in (None, "", [])}
+
+    def _context_block(self, context_data: Optional[Dict[str, Any]], budget: int) -> Tuple[str, int, int]:
+        if not context_data:
+            return "", 0, 0
+
+        prefix = "\nAdditional context to reference if useful:\n"
+        # Round-robin across sections so machinery cannot crowd out every listing
+        sections = {
+            name: [self._compact(item) for item in (value if isinstance(value, list) else [value])]
+            for name, value in context_data.items()
+        }
+        total = sum(len(items) for items in sections.values())
+        kept: Dict[str, List[Any]] = {name: [] for name in sections}
+        used = estimate_tokens(prefix) + estimate_tokens(json.dumps(kept))
+        for depth in range(max((len(items) for items in sections.values()), default=0)):
+            for name, items in sections.items():
+                if depth >= len(items):
+                    continue
+                cost = estimate_tokens(json.dumps(items[depth], ensure_ascii=False)) + 1
+                if used + cost <= budget:
+                    kept[name].append(items[depth])
+                    used += cost
+
+        kept = {name: items for name, items in kept.items() if items}
+        included = sum(len(items) for items in kept.values())
+        if not kept:
+            return "", 0, total
+        return f"{prefix}{json.dumps(kept, ensure_ascii=False)}", included, total - included
+
+    # Conversation history
+
+    @staticmethod
+    def _format_turn(turn: Dict) -> Optional[str]:
+        content = (turn.get("content") or "").strip()
+        if not content:
+            return None
+        speaker = "Assistant" if turn.get("role") == "assistant" else "User"
+        return f"{speaker}: {content}"
+
+    def _topic(self, turn: Dict) -> str:
+        words = (turn.get("content") or "").split()
+        topic = " ".join(words[: self.summary_words])
+        return topic + ("…" if len(words) > self.summary_words else "")
+
+    def _history_block(self, conversation_history: Optional[List[Dict]], budget: int) -> Tuple[str, int, int, int]:
+        turns = [turn for turn in (conversation_history or []) if (turn.get("content") or "").strip()]
+        if not turns or budget <= 0:
+            return "", 0, 0, len(turns)
+
+        recent_header = "\nConversation context (most recent last):\n"
+        used = estimate_tokens(recent_header)
+        recent: List[str] = []
+        # Newest first, so the latest exchanges survive when the budget is tight
+        split = len(turns)
+        for turn in reversed(turns[-self.recent_turns:]):
+            line = truncate_to_tokens(self._format_turn(turn), self.max_turn_tokens)
+            cost = estimate_tokens(line) + 1
+            if used + cost > budget:
+                break
+            recent.append(line)
+            used += cost
+            split -= 1
+        recent.reverse()
+
+        # Older turns: the user's questions, newest first, as a single topic line
+        older = [turn for turn in turns[:split] if turn.get("role") != "assistant"]
+        summary_header = "\nEarlier in this conversation the user asked about: "
+        topics: List[str] = []
+        if older:
+            used += estimate_tokens(summary_header)
+            budget = min(budget, used + self.max_summary_tokens)
+            for turn in reversed(older):
+                topic = self._topic(turn)
+                cost = estimate_tokens(topic) + 1
+                if not topic or used + cost > budget:
+                    break
+                topics.append(topic)
+                used += cost
+            topics.reverse()
+
+        blocks = []
+        if topics:
+            blocks.append(summary_header + "; ".join(topics) + "\n")
+        if recent:
+            blocks.append(recent_header + "\n".join(recent))
+        summarized_turns = len(topics)
+        dropped = len(turns) - len(recent) - summarized_turns
+        return "".join(blocks), len(recent), summarized_turns, dropped
@@ -0,0 +1,191 @@
+"""
+Chatbot response cache
+- Exact hits on the normalized message + context fingerprint + user role
+- Optional near-duplicate hits using hashed bag-of-words embeddings (cosine similarity),
+  only between messages with the same content words: rephrasings and filler words may
+  differ, but never a place, material, number or negation
+- TTL expiry with LRU eviction once the cache is full
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+import math
+import re
+import time
+import zlib
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Words whose presence or absence does not change what is being asked. Negations are
+# deliberately absent: "I do not want to sell" must never match "I want to sell".
+_FILLER_WORDS = frozenset({
+    "a", "an", "the", "i", "me", "my", "we", "our", "you", "your", "is", "are", "am", "be",
+    "do", "does", "can", "could", "would", "will", "should", "please", "kindly", "hi", "hello",
+    "hey", "thanks", "thank", "to", "of", "for", "in", "on", "at", "with", "about", "some",
+    "any", "there", "it", "this", "that", "what", "which", "how", "tell", "show", "give",
+    "just", "also", "so", "and", "or", "know", "like", "want", "need", "looking",
+})
+
+
+def normalize_message(message: str) -> str:
+    """Lower-case, drop punctuation and collapse whitespace"""
+    return " ".join(_TOKEN_PATTERN.findall((message or "").lower()))
+
+
+def context_fingerprint(context_data: Optional[Dict]) -> str:
+    """Stable digest of the grounding data sent with the prompt"""
+    if not context_data:
+        return "-"
+    encoded = json.dumps(context_data, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def content_words(normalized: str) -> frozenset:
+    """Words of a normalized message that carry meaning (light plural strip)"""
+    words = set()
+    for token in normalized.split():
+        if token in _FILLER_WORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        words.add(token)
+    return frozenset(words)
+
+
+def hashed_embedding(text: str, dimensions: int = 1024) -> Dict[int, float]:
+    """
+    Sparse L2-normalised vector of hashed unigrams and bigrams.
+    crc32 keeps bucket assignment stable across processes (unlike hash()).
+    """
+    tokens = text.split()
+    features: List[str] = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    counts: Dict[int, float] = {}
+    for feature in features:
+        bucket = zlib.crc32(feature.encode("utf-8")) % dimensions
+        counts[bucket] = counts.get(bucket, 0.0) + 1.0
+
+    # Sublinear term frequency so repeated words do not dominate
+    weights = {bucket: 1.0 + math.log(count) for bucket, count in counts.items()}
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    if not norm:
+        return {}
+    return {bucket: weight / norm for bucket, weight in weights.items()}
+
+
+def cosine_similarity(left: Dict[int, float], right: Dict[int, float]) -> float:
+    if len(left) > len(right):
+        left, right = right, left
+    return sum(weight * right.get(bucket, 0.0) for bucket, weight in left.items())
+
+
+@dataclass
+class _CacheEntry:
+    partition: Tuple[str, str]
+    response: str
+    expires_at: float
+    vector: Dict[int, float] = field(default_factory=dict)
+    content: frozenset = frozenset()
+
+
+class ResponseCache:
+    """In-memory TTL/LRU cache for generated chatbot answers"""
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 600,
+        similarity_threshold: float = 0.0,
+        dimensions: int = 1024,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.dimensions = dimensions
+        self._entries: "OrderedDict[Tuple[str, str, str], _CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _partition(context_data: Optional[Dict], user_role: Optional[str]) -> Tuple[str, str]:
+        return context_fingerprint(context_data), (user_role or "anonymous")
+
+    def get(self, message: str, context_data: Optional[Dict], user_role: Optional[str]) -> Optional[str]:
+        normalized = normalize_message(message)
+        if not normalized:
+            return None
+
+        partition = self._partition(context_data, user_role)
+        key = (normalized, *partition)
+        now = time.monotonic()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.response
+            del self._entries[key]
+
+        if self.similarity_threshold > 0:
+            match = self._nearest(normalized, partition, now)
+            if match is not None:
+                self.near_hits += 1
+                return match
+
+        self.misses += 1
+        return None
+
+    def set(self, message: str, context_data: Optional[Dict], user_role: Optional[str], response: str):
+        normalized = normalize_message(message)
+        if not normalized or not response:
+            return
+
+        partition = self._partition(context_data, user_role)
+        key = (normalized, *partition)
+        self._entries[key] = _CacheEntry(
+            partition=partition,
+            response=response,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            vector=hashed_embedding(normalized, self.dimensions) if self.similarity_threshold > 0 else {},
+            content=content_words(normalized) if self.similarity_threshold > 0 else frozenset(),
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _nearest(self, normalized: str, partition: Tuple[str, str], now: float) -> Optional[str]:
+        vector = hashed_embedding(normalized, self.dimensions)
+        if not vector:
+            return None
+        content = content_words(normalized)
+
+        best_key = None
+        best_score = self.similarity_threshold
+        expired = []
+        for key, entry in self._entries.items():
+            if entry.expires_at <= now:
+                expired.append(key)
+                continue
+            if entry.partition != partition or entry.content != content:
+                continue
+            score = cosine_similarity(vector, entry.vector)
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        for key in expired:
+            del self._entries[key]
+
+        if best_key is None:
+            return None
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key].response
@@ -0,0 +1,286 @@
+"""
+Conversation session stores
+- Keep short-lived per-user state (e.g. the chatbot listing flow) bounded in memory
+- Sessions expire after a sliding TTL and the least recently used are evicted first
+- SQLite and Redis backends share sessions between worker processes
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+Session = Dict[str, Any]
+
+
+class SessionStore(ABC):
+    """Key/value store for JSON-serialisable session dicts"""
+
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Session]:
+        """Return the session and refresh its TTL, or None if missing/expired"""
+
+    @abstractmethod
+    def set(self, key: str, session: Session):
+        ...
+
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    def pop(self, key: str, default: Optional[Session] = None) -> Optional[Session]:
+        session = self.get(key)
+        if session is None:
+            return default
+        self.delete(key)
+        return session
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+
+class MemorySessionStore(SessionStore):
+    """Per-process store; sessions are copied so callers must ``set`` after changes"""
+
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 1000):
+        super().__init__(ttl_seconds, max_entries)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Session]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries[key] = (payload, now + self.ttl_seconds)
+            self._entries.move_to_end(key)
+        return json.loads(payload)
+
+    def set(self, key: str, session: Session):
+        payload = json.dumps(session, default=str)
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (payload, now + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            self._evict(now)
+
+    def _evict(self, now: float):
+        expired = [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._evict(time.monotonic())
+            return len(self._entries)
+
+
+class SQLiteSessionStore(SessionStore):
+    """File-backed store shared by every worker on the host (WAL mode)"""
+
+    def __init__(self, path: Path, ttl_seconds: float = 3600, max_entries: int = 1000):
+        super().__init__(ttl_seconds, max_entries)
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened lazily so importing the router never touches the filesystem
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " key TEXT PRIMARY KEY,"
+                " payload TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " touched_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_touched ON sessions (touched_at)")
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Session]:
+        # Wall-clock time: expiry has to mean the same thing in every process
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT payload FROM sessions WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE sessions SET expires_at = ?, touched_at = ? WHERE key = ?",
+                (now + self.ttl_seconds, now, key),
+            )
+        return json.loads(row[0])
+
+    def set(self, key: str, session: Session):
+        payload = json.dumps(session, default=str)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT INTO sessions (key, payload, expires_at, touched_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET payload = excluded.payload, "
+                    "expires_at = excluded.expires_at, touched_at = excluded.touched_at",
+                    (key, payload, now + self.ttl_seconds, now),
+                )
+                conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+                conn.execute(
+                    "DELETE FROM sessions WHERE key IN ("
+                    " SELECT key FROM sessions ORDER BY touched_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, key: str):
+        with self._lock:
+            self._connection().execute("DELETE FROM sessions WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._connection().execute("DELETE FROM sessions")
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT COUNT(*) FROM sessions WHERE expires_at > ?", (time.time(),)
+            ).fetchone()
+        return row[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Store backed by any Redis-compatible client (redis-py, fakeredis, ...).
+    Payloads use native key expiry; a sorted set of last-touch times drives LRU eviction.
+    """
+
+    def __init__(self, client, ttl_seconds: float = 3600, max_entries: int = 1000, prefix: str = "session:"):
+        super().__init__(ttl_seconds, max_entries)
+        self.client = client
+        self.prefix = prefix
+        self._recency_key = f"{prefix}__recency__"
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def get(self, key: str) -> Optional[Session]:
+        payload = self.client.get(self._key(key))
+        if payload is None:
+            self.client.zrem(self._recency_key, key)
+            return None
+        self.client.expire(self._key(key), int(self.ttl_seconds))
+        self.client.zadd(self._recency_key, {key: time.time()})
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8")
+        return json.loads(payload)
+
+    def set(self, key: str, session: Session):
+        self.client.set(self._key(key), json.dumps(session, default=str), ex=int(self.ttl_seconds))
+        self.client.zadd(self._recency_key, {key: time.time()})
+        self._evict()
+
+    def _evict(self):
+        # Entries whose payload already expired are dropped from the recency set too
+        self.client.zremrangebyscore(self._recency_key, "-inf", time.time() - self.ttl_seconds)
+        overflow = self.client.zcard(self._recency_key) - self.max_entries
+        if overflow > 0:
+            for stale in self.client.zrange(self._recency_key, 0, overflow - 1):
+                stale = stale.decode("utf-8") if isinstance(stale, bytes) else stale
+                self.client.delete(self._key(stale))
+                self.client.zrem(self._recency_key, stale)
+
+    def delete(self, key: str):
+        self.client.delete(self._key(key))
+        self.client.zrem(self._recency_key, key)
+
+    def clear(self):
+        for member in self.client.zrange(self._recency_key, 0, -1):
+            member = member.decode("utf-8") if isinstance(member, bytes) else member
+            self.client.delete(self._key(member))
+        self.client.delete(self._recency_key)
+
+    def __len__(self) -> int:
+        self.client.zremrangebyscore(self._recency_key, "-inf", time.time() - self.ttl_seconds)
+        return self.client.zcard(self._recency_key)
+
+
+def create_session_store(
+    backend: str,
+    ttl_seconds: float,
+    max_entries: int,
+    sqlite_path: Optional[str] = None,
+    redis_url: Optional[str] = None,
+    prefix: str = "session:",
+) -> SessionStore:
+    """Build the configured backend, falling back to memory if it cannot be used"""
+    backend = (backend or "memory").lower()
+
+    if backend == "redis":
+        if redis_url:
+            try:
+                import redis
+
+                return RedisSessionStore(redis.Redis.from_url(redis_url), ttl_seconds, max_entries, prefix)
+            except ImportError:
+                logger.warning("⚠️  redis package not installed - using in-memory session store")
+        else:
+            logger.warning("⚠️  Redis session store selected without a URL - using in-memory session store")
+
+    elif backend == "sqlite":
+        if sqlite_path:
+            return SQLiteSessionStore(sqlite_path, ttl_seconds, max_entries)
+        logger.warning("⚠️  SQLite session store selected without a path - using in-memory session store")
+
+    elif backend != "memory":
+        logger.warning(f"⚠️  Unknown session store backend '{backend}' - using in-memory session store")
+
+    return MemorySessionStore(ttl_seconds, max_entries)
@@ -4,18 +4,59 @@ Hybrid Watson Service
 - Watsonx.ai Foundation Models: For general queries and fallback
 """
 
-from typing import List, Dict, Optional, Any
+from typing import AsyncIterator, List, Dict, Optional, Any
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
 from app.config import settings
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.iam_token_cache import IAMTokenCache
+from app.services.intent_classifier import classify_message
+from app.services.prompt_builder import PromptBuilder
+from app.services.response_cache import ResponseCache, context_fingerprint
+from app.utils.metrics import observe_watson
+from app.utils.single_flight import SingleFlight, normalize_key
+import asyncio
 import json
-import requests  # type: ignore
+import httpx
 import logging
 import re
+import time
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class _CallTimer:
+    """
+    Phase timings for one upstream HTTP call, fed by httpx's trace extension.
+    connect is only reported when a new connection was opened (not for pooled reuse).
+    """
+
+    def __init__(self, backend: str):
+        self.backend = backend
+        self.started = time.perf_counter()
+        self._connect_started: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.first_byte: Optional[float] = None
+
+    async def trace(self, event: str, info: Dict[str, Any]):
+        now = time.perf_counter()
+        if event.endswith("connect_tcp.started"):
+            self._connect_started = now
+        elif event.endswith(("connect_tcp.complete", "start_tls.complete")) and self._connect_started is not None:
+            self.connect = now - self._connect_started
+        elif event.endswith("receive_response_headers.complete") and self.first_byte is None:
+            self.first_byte = now - self.started
+
+    def finish(self):
+        if self.connect is not None:
+            observe_watson(self.backend, "connect", self.connect)
+        if self.first_byte is not None:
+            observe_watson(self.backend, "first_byte", self.first_byte)
+        observe_watson(self.backend, "total", time.perf_counter() - self.started)
+
+
 class WatsonHybridService:
     """
     Hybrid service that uses:
@@ -75,6 +116,54 @@ class WatsonHybridService:
         logger.info(f"  - Orchestrate instance ID: {settings.WATSON_INSTANCE_ID}")
         logger.info(f"  - Seller-specific agent configured: {bool(self.seller_agent_id)}")
         logger.info(f"  - Watsonx enabled: {self.watsonx_enabled}")
+
+        # Shared async HTTP client, created lazily on the running event loop
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._background_tasks = set()
+
+        # Hedged dispatch: also start watsonx when Orchestrate has produced nothing after this delay
+        self.hedge_enabled = settings.WATSON_HEDGE_ENABLED
+        self.hedge_delay = settings.WATSON_HEDGE_DELAY_SECONDS
+        self.hedge_queue_size = settings.WATSON_HEDGE_QUEUE_SIZE
+
+        # Per-backend circuit breakers; also size each backend's request timeout
+        self._breakers: Dict[str, CircuitBreaker] = {
+            service: CircuitBreaker(
+                service,
+                window_size=settings.WATSON_BREAKER_WINDOW,
+                minimum_calls=settings.WATSON_BREAKER_MIN_CALLS,
+                failure_rate_threshold=settings.WATSON_BREAKER_FAILURE_RATE,
+                open_seconds=settings.WATSON_BREAKER_OPEN_SECONDS,
+                timeout_percentile=settings.WATSON_ADAPTIVE_TIMEOUT_PERCENTILE,
+                timeout_multiplier=settings.WATSON_ADAPTIVE_TIMEOUT_MULTIPLIER,
+                min_timeout=settings.WATSON_ADAPTIVE_TIMEOUT_MIN,
+                max_timeout=settings.WATSON_REQUEST_TIMEOUT,
+            )
+            for service in ("orchestrate", "watsonx")
+        }
+
+        # IAM access tokens, one per API key
+        self._token_cache = IAMTokenCache(refresh_margin=settings.WATSON_IAM_REFRESH_MARGIN)
+
+        # Concurrent identical generations are coalesced into one backend call
+        self._flight = SingleFlight()
+
+        # Answers to repeated questions (skips both the IAM and the model call)
+        self._response_cache: Optional[ResponseCache] = None
+        if settings.WATSON_RESPONSE_CACHE_ENABLED:
+            self._response_cache = ResponseCache(
+                max_entries=settings.WATSON_RESPONSE_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.WATSON_RESPONSE_CACHE_TTL_SECONDS,
+                similarity_threshold=settings.WATSON_RESPONSE_CACHE_SIMILARITY,
+            )
+        
+        self._prompt_builder = PromptBuilder(
+            max_tokens=settings.WATSONX_PROMPT_MAX_TOKENS,
+            recent_turns=settings.WATSONX_PROMPT_RECENT_TURNS,
+            context_share=settings.WATSONX_PROMPT_CONTEXT_SHARE,
+        )
         
         # System prompt for watsonx
         self.general_prompt = """You are a helpful assistant for a waste material marketplace.
@@ -82,32 +171,216 @@ class WatsonHybridService:
         Keep responses friendly, concise, and helpful.
         Provide a single direct answer tailored to the latest user question without including dialogue labels like 'User:' or 'Assistant:'."""
     
-    def get_iam_token(self, service: str = "orchestrate") -> Optional[str]:
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the keep-alive client for the running event loop, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.WATSON_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.WATSON_HTTP_MAX_KEEPALIVE,
+                ),
+                timeout=self._timeout(settings.WATSON_REQUEST_TIMEOUT),
+            )
+            self._client_loop = loop
+            self._host_limits = {}
+        return self._client
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        """Per-host semaphore so one slow upstream cannot take every pooled connection"""
+        host = urlsplit(url).netloc
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(settings.WATSON_HTTP_PER_HOST_LIMIT)
+            self._host_limits[host] = semaphore
+        return semaphore
+
+    @staticmethod
+    def _timeout(total: float) -> httpx.Timeout:
+        return httpx.Timeout(total, connect=min(total, settings.WATSON_HTTP_CONNECT_TIMEOUT))
+
+    @staticmethod
+    def _is_upstream_failure(status_code: int) -> bool:
+        # Client errors (bad token, bad request) say nothing about backend health
+        return status_code >= 500 or status_code == 429
+
+    def _acquire_breaker(self, backend: Optional[str]) -> Optional[CircuitBreaker]:
+        if backend is None:
+            return None
+        breaker = self._breakers[backend]
+        if not breaker.acquire():
+            raise CircuitOpenError(backend)
+        return breaker
+
+    def _request_timeout(self, timeout: Optional[float], backend: Optional[str]) -> float:
+        if timeout:
+            return timeout
+        if backend is not None:
+            return self._breakers[backend].timeout()
+        return settings.WATSON_REQUEST_TIMEOUT
+
+    async def _post(
+        self,
+        url: str,
+        timeout: Optional[float] = None,
+        backend: Optional[str] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        POST through the shared pool, bounded by the per-host concurrency limit.
+        With ``backend`` set the call goes through that backend's circuit breaker and
+        uses its adaptive timeout as a hard deadline.
+        """
+        breaker = self._acquire_breaker(backend)
+        timeout = self._request_timeout(timeout, backend)
+        client = self._get_client()
+        timer = _CallTimer(backend or "iam")
+        started = time.monotonic()
+        try:
+            async with self._host_limit(url):
+                response = await asyncio.wait_for(
+                    client.post(url, timeout=self._timeout(timeout), extensions={"trace": timer.trace}, **kwargs),
+                    timeout,
+                )
+        except (httpx.TransportError, asyncio.TimeoutError):
+            if breaker:
+                breaker.record_failure()
+            raise
+        except BaseException:
+            if breaker:
+                breaker.release()
+            raise
+        finally:
+            timer.finish()
+
+        if breaker:
+            if self._is_upstream_failure(response.status_code):
+                breaker.record_failure()
+            else:
+                breaker.record_success(time.monotonic() - started)
+        return response
+
+    @asynccontextmanager
+    async def _stream(
+        self,
+        url: str,
+        timeout: Optional[float] = None,
+        backend: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Streaming POST; the per-host slot is held until the body has been consumed.
+        The adaptive timeout bounds connecting and waiting for the response headers, which
+        is also the breaker latency. Body reads only fail after WATSON_STREAM_IDLE_TIMEOUT
+        without data, since agents pause between deltas. Read errors mid-stream count as failures.
+        """
+        breaker = self._acquire_breaker(backend)
+        timeout = self._request_timeout(timeout, backend)
+        client = self._get_client()
+        timer = _CallTimer(backend or "iam")
+        started = time.monotonic()
+        first_byte = None
+        healthy = None
+        try:
+            async with self._host_limit(url):
+                idle = settings.WATSON_STREAM_IDLE_TIMEOUT
+                request = client.build_request(
+                    "POST", url,
+                    timeout=httpx.Timeout(idle, connect=min(timeout, settings.WATSON_HTTP_CONNECT_TIMEOUT)),
+                    extensions={"trace": timer.trace},
+                    **kwargs,
+                )
+                response = await asyncio.wait_for(client.send(request, stream=True), timeout)
+                try:
+                    first_byte = time.monotonic() - started
+                    healthy = not self._is_upstream_failure(response.status_code)
+                    yield response
+                finally:
+                    await response.aclose()
+        except (httpx.TransportError, asyncio.TimeoutError):
+            healthy = False
+            raise
+        finally:
+            # total covers the whole streamed body
+            timer.finish()
+            if breaker:
+                if healthy is True:
+                    breaker.record_success(first_byte)
+                elif healthy is False:
+                    breaker.record_failure()
+                else:
+                    breaker.release()
+
+    def backend_available(self, service: str) -> bool:
+        """Enabled and not short-circuited by an open breaker"""
+        enabled = self.orchestrate_enabled if service == "orchestrate" else self.watsonx_enabled
+        return bool(enabled) and self._breakers[service].available()
+
+    def has_available_backend(self) -> bool:
+        return self.backend_available("orchestrate") or self.backend_available("watsonx")
+
+    def backend_health(self) -> Dict[str, Dict]:
+        """Breaker state, failure rate, latency percentiles and current timeout per backend"""
+        health = {}
+        for service, breaker in self._breakers.items():
+            enabled = self.orchestrate_enabled if service == "orchestrate" else self.watsonx_enabled
+            health[service] = {"enabled": bool(enabled), **breaker.snapshot()}
+        return health
+
+    async def aclose(self):
+        """Close pooled connections"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+
+    def _api_key_for(self, service: str) -> Optional[str]:
+        # Use the appropriate API key for each service
+        # This is critical - each service needs its own API key with proper permissions
+        if service == "watsonx":
+            return self.watsonx_api_key
+        return self.orchestrate_api_key
+
+    async def get_iam_token(self, service: str = "orchestrate") -> Optional[str]:
         """Get IAM token for IBM Cloud authentication
         
+        Tokens are cached per API key until shortly before they expire and are
+        refreshed in the background, so most calls return without a network round trip.
+        
         Args:
             service: 'orchestrate' or 'watsonx' - determines which API key to use
         """
-        # Use the appropriate API key for each service
-        # This is critical - each service needs its own API key with proper permissions
-        if service == "watsonx":
-            api_key = self.watsonx_api_key
-        else:
-            api_key = self.orchestrate_api_key
+        api_key = self._api_key_for(service)
         
         if not api_key:
             logger.warning(f"⚠️  No API key configured for {service}")
             return None
         
+        started = time.perf_counter()
         try:
-            url = "https://iam.cloud.ibm.com/identity/token"
+            return await self._token_cache.get(api_key, lambda: self._request_iam_token(api_key, service))
+        finally:
+            # Time this request waited for a token (near zero on cache hits)
+            observe_watson(service, "iam", time.perf_counter() - started)
+
+    def invalidate_iam_token(self, service: str):
+        """Forget the cached token for a service after the upstream rejected it"""
+        api_key = self._api_key_for(service)
+        if api_key:
+            self._token_cache.invalidate(api_key)
+
+    async def _request_iam_token(self, api_key: str, service: str) -> Optional[Dict[str, Any]]:
+        """Exchange an API key for an access token; returns the raw IAM payload"""
+        try:
+            logger.info(f"🔑 Requesting IAM token for {service}")
+            url = settings.WATSON_IAM_URL
             data = {
                 "grant_type": "urn:ibm:params:oauth:grant-type:apikey",
                 "apikey": api_key
             }
-            response = requests.post(url, data=data, timeout=10)
+            response = await self._post(url, data=data, timeout=settings.WATSON_IAM_TIMEOUT)
             if response.status_code == 200:
-                return response.json()["access_token"]
+                return response.json()
             logger.error(f"Failed to get IAM token for {service}: {response.status_code} - {response.text[:200]}")
             return None
         except Exception as e:
@@ -119,66 +392,108 @@ class WatsonHybridService:
         Determine if query is about waste data (should use Orchestrate agent)
         Excludes listing creation queries which should use WatsonX
         """
-        message_lower = message.lower()
-        
-        # First, check if this is a listing creation query (should use WatsonX, not Orchestrate)
-        listing_creation_phrases = [
-            "available for sale", "for sale", "ready for sale", "up for sale",
-            "priced at", "price per", "selling", "i have", "i've got", 
-            "we have", "we've got", "material available", "tons available",
-            "kg available", "fixed sale", "fixed price", "i want to sell",
-            "i want to list", "create a listing", "list my"
-        ]
+        intents = classify_message(message)
         
-        # Check if it's a question (informational query)
-        # Questions about waste materials should go to Orchestrate Agent
-        question_indicators = [
-            "what", "how", "where", "when", "why", "can i", "should i",
-            "what can i do", "what can i", "how can i", "tell me", "explain",
-            "describe", "help me", "i want to know"
-        ]
-        is_question = any(qword in message_lower for qword in question_indicators)
-        
-        # If it's a listing creation query (not a question), it's NOT a data query
-        # (it should go to WatsonX for structured parsing)
-        # But questions about materials ARE data queries (should use Orchestrate)
-        is_listing_creation = (not is_question) and any(phrase in message_lower for phrase in listing_creation_phrases)
+        # Questions about waste materials should go to Orchestrate Agent; listing creation
+        # phrasing that is not a question should go to WatsonX for structured parsing
+        is_question = intents.has("data_question")
+        is_listing_creation = (not is_question) and intents.has("data_listing_creation")
         if is_listing_creation:
             return False
         
         # Keywords that indicate waste marketplace data queries
-        data_keywords = [
-            "waste", "material", "listing", "plastic", "metal", "paper", "biomass",
-            "machinery", "equipment", "price", "quantity", "buy", "sell",
-            "seller", "location", "category", "auction", "bid",
-            "bagasse", "rice husk", "coconut shell", "straw", "hay", "fly ash",
-            "bottom ash", "coal ash", "hdpe", "hdpe scrap", "pet", "pet bottles",
-            "pp scrap", "ldpe", "ldpe film", "mixed plastic", "steel", "steel scrap",
-            "aluminum", "aluminum scrap", "copper wire", "brass scrap", "cast iron",
-            "cardboard", "cardboard bales", "mixed paper", "newspaper", "concrete rubble",
-            "brick waste", "scrap wood", "gypsum waste", "clear glass", "mixed glass",
-            "broken glass", "cotton scrap", "fabric remnants", "industrial rags",
-            "tire scrap", "rubber crumb", "food processing waste", "vegetable waste",
-            "dual-shaft", "shredder", "pulp processing", "twin screw", "extruder",
-            "carbonization furnace", "hydraulic baler", "ring spinning", "rotary screw",
-            "projectile weaving", "injection molding", "blow molding",
-            "water cooled chiller", "fourdrinier", "paper machine", "coal fired boiler",
-            "bottling line", "reverse osmosis", "ro plant", "fiber laser", "press brake",
-            "briquetting", "pelletizing", "gasification", "de-inking", "granulator",
-            "washing line", "fiber spinning", "weaving loom", "alligator shear",
-            "baling press"
-        ]
-        
-        return any(keyword in message_lower for keyword in data_keywords)
+        return intents.has("data_keywords")
     
-    def call_orchestrate_agent(
+    async def _orchestrate_events(
         self,
         message: str,
         token: str,
-        agent_id: Optional[str] = None
+        agent_id: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield parsed NDJSON events from the Orchestrate run stream as they arrive.
+        The upstream body is only read as fast as the caller consumes events.
+        """
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json"
+        }
+        
+        # Use the correct endpoint from working curl command
+        # Format: /instances/{instance_id}/v1/orchestrate/runs/stream (note: /v1/ not /api/v1/)
+        endpoint = f"{self.orchestrate_host}/v1/orchestrate/runs/stream"
+        
+        # Use the working payload format from curl command
+        payload = {
+            "message": {
+                "role": "human",
+                "content": message
+            },
+            "agent_id": agent_id,
+            "additional_parameters": {},
+            "context": {}
+        }
+        
+        logger.info(f"📡 Endpoint: {endpoint}")
+        logger.info(f"📦 Payload: {json.dumps(payload, indent=2)}")
+        
+        async with self._stream(endpoint, headers=headers, json=payload, backend="orchestrate") as response:
+            logger.info(f"📥 Response status: {response.status_code}")
+            
+            if response.status_code != 200:
+                await response.aread()
+                if response.status_code == 401:
+                    self.invalidate_iam_token("orchestrate")
+                logger.warning(f"⚠️  Orchestrate returned {response.status_code}: {response.text[:200]}")
+                return
+            
+            # Each line is a JSON object representing an event
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"⚠️  Failed to parse JSON line: {line[:100] if line else 'empty'}")
+                    continue
+                
+                yield event
+                
+                # Check for completion
+                if event.get("event") == "done":
+                    return
+
+    @staticmethod
+    def _delta_text(event: Dict[str, Any]) -> str:
+        """Text chunk carried by a message.delta event"""
+        delta = event.get("data", {}).get("delta", {})
+        content = delta.get("content", [])
+        if content and isinstance(content, list) and isinstance(content[0], dict):
+            return content[0].get("text", "")
+        return ""
+
+    @staticmethod
+    def _created_text(event: Dict[str, Any]) -> str:
+        """Complete message text carried by a message.created event"""
+        message = event.get("data", {}).get("message", {})
+        content = message.get("content", [])
+        if content and isinstance(content, list):
+            # Extract text from content array
+            for content_item in content:
+                if isinstance(content_item, dict) and content_item.get("text"):
+                    return content_item["text"]
+        return ""
+
+    async def call_orchestrate_agent(
+        self,
+        message: str,
+        token: str,
+        agent_id: Optional[str] = None,
+        first_token: Optional[asyncio.Event] = None
     ) -> Optional[str]:
         """
         Call Watson Orchestrate Agent (for waste data queries)
+        ``first_token`` is set as soon as the agent starts producing text.
         """
         agent_to_use = agent_id or self.orchestrate_agent_id
 
@@ -189,105 +504,75 @@ class WatsonHybridService:
             logger.info("🤖 Calling Watson Orchestrate Agent")
             logger.info(f"🆔 Using agent ID: {agent_to_use}")
             
-            headers = {
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json"
-            }
-            
-            # Use the correct endpoint from working curl command
-            # Format: /instances/{instance_id}/v1/orchestrate/runs/stream (note: /v1/ not /api/v1/)
-            endpoint = f"{self.orchestrate_host}/v1/orchestrate/runs/stream"
-            
-            # Use the working payload format from curl command
-            payload = {
-                "message": {
-                    "role": "human",
-                    "content": message
-                },
-                "agent_id": agent_to_use,
-                "additional_parameters": {},
-                "context": {}
-            }
+            accumulated_text = ""
+            final_message = None
             
-            logger.info(f"📡 Endpoint: {endpoint}")
-            logger.info(f"📦 Payload: {json.dumps(payload, indent=2)}")
-            
-            response = requests.post(endpoint, headers=headers, json=payload, timeout=30)
-            
-            logger.info(f"📥 Response status: {response.status_code}")
-            
-            if response.status_code == 200:
-                # Handle streaming JSON lines response (NDJSON format)
-                # Each line is a JSON object representing an event
-                accumulated_text = ""
-                final_message = None
+            async for event in self._orchestrate_events(message, token, agent_to_use):
+                event_type = event.get("event", "")
                 
-                try:
-                    # Read streaming response line by line
-                    for line in response.iter_lines():
-                        if not line:
-                            continue
-                        
-                        try:
-                            event = json.loads(line.decode('utf-8'))
-                            event_type = event.get("event", "")
-                            event_data = event.get("data", {})
-                            
-                            # Handle message.delta events - accumulate text chunks
-                            if event_type == "message.delta":
-                                delta = event_data.get("delta", {})
-                                content = delta.get("content", [])
-                                if content and isinstance(content, list) and len(content) > 0:
-                                    text_chunk = content[0].get("text", "")
-                                    if text_chunk:
-                                        accumulated_text += text_chunk
-                            
-                            # Handle message.created event - contains final complete message
-                            elif event_type == "message.created":
-                                message = event_data.get("message", {})
-                                content = message.get("content", [])
-                                if content and isinstance(content, list) and len(content) > 0:
-                                    # Extract text from content array
-                                    for content_item in content:
-                                        if isinstance(content_item, dict):
-                                            text = content_item.get("text", "")
-                                            if text:
-                                                final_message = text
-                                                break
-                            
-                            # Check for completion
-                            elif event_type == "done":
-                                break
-                                
-                        except json.JSONDecodeError:
-                            logger.warning(f"⚠️  Failed to parse JSON line: {line[:100] if line else 'empty'}")
-                            continue
-                    
-                    # Return final message if available, otherwise accumulated text
-                    if final_message:
-                        logger.info(f"✅ Success with Orchestrate Agent (final message)")
-                        return final_message
-                    elif accumulated_text:
-                        logger.info(f"✅ Success with Orchestrate Agent (accumulated text)")
-                        return accumulated_text
-                    else:
-                        logger.warning("⚠️  No message content found in stream")
-                        return None
-                except Exception as stream_error:
-                    logger.error(f"Error processing stream: {stream_error}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-                    return None
+                # Handle message.delta events - accumulate text chunks
+                if event_type == "message.delta":
+                    accumulated_text += self._delta_text(event)
+                
+                # Handle message.created event - contains final complete message
+                elif event_type == "message.created":
+                    final_message = self._created_text(event) or final_message
+
+                if first_token is not None and (accumulated_text or final_message):
+                    first_token.set()
+            
+            # Return final message if available, otherwise accumulated text
+            if final_message:
+                logger.info(f"✅ Success with Orchestrate Agent (final message)")
+                return final_message
+            elif accumulated_text:
+                logger.info(f"✅ Success with Orchestrate Agent (accumulated text)")
+                return accumulated_text
             else:
-                logger.warning(f"⚠️  Orchestrate returned {response.status_code}: {response.text[:200]}")
+                logger.warning("⚠️  No message content found in stream")
                 return None
         except Exception as e:
             logger.error(f"Error calling Orchestrate agent: {e}")
             import traceback
             logger.error(traceback.format_exc())
             return None
+
+    async def stream_orchestrate_agent(
+        self,
+        message: str,
+        token: str,
+        agent_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream Watson Orchestrate Agent output, yielding each message.delta chunk as
+        soon as it arrives. Falls back to the message.created text if no deltas were sent.
+        """
+        agent_to_use = agent_id or self.orchestrate_agent_id
+
+        if not self.orchestrate_enabled or not agent_to_use:
+            return
+        
+        logger.info("🤖 Streaming from Watson Orchestrate Agent")
+        streamed = False
+        final_message = None
+        try:
+            async for event in self._orchestrate_events(message, token, agent_to_use):
+                event_type = event.get("event", "")
+                if event_type == "message.delta":
+                    text_chunk = self._delta_text(event)
+                    if text_chunk:
+                        streamed = True
+                        yield text_chunk
+                elif event_type == "message.created":
+                    final_message = self._created_text(event) or final_message
+        except Exception as e:
+            logger.error(f"Error streaming from Orchestrate agent: {e}")
+            return
+        
+        if not streamed and final_message:
+            yield final_message
     
-    def call_watsonx(self, message: str, conversation_history: List[Dict], 
+    async def call_watsonx(self, message: str, conversation_history: List[Dict], 
                      context_data: Optional[Dict], token: str) -> Optional[str]:
         """
         Call Watsonx.ai for general queries
@@ -305,37 +590,10 @@ class WatsonHybridService:
                 "Content-Type": "application/json"
             }
             
-            # Build the prompt from conversation
-            prompt_parts = [self.general_prompt]
-
-            # Add context if available
-            if context_data:
-                context_str = json.dumps(context_data, indent=2)
-                prompt_parts.append(f"\nAdditional context to reference if useful:\n{context_str}")
-
-            # Add recent conversation history for grounding without duplicating roles in the response
-            if conversation_history:
-                recent_history = conversation_history[-6:]
-                formatted_history = []
-                for msg in recent_history:
-                    content = msg.get("content", "")
-                    if not content:
-                        continue
-                    role = msg.get("role", "user")
-                    if role == "assistant":
-                        formatted_history.append(f"Assistant: {content}")
-                    else:
-                        formatted_history.append(f"User: {content}")
-                if formatted_history:
-                    history_block = "\n".join(formatted_history)
-                    prompt_parts.append(f"\nConversation context (most recent last):\n{history_block}")
-
-            # Add current message and explicit instruction for the reply format
-            prompt_parts.append(
-                f"\nLatest user question:\n{message}\n\nReply with one helpful assistant response in plain text, without adding role prefixes or follow-up questions unless the user explicitly asks for them.\n"
-            )
-
-            full_prompt = "".join(prompt_parts)
+            # Build the prompt within the token budget (older turns and extra context are compacted)
+            prompt = self._prompt_builder.build(self.general_prompt, message, conversation_history, context_data)
+            full_prompt = prompt.text
+            logger.info(f"🧮 Watsonx prompt budget: {prompt.stats()}")
             
             payload = {
                 "model_id": self.watsonx_model_id,
@@ -354,7 +612,7 @@ class WatsonHybridService:
             logger.info(f"📡 Watsonx Endpoint: {endpoint}")
             logger.info(f"📦 Watsonx Payload (prompt preview): {full_prompt[:200]}...")
             
-            response = requests.post(endpoint, headers=headers, json=payload, params=params, timeout=30)
+            response = await self._post(endpoint, headers=headers, json=payload, params=params, backend="watsonx")
             
             logger.info(f"📥 Watsonx Response status: {response.status_code}")
             
@@ -371,6 +629,9 @@ class WatsonHybridService:
                 logger.error(f"   Full error: {error_text}")
                 logger.error(f"   💡 This usually means the API key's service ID is not a member of the watsonx project.")
                 logger.error(f"   💡 Solution: Add the service ID to your watsonx project members in IBM Cloud.")
+            elif response.status_code == 401:
+                self.invalidate_iam_token("watsonx")
+                logger.warning(f"⚠️  Watsonx rejected the access token: {response.text[:200]}")
             else:
                 logger.warning(f"⚠️  Watsonx returned {response.status_code}: {response.text[:200]}")
             
@@ -433,15 +694,18 @@ class WatsonHybridService:
             logger.error(f"Failed to normalize listing payload: {exc}")
             return None
 
-    def generate_structured_listing(self, raw_message: str) -> Optional[Dict[str, Any]]:
+    async def generate_structured_listing(self, raw_message: str) -> Optional[Dict[str, Any]]:
         if not self.watsonx_enabled:
             logger.info("Watsonx disabled - cannot parse structured listing")
             return None
+        if not self.backend_available("watsonx"):
+            logger.info("Watsonx circuit open - skipping structured listing parse")
+            return None
 
         logger.info("🧾 Invoking watsonx structured listing extractor")
         logger.info(f"📝 Raw message snippet: {raw_message[:]}")
 
-        token = self.get_iam_token(service="watsonx")
+        token = await self.get_iam_token(service="watsonx")
         if not token:
             logger.warning("Unable to obtain Watsonx token for structured listing call")
             return None
@@ -473,14 +737,16 @@ class WatsonHybridService:
         }
 
         try:
-            response = requests.post(
+            response = await self._post(
                 endpoint,
                 headers=headers,
                 json=payload,
                 params={"version": "2023-05-29"},
-                timeout=30,
+                backend="watsonx",
             )
             if response.status_code != 200:
+                if response.status_code == 401:
+                    self.invalidate_iam_token("watsonx")
                 logger.warning(
                     "Watsonx structured listing call failed: %s - %s",
                     response.status_code,
@@ -524,7 +790,47 @@ class WatsonHybridService:
             logger.exception("Error generating structured listing: %s", exc)
             return None
 
-    def generate_response(
+    def _cacheable(self, message: str, conversation_history: Optional[List[Dict]]) -> bool:
+        if self._response_cache is None:
+            return False
+        # Any turn with history may depend on that conversation ("tell me more about that
+        # listing"), and the cache is shared between users, so only first turns are cached
+        return not conversation_history
+
+    async def generate_response(
+        self,
+        message: str,
+        conversation_history: List[Dict] = None,
+        context_data: Optional[Dict] = None,
+        user_role: Optional[str] = None
+    ) -> str:
+        """
+        Generate a response, serving repeated questions from the response cache
+        without any IAM or model call.
+        """
+        cacheable = self._cacheable(message, conversation_history)
+        if cacheable:
+            cached = self._response_cache.get(message, context_data, user_role)
+            if cached:
+                logger.info("⚡ Serving cached Watson response")
+                return cached
+
+        # Identical questions arriving together (e.g. a suggestion chip) share one backend call
+        key = normalize_key(
+            "generate",
+            message,
+            context_fingerprint(context_data),
+            context_fingerprint({"history": conversation_history or []}),
+            user_role,
+        )
+        response = await self._flight.do(
+            key, self._generate_from_backends, message, conversation_history, context_data, user_role
+        )
+        if response and cacheable:
+            self._response_cache.set(message, context_data, user_role, response)
+        return response
+
+    async def _generate_from_backends(
         self,
         message: str,
         conversation_history: List[Dict] = None,
@@ -552,13 +858,20 @@ class WatsonHybridService:
             agent_override = self.seller_agent_id
             logger.info("🔁 Switching to seller-specific Orchestrate agent")
         
+        # Backends whose circuit is open are skipped without a network call
+        orchestrate_ready = self.backend_available("orchestrate")
+        watsonx_ready = self.backend_available("watsonx")
+
+        if is_data_query and orchestrate_ready and watsonx_ready and self.hedge_enabled:
+            return await self._hedged_generate(message, conversation_history, context_data, agent_override)
+
         # Try Orchestrate Agent for data queries
-        if is_data_query and self.orchestrate_enabled:
+        if is_data_query and orchestrate_ready:
             logger.info("🔍 Trying Watson Orchestrate Agent first...")
             # Get token using orchestrate API key
-            token = self.get_iam_token(service="orchestrate")
+            token = await self.get_iam_token(service="orchestrate")
             if token:
-                response = self.call_orchestrate_agent(message, token, agent_id=agent_override)
+                response = await self.call_orchestrate_agent(message, token, agent_id=agent_override)
                 if response:
                     logger.info("✅ Got response from Orchestrate Agent")
                     return response
@@ -567,12 +880,12 @@ class WatsonHybridService:
                 logger.warning("⚠️  Could not get authentication token for Orchestrate")
         
         # Try Watsonx for general queries or fallback
-        if self.watsonx_enabled:
+        if watsonx_ready:
             logger.info("🔍 Trying Watsonx.ai...")
             # Get token using watsonx API key (CRITICAL: must use watsonx API key, not orchestrate)
-            token = self.get_iam_token(service="watsonx")
+            token = await self.get_iam_token(service="watsonx")
             if token:
-                response = self.call_watsonx(message, conversation_history or [], context_data, token)
+                response = await self.call_watsonx(message, conversation_history or [], context_data, token)
                 if response:
                     logger.info("✅ Got response from Watsonx")
                     return response
@@ -584,6 +897,261 @@ class WatsonHybridService:
         logger.warning("❌ Both services failed")
         return None
 
+    def prefetch_tokens(self, message: str):
+        """
+        Start fetching the IAM tokens this message may need without waiting for them,
+        so a cold or expiring token is requested while the caller gathers context.
+        Later get_iam_token calls join the same in-flight request.
+        """
+        services = []
+        if self.backend_available("orchestrate") and self.is_data_query(message):
+            services.append("orchestrate")
+        if self.backend_available("watsonx"):
+            services.append("watsonx")
+        if not services:
+            return
+
+        prefetch = asyncio.gather(*(self.get_iam_token(service=service) for service in services), return_exceptions=True)
+        self._background_tasks.add(prefetch)
+        prefetch.add_done_callback(self._background_tasks.discard)
+
+    async def _orchestrate_answer(
+        self,
+        message: str,
+        agent_id: Optional[str],
+        first_token: Optional[asyncio.Event] = None
+    ) -> Optional[str]:
+        try:
+            token = await self.get_iam_token(service="orchestrate")
+            if not token:
+                logger.warning("⚠️  Could not get authentication token for Orchestrate")
+                return None
+            return await self.call_orchestrate_agent(message, token, agent_id=agent_id, first_token=first_token)
+        except Exception as e:
+            logger.error(f"Orchestrate request failed: {e}")
+            return None
+
+    async def _watsonx_answer(
+        self,
+        message: str,
+        conversation_history: Optional[List[Dict]],
+        context_data: Optional[Dict]
+    ) -> Optional[str]:
+        try:
+            token = await self.get_iam_token(service="watsonx")
+            if not token:
+                logger.warning("⚠️  Could not get authentication token for Watsonx")
+                return None
+            return await self.call_watsonx(message, conversation_history or [], context_data, token)
+        except Exception as e:
+            logger.error(f"Watsonx request failed: {e}")
+            return None
+
+    async def _hedged_generate(
+        self,
+        message: str,
+        conversation_history: Optional[List[Dict]],
+        context_data: Optional[Dict],
+        agent_id: Optional[str]
+    ) -> Optional[str]:
+        """
+        Orchestrate first; if it has not produced any text after ``hedge_delay``,
+        dispatch watsonx as well and keep whichever answers first. The loser is cancelled.
+        """
+        first_token = asyncio.Event()
+        orchestrate = asyncio.ensure_future(self._orchestrate_answer(message, agent_id, first_token))
+        watsonx = None
+        token_waiter = asyncio.ensure_future(first_token.wait())
+        try:
+            done, _ = await asyncio.wait(
+                {orchestrate, token_waiter}, timeout=self.hedge_delay, return_when=asyncio.FIRST_COMPLETED
+            )
+            if done:
+                # Orchestrate finished or is already talking: no hedge needed
+                response = await orchestrate
+                if response:
+                    logger.info("✅ Got response from Orchestrate Agent")
+                    return response
+                logger.info("⚠️  Orchestrate failed, falling back...")
+                response = await self._watsonx_answer(message, conversation_history, context_data)
+                if response:
+                    logger.info("✅ Got response from Watsonx")
+                    return response
+                logger.warning("❌ Both services failed")
+                return None
+
+            logger.info(f"⏱️  Orchestrate silent after {self.hedge_delay}s - dispatching Watsonx in parallel")
+            watsonx = asyncio.ensure_future(self._watsonx_answer(message, conversation_history, context_data))
+            pending = {orchestrate, watsonx}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    response = task.result()
+                    if response:
+                        winner = "Orchestrate Agent" if task is orchestrate else "Watsonx"
+                        logger.info(f"✅ Got response from {winner} (hedged)")
+                        return response
+            logger.warning("❌ Both services failed")
+            return None
+        finally:
+            for task in (token_waiter, orchestrate, watsonx):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def stream_response(
+        self,
+        message: str,
+        conversation_history: List[Dict] = None,
+        context_data: Optional[Dict] = None,
+        user_role: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streaming counterpart of generate_response, sharing its response cache.
+        """
+        cacheable = self._cacheable(message, conversation_history)
+        if cacheable:
+            cached = self._response_cache.get(message, context_data, user_role)
+            if cached:
+                logger.info("⚡ Serving cached Watson response")
+                yield cached
+                return
+
+        chunks = []
+        async for chunk in self._stream_from_backends(message, conversation_history, context_data, user_role):
+            chunks.append(chunk)
+            yield chunk
+
+        if chunks and cacheable:
+            self._response_cache.set(message, context_data, user_role, "".join(chunks))
+
+    async def _stream_from_backends(
+        self,
+        message: str,
+        conversation_history: List[Dict] = None,
+        context_data: Optional[Dict] = None,
+        user_role: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream from Orchestrate or watsonx.
+        Orchestrate deltas are forwarded as they arrive; watsonx answers arrive as one chunk.
+        Yields nothing if both services fail so the caller can fall back to rules.
+        """
+        is_data_query = self.is_data_query(message)
+        logger.info(f"🎯 Streaming query type: {'Data Query' if is_data_query else 'General Query'}")
+
+        agent_override = None
+        if user_role == "seller" and self.seller_agent_id:
+            agent_override = self.seller_agent_id
+
+        orchestrate_ready = self.backend_available("orchestrate")
+        watsonx_ready = self.backend_available("watsonx")
+
+        if is_data_query and orchestrate_ready and watsonx_ready and self.hedge_enabled:
+            stream = self._hedged_stream(message, conversation_history, context_data, agent_override)
+            try:
+                async for chunk in stream:
+                    yield chunk
+            finally:
+                # Stops the Orchestrate pump as soon as our consumer goes away
+                await stream.aclose()
+            return
+
+        if is_data_query and orchestrate_ready:
+            token = await self.get_iam_token(service="orchestrate")
+            if token:
+                produced = False
+                async for chunk in self.stream_orchestrate_agent(message, token, agent_id=agent_override):
+                    produced = True
+                    yield chunk
+                if produced:
+                    return
+                logger.info("⚠️  Orchestrate stream produced no text, falling back...")
+            else:
+                logger.warning("⚠️  Could not get authentication token for Orchestrate")
+
+        if watsonx_ready:
+            token = await self.get_iam_token(service="watsonx")
+            if token:
+                response = await self.call_watsonx(message, conversation_history or [], context_data, token)
+                if response:
+                    yield response
+                    return
+            else:
+                logger.warning("⚠️  Could not get authentication token for Watsonx")
+
+        logger.warning("❌ Both services failed")
+
+    async def _hedged_stream(
+        self,
+        message: str,
+        conversation_history: Optional[List[Dict]],
+        context_data: Optional[Dict],
+        agent_id: Optional[str]
+    ) -> AsyncIterator[str]:
+        """
+        Streaming hedge: Orchestrate deltas are forwarded once the first one arrives.
+        If none has arrived after ``hedge_delay``, watsonx is dispatched too and the
+        first backend to produce text wins; the other is cancelled.
+        The queue is bounded, so a slow client holds Orchestrate back instead of
+        buffering its whole answer.
+        """
+        chunks: asyncio.Queue = asyncio.Queue(maxsize=self.hedge_queue_size)
+
+        async def pump_orchestrate():
+            try:
+                token = await self.get_iam_token(service="orchestrate")
+                if token:
+                    async for chunk in self.stream_orchestrate_agent(message, token, agent_id=agent_id):
+                        await chunks.put(chunk)
+                else:
+                    logger.warning("⚠️  Could not get authentication token for Orchestrate")
+            except Exception as e:
+                logger.error(f"Orchestrate stream failed: {e}")
+            # End marker; not sent when cancelled, nobody is reading then
+            await chunks.put(None)
+
+        orchestrate = asyncio.ensure_future(pump_orchestrate())
+        next_chunk = asyncio.ensure_future(chunks.get())
+        watsonx = None
+        try:
+            done, _ = await asyncio.wait({next_chunk}, timeout=self.hedge_delay)
+            if not done:
+                logger.info(f"⏱️  Orchestrate silent after {self.hedge_delay}s - dispatching Watsonx in parallel")
+                watsonx = asyncio.ensure_future(self._watsonx_answer(message, conversation_history, context_data))
+                done, _ = await asyncio.wait({next_chunk, watsonx}, return_when=asyncio.FIRST_COMPLETED)
+                if next_chunk not in done:
+                    response = watsonx.result()
+                    if response:
+                        logger.info("✅ Got response from Watsonx (hedged)")
+                        yield response
+                        return
+
+            first = await next_chunk
+            if first is None:
+                # Orchestrate produced nothing: use (or wait for) watsonx
+                logger.info("⚠️  Orchestrate stream produced no text, falling back...")
+                if watsonx is None:
+                    watsonx = asyncio.ensure_future(self._watsonx_answer(message, conversation_history, context_data))
+                response = await watsonx
+                if response:
+                    yield response
+                else:
+                    logger.warning("❌ Both services failed")
+                return
+
+            if watsonx is not None and not watsonx.done():
+                watsonx.cancel()
+            yield first
+            while True:
+                chunk = await chunks.get()
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            for task in (next_chunk, orchestrate, watsonx):
+                if task is not None and not task.done():
+                    task.cancel()
+
 
 # Global service instance
 _watson_service = None
@@ -595,3 +1163,9 @@ def get_watson_service() -> WatsonHybridService:
         _watson_service = WatsonHybridService()
     return _watson_service
 
+
+async def close_watson_service():
+    """Release the shared Watson connection pool (application shutdown)"""
+    if _watson_service is not None:
+        await _watson_service.aclose()
+
@@ -5,9 +5,22 @@ from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from app.config import settings
-from app.utils.mock_storage import get_user_by_email
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.utils.mock_storage import TOKEN_CACHE, get_user_by_email
+from app.utils.password_hasher import PasswordHasher
+
+# min == max == default: a hash made with any other cost "needs update" and is re-hashed on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+PASSWORD_HASHER = PasswordHasher(
+    pwd_context,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
 
@@ -30,21 +43,39 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
+def resolve_token_user(token: str) -> Optional[Dict]:
+    """
+    Return the user a valid access token belongs to, or None. Verified tokens are cached
+    until they expire, so repeat requests skip the JWT decode and the users.json lookup.
+    """
+    user = TOKEN_CACHE.get(token)
+    if user is not None:
+        return user
+
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    email = payload.get("sub")
+    if email is None:
+        return None
+
+    user = get_user_by_email(email)
+    if user is None:
+        return None
+    expires_at = payload.get("exp")
+    if isinstance(expires_at, (int, float)):
+        TOKEN_CACHE.set(token, user, float(expires_at))
+    return user
+
+
 def get_current_user(token: str = Depends(oauth2_scheme)) -> Dict:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    user = get_user_by_email(email)
+    user = resolve_token_user(token)
     if user is None:
         raise credentials_exception
     return user
@@ -0,0 +1,97 @@
+"""
+Pickled snapshot of the catalog (master data) file
+- Parsing the master JSON is the largest per-process startup cost after imports; a
+  pickle of the parsed document loads about twice as fast
+- The snapshot sits next to the JSON (``<name>.snapshot.pickle``) and records the
+  source file signature, so any edit of the JSON makes it stale and it is rebuilt on
+  the next load. Writes go through a temp file + rename, so concurrent workers never
+  read a half-written snapshot.
+- ``python -m app.utils.catalog_snapshot`` prebuilds it (e.g. in start.sh) so the
+  first request of every worker skips the JSON parse
+"""
+
+from pathlib import Path
+from typing import Any, Optional, Union
+import json
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+from app.utils.file_signature import FileSignature, file_signature
+from app.utils.metrics import observe_storage
+
+logger = logging.getLogger(__name__)
+
+# Bump when the pickled layout changes
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snapshot.pickle"
+
+def snapshot_path(json_path: Union[str, Path]) -> Path:
+    json_path = Path(json_path)
+    return json_path.with_name(json_path.stem + SNAPSHOT_SUFFIX)
+
+
+def _read_snapshot(path: Path, signature: FileSignature) -> Optional[Any]:
+    started = time.perf_counter()
+    try:
+        with open(path, "rb") as f:
+            version, source_signature, data = pickle.load(f)
+            size = os.fstat(f.fileno()).st_size
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"⚠️  Ignoring unreadable catalog snapshot {path.name}: {e}")
+        return None
+    if version != SNAPSHOT_VERSION or tuple(source_signature) != signature:
+        return None
+    observe_storage("load", path, time.perf_counter() - started, size)
+    return data
+
+
+def _write_snapshot(path: Path, signature: FileSignature, data: Any):
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((SNAPSHOT_VERSION, tuple(signature), data), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except OSError as e:
+        # A read-only checkout still works, it just parses the JSON every time
+        logger.warning(f"⚠️  Could not write catalog snapshot {path.name}: {e}")
+
+
+def load_catalog(json_path: Union[str, Path]) -> Any:
+    """
+    Parsed contents of ``json_path``, from its snapshot when that is current; otherwise
+    the JSON is parsed and the snapshot rewritten. Raises like json.load for a missing
+    or malformed file.
+    """
+    json_path = Path(json_path)
+    signature = file_signature(json_path)
+    if signature is None:
+        raise FileNotFoundError(f"No such file: '{json_path}'")
+    path = snapshot_path(json_path)
+    data = _read_snapshot(path, signature)
+    if data is not None:
+        return data
+
+    started = time.perf_counter()
+    with open(json_path, "r") as f:
+        data = json.load(f)
+    observe_storage("load", json_path, time.perf_counter() - started, signature.size)
+    _write_snapshot(path, signature, data)
+    return data
+
+
+if __name__ == "__main__":
+    from app.utils.mock_storage import MASTER_DATA_FILE
+
+    for target in sys.argv[1:] or [MASTER_DATA_FILE]:
+        load_catalog(target)
+        print(f"✅ Catalog snapshot ready: {snapshot_path(target)}")
@@ -0,0 +1,24 @@
+"""
+File signatures for change detection
+Indexes and caches built from a JSON file remember the file's (inode, mtime, size)
+and rebuild when it no longer matches. JSONStorage.save replaces files by rename, so
+every save gets a new inode even when mtime and size happen to stay the same.
+"""
+
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+
+class FileSignature(NamedTuple):
+    inode: int
+    mtime_ns: int
+    size: int
+
+
+def file_signature(path: Path) -> Optional[FileSignature]:
+    """Signature of ``path``, or None when the file does not exist"""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return FileSignature(stat.st_ino, stat.st_mtime_ns, stat.st_size)
@@ -3,16 +3,33 @@ JSON-based file storage for all application data
 Replaces SQLAlchemy database with simple JSON files
 """
 import json
+import logging
 import os
+import tempfile
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, TextIO
 from datetime import datetime
+from app.config import settings
+from app.models.records import AuctionRecord, BidRecord, Record
 from app.models.user import UserRole
+from app.utils.catalog_snapshot import load_catalog
+from app.utils.metrics import observe_storage
+from app.utils.storage_index import CollectionIndex, StorageIndex
+from app.utils.token_cache import TokenCache
 
+logger = logging.getLogger(__name__)
+
+# Users resolved from verified access tokens (see app.utils.auth)
+TOKEN_CACHE = TokenCache(
+    max_entries=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES,
+    max_ttl_seconds=settings.AUTH_TOKEN_CACHE_MAX_TTL_SECONDS,
+    # Another worker's update_user rewrites users.json; drop cached users when it changes
+    source=lambda: USERS_FILE,
+)
 
 # Base storage directory
 STORAGE_DIR = Path(__file__).resolve().parents[2] / "data"
-STORAGE_DIR.mkdir(exist_ok=True)
 
 # JSON file paths
 USERS_FILE = STORAGE_DIR / "users.json"
@@ -23,16 +40,35 @@ BIDS_FILE = STORAGE_DIR / "bids.json"
 SELLER_APPLICATIONS_FILE = STORAGE_DIR / "seller_applications.json"
 MASTER_DATA_FILE = Path(__file__).resolve().parents[2] / "mock_data" / "waste_streams_dashboard_data.json"
 # Master data helpers
+def iter_master_records(key: str, strict: bool = False) -> Iterator[Dict]:
+    """Stream one collection (e.g. waste_material_listings) from the master data file"""
+    return JSONStorage.iter_records(MASTER_DATA_FILE, key, strict=strict)
+
+
 def load_master_data() -> Dict:
     if not MASTER_DATA_FILE.exists():
         return {}
-    with open(MASTER_DATA_FILE, 'r') as f:
-        return json.load(f)
+    return load_catalog(MASTER_DATA_FILE)
 
 
 def save_master_data(data: Dict):
-    with open(MASTER_DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
+    JSONStorage.save(MASTER_DATA_FILE, data)
+
+
+def _file_mode(file_path: Path) -> int:
+    try:
+        return file_path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def _json_default(value: Any) -> Any:
+    # Records are written in their plain dict shape; anything else (datetimes, ...) as text
+    if isinstance(value, Record):
+        return value.to_dict()
+    return str(value)
 
 
 class JSONStorage:
@@ -44,16 +80,37 @@ class JSONStorage:
         if not file_path.exists():
             return []
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            return JSONStorage.load_json(file_path)
         except (json.JSONDecodeError, FileNotFoundError):
             return []
-    
+
+    @staticmethod
+    def load_json(file_path: Path) -> Any:
+        """Parse a JSON file, recording load time and size"""
+        started = time.perf_counter()
+        with open(file_path, 'r') as f:
+            data = json.load(f)
+            size = os.fstat(f.fileno()).st_size
+        observe_storage("load", file_path, time.perf_counter() - started, size)
+        return data
+
     @staticmethod
-    def save(file_path: Path, data: List[Dict]):
-        """Save data to JSON file"""
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+    def save(file_path: Path, data: Any):
+        """Save data to JSON file (temp file + rename, so readers never see a partial write)"""
+        started = time.perf_counter()
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=file_path.parent, prefix=file_path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2, default=_json_default)
+                size = f.tell()
+            # mkstemp creates 0600; keep the mode the JSON file had (or would get from open)
+            os.chmod(tmp_name, _file_mode(file_path))
+            os.replace(tmp_name, file_path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        observe_storage("save", file_path, time.perf_counter() - started, size)
     
     @staticmethod
     def get_next_id(data_list: List[Dict]) -> int:
@@ -62,6 +119,113 @@ class JSONStorage:
             return 1
         return max(item.get('id', 0) for item in data_list) + 1
 
+    @staticmethod
+    def iter_records(file_path: Path, key: Optional[str] = None, strict: bool = False) -> Iterator[Dict]:
+        """
+        Stream the records of a JSON array file one at a time (or of the array stored
+        under ``key`` in a top-level object) without loading the whole file.
+        A malformed file is logged and ends the stream; with ``strict`` the error is
+        re-raised instead, for callers that must not pass a partial stream off as complete.
+        """
+        if not file_path.exists():
+            return
+        try:
+            with open(file_path, 'r') as f:
+                yield from _JSONArrayStream(f).records(key)
+        except (json.JSONDecodeError, FileNotFoundError) as e:
+            logger.error(f"❌ Could not stream {file_path.name}: {e}")
+            if strict:
+                raise
+
+
+_JSON_DELIMITERS = frozenset(' \t\n\r,:]}')
+
+
+class _JSONArrayStream:
+    """Incremental reader over a JSON document using a bounded text buffer"""
+
+    def __init__(self, f: TextIO, chunk_size: int = 65536):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _read_more(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        # Drop what has already been consumed so the buffer stays bounded
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos].isspace():
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_more():
+                return ""
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self._buffer, self._pos)
+        self._pos += 1
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number cut by the chunk boundary ("12" of "123", "-0" of "-0.5") decodes too,
+                # so only accept a value once the character after it is a JSON delimiter
+                if self._eof or (end < len(self._buffer) and self._buffer[end] in _JSON_DELIMITERS):
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._read_more()
+
+    def _array(self) -> Iterator[Any]:
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise json.JSONDecodeError("Expecting ',' or ']'", self._buffer, self._pos - 1)
+
+    def records(self, key: Optional[str] = None) -> Iterator[Any]:
+        if key is None:
+            if self._peek() == '[':
+                yield from self._array()
+            return
+
+        if self._peek() != '{':
+            return
+        self._pos += 1
+        while self._peek() not in ('}', ''):
+            name = self._value()
+            self._expect(':')
+            if name == key and self._peek() == '[':
+                yield from self._array()
+                return
+            self._value()  # Other top-level values are decoded one at a time and dropped
+            if self._peek() == ',':
+                self._pos += 1
+
 
 # User storage
 def load_users() -> List[Dict]:
@@ -98,16 +262,23 @@ def create_user(user_data: Dict) -> Dict:
     }
     users.append(new_user)
     save_users(users)
+    STORAGE_INDEX["users"].record_created(new_user)
     return new_user
 
 def update_user(user_id: int, user_data: Dict) -> Optional[Dict]:
     """Update an existing user"""
     users = load_users()
-    for i, user in enumerate(users):
+    for user in users:
         if user.get('id') == user_id:
-            users[i] = {**user, **user_data, 'updated_at': datetime.now().isoformat()}
+            # Tokens are cached under the identity the user had before this update
+            previous_identity = {'email': user.get('email'), 'id': user_id}
+            user.update(user_data)
+            user['updated_at'] = datetime.now().isoformat()
             save_users(users)
-            return users[i]
+            STORAGE_INDEX["users"].record_updated(user)
+            # Tokens already verified for this user must see the new role / active flag
+            TOKEN_CACHE.invalidate_user(previous_identity)
+            return user
     return None
 
 
@@ -141,11 +312,12 @@ def create_listing(listing_data: Dict) -> Dict:
 def update_listing(listing_id: int, listing_data: Dict) -> Optional[Dict]:
     """Update an existing listing"""
     listings = load_listings()
-    for i, listing in enumerate(listings):
+    for listing in listings:
         if listing.get('id') == listing_id:
-            listings[i] = {**listing, **listing_data, 'updated_at': datetime.now().isoformat()}
+            listing.update(listing_data)
+            listing['updated_at'] = datetime.now().isoformat()
             save_listings(listings)
-            return listings[i]
+            return listing
     return None
 
 
@@ -158,6 +330,10 @@ def save_orders(orders: List[Dict]):
     """Save orders to JSON"""
     JSONStorage.save(ORDERS_FILE, orders)
 
+def iter_orders(strict: bool = False) -> Iterator[Dict]:
+    """Stream orders without loading the whole file"""
+    return JSONStorage.iter_records(ORDERS_FILE, strict=strict)
+
 def get_order_by_id(order_id: int) -> Optional[Dict]:
     """Get order by ID"""
     orders = load_orders()
@@ -179,6 +355,7 @@ def create_order(order_data: Dict) -> Dict:
     }
     orders.append(new_order)
     save_orders(orders)
+    STORAGE_INDEX["orders"].record_created(new_order)
     return new_order
 
 
@@ -252,6 +429,7 @@ def create_listing_from_application(seller_id: int, listing_payload: Dict) -> Di
 
     waste_listings.append(master_entry)
     save_master_data(master_data)
+    STORAGE_INDEX["listings"].record_created(master_entry)
 
     listing_record = {
         'id': next_id,
@@ -474,6 +652,14 @@ def save_auctions(auctions: List[Dict]):
     """Save auctions to JSON"""
     JSONStorage.save(AUCTIONS_FILE, auctions)
 
+def load_auction_records() -> List[AuctionRecord]:
+    """Load all auctions as compact records"""
+    return [AuctionRecord(auction) for auction in load_auctions()]
+
+def iter_auctions(strict: bool = False) -> Iterator[Dict]:
+    """Stream auctions without loading the whole file"""
+    return JSONStorage.iter_records(AUCTIONS_FILE, strict=strict)
+
 def get_auction_by_id(auction_id: int) -> Optional[Dict]:
     """Get auction by ID"""
     auctions = load_auctions()
@@ -495,16 +681,19 @@ def create_auction(auction_data: Dict) -> Dict:
     }
     auctions.append(new_auction)
     save_auctions(auctions)
+    STORAGE_INDEX["auctions"].record_created(new_auction)
     return new_auction
 
 def update_auction(auction_id: int, auction_data: Dict) -> Optional[Dict]:
     """Update an existing auction"""
     auctions = load_auctions()
-    for i, auction in enumerate(auctions):
+    for auction in auctions:
         if auction.get('id') == auction_id:
-            auctions[i] = {**auction, **auction_data, 'updated_at': datetime.now().isoformat()}
+            auction.update(auction_data)
+            auction['updated_at'] = datetime.now().isoformat()
             save_auctions(auctions)
-            return auctions[i]
+            STORAGE_INDEX["auctions"].record_updated(auction)
+            return auction
     return None
 
 
@@ -517,6 +706,14 @@ def save_bids(bids: List[Dict]):
     """Save bids to JSON"""
     JSONStorage.save(BIDS_FILE, bids)
 
+def load_bid_records() -> List[BidRecord]:
+    """Load all bids as compact records"""
+    return [BidRecord(bid) for bid in load_bids()]
+
+def iter_bids(strict: bool = False) -> Iterator[Dict]:
+    """Stream bids without loading the whole file"""
+    return JSONStorage.iter_records(BIDS_FILE, strict=strict)
+
 def get_bid_by_id(bid_id: int) -> Optional[Dict]:
     """Get bid by ID"""
     bids = load_bids()
@@ -546,3 +743,23 @@ def create_bid(bid_data: Dict) -> Dict:
     return new_bid
 
 
+# Aggregates and recency indexes for the admin console
+def _revenue(order: Dict) -> float:
+    return float(order.get('total_price') or 0) if order.get('status') == 'completed' else 0.0
+
+
+STORAGE_INDEX = StorageIndex()
+STORAGE_INDEX.register(CollectionIndex("users", lambda: USERS_FILE, load_users, "created_at"))
+STORAGE_INDEX.register(CollectionIndex(
+    "listings",
+    lambda: MASTER_DATA_FILE,
+    lambda: iter_master_records("waste_material_listings"),
+    "date_posted",
+))
+STORAGE_INDEX.register(CollectionIndex(
+    "orders", lambda: ORDERS_FILE, iter_orders, "created_at", counters={"revenue": _revenue}
+))
+STORAGE_INDEX.register(CollectionIndex(
+    "auctions", lambda: AUCTIONS_FILE, iter_auctions, "created_at",
+    counters={"active": lambda auction: 1 if auction.get('is_active') else 0},
+))
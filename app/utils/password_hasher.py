@@ -0,0 +1,132 @@
+"""
+Password hashing off the request threadpool
+- bcrypt hashes and verifications run on a small dedicated executor, so a login spike
+  queues behind its own workers instead of starving every sync endpoint
+- The queue is bounded: past it, callers get PasswordHasherBusy (503) immediately
+  rather than waiting an unbounded time
+- Queue depth, in-flight work and wait/run times are tracked for monitoring
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Optional, Tuple
+import asyncio
+import functools
+import logging
+import threading
+import time
+
+from passlib.context import CryptContext
+
+from app.services.circuit_breaker import percentile
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full"""
+
+
+def _rounded_ms(value: Optional[float]) -> Optional[float]:
+    return round(value * 1000, 2) if value is not None else None
+
+
+class PasswordHasher:
+    """Bounded executor for CryptContext hash/verify calls"""
+
+    def __init__(self, context: CryptContext, max_workers: int = 2, max_queue: int = 64, latency_window: int = 200):
+        self.context = context
+        self.max_workers = max(max_workers, 1)
+        self.max_queue = max(max_queue, 0)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.queued = 0  # Submitted, waiting for a worker
+        self.in_flight = 0  # Running on a worker
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self._wait_times: Deque[float] = deque(maxlen=latency_window)
+        self._run_times: Deque[float] = deque(maxlen=latency_window)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    def _run(self, submitted_at: float, fn: Callable, *args):
+        started_at = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.in_flight += 1
+            self._wait_times.append(started_at - submitted_at)
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self._run_times.append(time.perf_counter() - started_at)
+
+    async def _submit(self, fn: Callable, *args):
+        with self._lock:
+            # Up to max_workers jobs run, max_queue more wait; anything beyond fails fast
+            if self.queued + self.in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusy("Password hashing queue is full")
+            self.queued += 1
+        loop = asyncio.get_running_loop()
+        try:
+            call = functools.partial(self._run, time.perf_counter(), fn, *args)
+            return await loop.run_in_executor(self._get_executor(), call)
+        except RuntimeError:
+            # Executor already shut down: the job never ran
+            with self._lock:
+                self.queued -= 1
+            raise
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Check ``password`` against ``hashed_password``. Returns (valid, new_hash); new_hash is
+        set when the stored hash was made with outdated cost parameters and should be replaced.
+        """
+        if not hashed_password:
+            return False, None
+        try:
+            valid, new_hash = await self._submit(self.context.verify_and_update, password, hashed_password)
+        except ValueError:
+            # Unknown or malformed hash in storage
+            logger.warning("⚠️ Stored password hash could not be identified")
+            return False, None
+        if valid and new_hash:
+            with self._lock:
+                self.rehashed += 1
+        return valid, new_hash
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            wait_times = list(self._wait_times)
+            run_times = list(self._run_times)
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self.queued,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "wait_ms_p50": _rounded_ms(percentile(wait_times, 0.5)),
+                "wait_ms_p99": _rounded_ms(percentile(wait_times, 0.99)),
+                "run_ms_p50": _rounded_ms(percentile(run_times, 0.5)),
+                "run_ms_p99": _rounded_ms(percentile(run_times, 0.99)),
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
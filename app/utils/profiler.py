@@ -0,0 +1,136 @@
+"""
+Statistical request profiler
+- StackSampler snapshots thread stacks every few milliseconds while a request runs and
+  aggregates them as collapsed stacks ("outer;inner;leaf count"), the input format of
+  flamegraph.pl, speedscope and similar tools
+- Sampled threads are the event loop thread and any worker thread currently running
+  application code, so sync endpoints on the threadpool are covered too. Requests served
+  concurrently on the same threads show up in the same profile.
+- ProfileStore keeps the newest N profiles as files in one directory
+"""
+
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+import re
+import sys
+import threading
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = str(Path(__file__).resolve().parents[1])
+PROFILE_SUFFIX = ".collapsed"
+_PROFILE_ID = re.compile(r"^[\w.-]+$")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(APP_DIR):
+        filename = "app" + filename[len(APP_DIR):]
+    else:
+        filename = Path(filename).name
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _runs_app_code(frame) -> bool:
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(APP_DIR):
+            return True
+        frame = frame.f_back
+    return False
+
+
+class StackSampler:
+    """Background thread collecting collapsed stacks until stop()"""
+
+    def __init__(self, interval: float = 0.005, loop_thread_id: Optional[int] = None):
+        self.interval = interval
+        self.loop_thread_id = loop_thread_id if loop_thread_id is not None else threading.get_ident()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            if len(names) != threading.active_count():
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if thread_id != self.loop_thread_id and not _runs_app_code(frame):
+                    continue  # idle pool worker or unrelated thread
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+
+class ProfileStore:
+    """Directory of collapsed-stack files, newest first, pruned to max_files"""
+
+    def __init__(self, directory: Path, max_files: int = 100):
+        self.directory = Path(directory)
+        self.max_files = max_files
+
+    def new_id(self, method: str, path: str) -> str:
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        path_part = re.sub(r"[^\w]+", "_", path).strip("_")[:60] or "root"
+        return f"{stamp}-{method}-{path_part}"
+
+    def save(self, profile_id: str, stacks: Counter, duration: float, samples: int):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / f"{profile_id}{PROFILE_SUFFIX}", "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        logger.info(f"🔥 Saved profile {profile_id}: {samples} samples over {duration * 1000:.0f} ms")
+        self._prune()
+
+    def _files(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob(f"*{PROFILE_SUFFIX}"), reverse=True)
+
+    def _prune(self):
+        for path in self._files()[self.max_files:]:
+            path.unlink(missing_ok=True)
+
+    def list(self) -> List[Dict]:
+        profiles = []
+        for path in self._files():
+            stat = path.stat()
+            profiles.append({
+                "id": path.name[: -len(PROFILE_SUFFIX)],
+                "size_bytes": stat.st_size,
+                "created_at": datetime.utcfromtimestamp(stat.st_mtime).isoformat(),
+            })
+        return profiles
+
+    def path_for(self, profile_id: str) -> Optional[Path]:
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}{PROFILE_SUFFIX}"
+        return path if path.is_file() else None
+
+
+PROFILE_STORE = ProfileStore(Path(settings.PROFILING_DIR), max_files=settings.PROFILING_MAX_FILES)
@@ -0,0 +1,122 @@
+"""
+Streaming CSV / NDJSON record readers
+Request bodies are decoded chunk by chunk and turned into row dicts as soon as a full
+record has arrived, so uploads never need to be buffered whole.
+"""
+
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import codecs
+import csv
+import json
+
+CSV = "csv"
+NDJSON = "ndjson"
+
+Row = Tuple[int, Optional[Dict], Optional[str]]  # (row number, parsed row, parse error)
+
+
+def detect_format(content_type: Optional[str], explicit: Optional[str] = None) -> Optional[str]:
+    """Pick the record format from an explicit ``format`` value or the Content-Type header"""
+    if explicit:
+        explicit = explicit.lower()
+        if explicit in {"csv"}:
+            return CSV
+        if explicit in {"ndjson", "jsonl", "json-lines"}:
+            return NDJSON
+        return None
+    content_type = (content_type or "").lower()
+    if "csv" in content_type:
+        return CSV
+    if "ndjson" in content_type or "jsonl" in content_type or "json-seq" in content_type:
+        return NDJSON
+    return None
+
+
+class RecordTooLarge(ValueError):
+    """A single line grew past the configured limit without a newline"""
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_length: int = 1_000_000) -> AsyncIterator[str]:
+    """Decode UTF-8 byte chunks into lines (newline kept), tolerating split code points"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        pending += decoder.decode(chunk)
+        # Only "\n" ends a line; other separators (\u2028, \x0b) may be field content
+        end = pending.rfind("\n")
+        if end == -1:
+            if len(pending) > max_line_length:
+                raise RecordTooLarge(f"Line longer than {max_line_length} characters")
+            continue
+        complete, pending = pending[: end + 1], pending[end + 1:]
+        for line in complete.split("\n")[:-1]:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_csv_rows(chunks: AsyncIterator[bytes], max_record_length: int = 1_000_000) -> AsyncIterator[Row]:
+    """
+    Yield ``(row_number, row, error)`` for each CSV record after the header line.
+    Quoted fields may contain newlines: a record is complete once its quote count is even.
+    """
+    header: Optional[List[str]] = None
+    record: List[str] = []
+    record_length = 0
+    quotes = 0
+    row_number = 0
+
+    async for line in iter_lines(chunks, max_record_length):
+        record.append(line)
+        record_length += len(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            if record_length > max_record_length:
+                raise RecordTooLarge(f"CSV record longer than {max_record_length} characters (unbalanced quotes?)")
+            continue
+        text = "".join(record)
+        record, record_length, quotes = [], 0, 0
+        if not text.strip():
+            continue
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as exc:
+            row_number += 1
+            yield row_number, None, f"Malformed CSV: {exc}"
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row_number += 1
+        if len(values) > len(header):
+            yield row_number, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield row_number, dict(zip(header, values)), None
+
+    if record and "".join(record).strip():
+        yield row_number + 1, None, "Unterminated quoted field at end of upload"
+
+
+async def iter_ndjson_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[Row]:
+    """Yield ``(row_number, row, error)`` for each non-blank JSON line"""
+    row_number = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield row_number, None, f"Invalid JSON: {exc.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield row_number, None, "Each line must be a JSON object"
+            continue
+        yield row_number, row, None
+
+
+def iter_rows(fmt: str, chunks: AsyncIterator[bytes]) -> AsyncIterator[Row]:
+    return iter_csv_rows(chunks) if fmt == CSV else iter_ndjson_rows(chunks)
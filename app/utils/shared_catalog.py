@@ -0,0 +1,430 @@
+"""
+Shared-memory catalog for multi-worker deployments
+- The record collections of the master data file (waste listings, machinery, shutdown
+  machinery) are written once to a columnar binary file next to the JSON
+  (``<name>.catalog.bin``); every worker maps it read-only with mmap, so the pages are
+  shared through the OS page cache instead of each worker holding parsed dicts
+- Numeric and boolean fields are fixed-width arrays (int64 / float64 / uint8). Strings,
+  and values that do not fit a fixed width (lists, nested objects), live in one shared
+  blob addressed by an offsets table; identical strings are stored once
+- The remaining top-level sections (packages, summaries, ...) are kept as JSON text in
+  the blob and decoded on access
+- Each column carries a per-row state byte so absent keys, nulls and ints stored in a
+  float column round-trip exactly to the original JSON shape
+- When the JSON changes, the first process to notice rebuilds the file under a lock and
+  renames it into place; every process then maps the new file and swaps its reference.
+  Rows handed out earlier keep the old mapping alive until they are released.
+
+File layout: magic, uint64 header length, JSON header (tables, column offsets,
+documents, source signature), then 8-byte aligned column arrays and the string blob.
+"""
+
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+
+from app.utils.catalog_snapshot import load_catalog
+from app.utils.file_signature import FileSignature, file_signature
+
+try:
+    import fcntl
+except ImportError:  # Windows: builds are still atomic, just not deduplicated across workers
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"WMCATv1\n"
+CATALOG_SUFFIX = ".catalog.bin"
+# Record collections stored as columns; every other top-level key is a JSON document
+TABLES = ("waste_material_listings", "machinery_listings", "all_shutdown_machinery")
+
+# Per-row column state
+ABSENT, NULL, VALUE, INTEGRAL = 0, 1, 2, 3
+
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+_MISSING = object()
+
+def catalog_path(json_path: Union[str, Path]) -> Path:
+    json_path = Path(json_path)
+    return json_path.with_name(json_path.stem + CATALOG_SUFFIX)
+
+
+# ---------------------------------------------------------------------------
+# Building
+# ---------------------------------------------------------------------------
+
+def _column_kind(values: List[Any]) -> str:
+    present = [value for value in values if value is not _MISSING and value is not None]
+    if not present:
+        return "str"
+    if all(isinstance(value, bool) for value in present):
+        return "bool"
+    if all(type(value) is int and _INT64_MIN <= value <= _INT64_MAX for value in present):
+        return "int"
+    if all(type(value) in (int, float) for value in present):
+        # Ints too large for an exact float64 would be rounded
+        if all(type(value) is float or abs(value) <= 2 ** 53 for value in present):
+            return "num"
+    if all(isinstance(value, str) for value in present):
+        return "str"
+    return "json"
+
+
+class _Builder:
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.size = 0
+        self.blob = bytearray()
+        self._interned: Dict[bytes, Tuple[int, int]] = {}
+
+    def add_array(self, data: bytes) -> int:
+        padding = -self.size % 8
+        if padding:
+            self.chunks.append(b"\0" * padding)
+            self.size += padding
+        offset = self.size
+        self.chunks.append(data)
+        self.size += len(data)
+        return offset
+
+    def add_text(self, text: str) -> Tuple[int, int]:
+        encoded = text.encode("utf-8")
+        span = self._interned.get(encoded)
+        if span is None:
+            start = len(self.blob)
+            self.blob += encoded
+            span = self._interned[encoded] = (start, len(self.blob))
+        return span
+
+    def add_column(self, values: List[Any]) -> Dict:
+        kind = _column_kind(values)
+        states = bytearray(len(values))
+        if kind in ("str", "json"):
+            spans = [0] * (2 * len(values))
+        else:
+            fixed = [0] * len(values)
+
+        for row, value in enumerate(values):
+            if value is _MISSING:
+                continue
+            if value is None:
+                states[row] = NULL
+                continue
+            states[row] = VALUE
+            if kind == "str":
+                spans[2 * row], spans[2 * row + 1] = self.add_text(value)
+            elif kind == "json":
+                spans[2 * row], spans[2 * row + 1] = self.add_text(json.dumps(value, separators=(",", ":")))
+            elif kind == "num":
+                if type(value) is int:
+                    states[row] = INTEGRAL
+                fixed[row] = float(value)
+            else:
+                fixed[row] = int(value)
+
+        column = {"kind": kind, "state": self.add_array(bytes(states))}
+        if kind in ("str", "json"):
+            column["data"] = self.add_array(struct.pack(f"<{len(spans)}q", *spans))
+        elif kind == "num":
+            column["data"] = self.add_array(struct.pack(f"<{len(fixed)}d", *fixed))
+        elif kind == "int":
+            column["data"] = self.add_array(struct.pack(f"<{len(fixed)}q", *fixed))
+        else:
+            column["data"] = self.add_array(bytes(fixed))
+        return column
+
+
+def build_catalog_bytes(master_data: Dict, signature: Optional[FileSignature]) -> bytes:
+    """Serialize master data into the shared catalog format"""
+    builder = _Builder()
+    tables = {}
+    for name in TABLES:
+        records = [record for record in master_data.get(name) or [] if isinstance(record, dict)]
+        names = list(dict.fromkeys(key for record in records for key in record))
+        tables[name] = {
+            "rows": len(records),
+            "columns": {
+                key: builder.add_column([record.get(key, _MISSING) for record in records])
+                for key in names
+            },
+        }
+    documents = {
+        key: builder.add_text(json.dumps(value, separators=(",", ":")))
+        for key, value in master_data.items()
+        if key not in TABLES
+    }
+    blob_offset = builder.add_array(bytes(builder.blob))
+    header = {
+        "source": list(signature) if signature else None,
+        "tables": tables,
+        "documents": documents,
+        "blob": [blob_offset, len(builder.blob)],
+    }
+
+    encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    prefix = MAGIC + struct.pack("<Q", len(encoded)) + encoded
+    prefix += b"\0" * (-len(prefix) % 8)
+    # Array offsets are relative to the end of the header
+    return prefix + b"".join(builder.chunks)
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+class _Column:
+    __slots__ = ("kind", "states", "data", "blob")
+
+    def __init__(self, kind: str, states: memoryview, data: memoryview, blob: memoryview):
+        self.kind = kind
+        self.states = states
+        self.data = data
+        self.blob = blob
+
+    def get(self, row: int, default: Any = _MISSING) -> Any:
+        state = self.states[row]
+        if state == ABSENT:
+            return default
+        if state == NULL:
+            return None
+        kind = self.kind
+        if kind == "str":
+            return str(self.blob[self.data[2 * row]:self.data[2 * row + 1]], "utf-8")
+        if kind == "json":
+            return json.loads(str(self.blob[self.data[2 * row]:self.data[2 * row + 1]], "utf-8"))
+        if kind == "bool":
+            return bool(self.data[row])
+        if kind == "num" and state == INTEGRAL:
+            return int(self.data[row])
+        return self.data[row]
+
+
+class CatalogRow(Mapping):
+    """Read-only view of one record; values are decoded from the mapping on access"""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "CatalogTable", row: int):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        column = self._table.columns.get(key)
+        value = _MISSING if column is None else column.get(self._row)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        column = self._table.columns.get(key)
+        return default if column is None else column.get(self._row, default)
+
+    def __iter__(self) -> Iterator[str]:
+        row = self._row
+        return (name for name, column in self._table.columns.items() if column.states[row] != ABSENT)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def items(self):
+        return self.to_dict().items()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize as a plain dict, e.g. for a response body"""
+        row = self._row
+        record = {}
+        for name, column in self._table.columns.items():
+            value = column.get(row)
+            if value is not _MISSING:
+                record[name] = value
+        return record
+
+    def __repr__(self) -> str:
+        return f"CatalogRow({self.to_dict()!r})"
+
+
+class CatalogTable:
+    """One record collection; indexing and iteration yield CatalogRow views"""
+
+    def __init__(self, name: str, rows: int, columns: Dict[str, _Column]):
+        self.name = name
+        self.rows = rows
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __iter__(self) -> Iterator[CatalogRow]:
+        return (CatalogRow(self, row) for row in range(self.rows))
+
+    def __getitem__(self, row: Union[int, slice]) -> Union[CatalogRow, List[CatalogRow]]:
+        if isinstance(row, slice):
+            return [CatalogRow(self, index) for index in range(*row.indices(self.rows))]
+        if row < 0:
+            row += self.rows
+        if not 0 <= row < self.rows:
+            raise IndexError(row)
+        return CatalogRow(self, row)
+
+    def find(self, key: str, value: Any) -> Optional[CatalogRow]:
+        """First row whose ``key`` equals ``value``"""
+        column = self.columns.get(key)
+        if column is None:
+            return None
+        for row in range(self.rows):
+            if column.get(row, None) == value:
+                return CatalogRow(self, row)
+        return None
+
+
+class CatalogMap:
+    """A read-only mapping of one catalog file"""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path.name} is not a catalog file")
+        (header_length,) = struct.unpack_from("<Q", view, len(MAGIC))
+        header_end = len(MAGIC) + 8 + header_length
+        header = json.loads(str(view[len(MAGIC) + 8:header_end], "utf-8"))
+        base = header_end + (-header_end % 8)
+
+        self.path = path
+        self.source: Optional[FileSignature] = tuple(header["source"]) if header["source"] else None
+        blob_offset, blob_size = header["blob"]
+        self._blob = view[base + blob_offset:base + blob_offset + blob_size]
+        self._documents = header["documents"]
+        self.tables: Dict[str, CatalogTable] = {}
+        for name, table in header["tables"].items():
+            rows = table["rows"]
+            columns = {}
+            for key, column in table["columns"].items():
+                kind = column["kind"]
+                states = view[base + column["state"]:base + column["state"] + rows]
+                if kind in ("str", "json", "int"):
+                    width, code = (16, "q") if kind != "int" else (8, "q")
+                elif kind == "num":
+                    width, code = 8, "d"
+                else:
+                    width, code = 1, "B"
+                data = view[base + column["data"]:base + column["data"] + rows * width].cast(code)
+                columns[key] = _Column(kind, states, data, self._blob)
+            self.tables[name] = CatalogTable(name, rows, columns)
+
+    def table(self, name: str) -> CatalogTable:
+        return self.tables.get(name) or CatalogTable(name, 0, {})
+
+    def document(self, key: str, default: Any = None) -> Any:
+        """Decode one of the non-tabular top-level sections"""
+        span = self._documents.get(key)
+        if span is None:
+            return default
+        return json.loads(str(self._blob[span[0]:span[1]], "utf-8"))
+
+
+# ---------------------------------------------------------------------------
+# Process-wide access
+# ---------------------------------------------------------------------------
+
+class SharedCatalog:
+    """Keeps the current CatalogMap for one JSON source, rebuilding it when the source changes"""
+
+    def __init__(self, source: Path, path: Optional[Path] = None):
+        self.source = Path(source)
+        self.path = Path(path) if path else catalog_path(self.source)
+        self._lock = threading.Lock()
+        self._current: Optional[CatalogMap] = None
+        self.builds = 0
+        self.swaps = 0
+
+    def current(self) -> CatalogMap:
+        """The mapping matching the source file as it is now"""
+        signature = file_signature(self.source)
+        current = self._current
+        if current is not None and current.source == signature:
+            return current
+        with self._lock:
+            current = self._current
+            if current is None or current.source != signature:
+                current = self._refresh(signature)
+                # Readers holding the previous map keep using it until they finish
+                self._current = current
+                self.swaps += 1
+            return current
+
+    def _map_if_current(self, signature: Optional[FileSignature]) -> Optional[CatalogMap]:
+        try:
+            mapped = CatalogMap(self.path)
+        except (FileNotFoundError, ValueError, KeyError, struct.error) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"⚠️  Ignoring unreadable catalog {self.path.name}: {e}")
+            return None
+        return mapped if mapped.source == signature else None
+
+    def _refresh(self, signature: Optional[FileSignature]) -> CatalogMap:
+        # Another worker may already have built the file for this source version
+        mapped = self._map_if_current(signature)
+        if mapped is not None:
+            return mapped
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(self.path.name + ".lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                mapped = self._map_if_current(signature)
+                if mapped is None:
+                    self._build(signature)
+                    mapped = CatalogMap(self.path)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return mapped
+
+    def _build(self, signature: Optional[FileSignature]):
+        master_data = load_catalog(self.source) if signature is not None else {}
+        data = build_catalog_bytes(master_data, signature)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        self.builds += 1
+        logger.info(f"🗂️  Built shared catalog {self.path.name} ({len(data) / 1024:.0f} KiB)")
+
+
+_shared_catalogs: Dict[Path, SharedCatalog] = {}
+_shared_catalogs_lock = threading.Lock()
+
+
+def get_shared_catalog(source: Union[str, Path]) -> SharedCatalog:
+    """Get or create the process-wide SharedCatalog for a master data file"""
+    source = Path(source)
+    with _shared_catalogs_lock:
+        catalog = _shared_catalogs.get(source)
+        if catalog is None:
+            catalog = _shared_catalogs[source] = SharedCatalog(source)
+        return catalog
+
+
+if __name__ == "__main__":
+    import sys
+
+    from app.utils.mock_storage import MASTER_DATA_FILE
+
+    for target in sys.argv[1:] or [MASTER_DATA_FILE]:
+        mapped = get_shared_catalog(target).current()
+        sizes = ", ".join(f"{name}={len(table)}" for name, table in mapped.tables.items())
+        print(f"✅ Shared catalog ready: {mapped.path} ({sizes})")
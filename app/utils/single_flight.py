@@ -0,0 +1,64 @@
+"""
+Request coalescing (single-flight)
+Concurrent callers asking for the same key share one in-flight computation and all
+receive its result. Nothing is cached: once the computation finishes, the next call
+with that key starts a fresh one.
+
+Results are shared objects - callers must treat them as read-only.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import asyncio
+import inspect
+
+
+def normalize_key(*parts: Any) -> tuple:
+    """Build a coalescing key; strings are lower-cased with whitespace collapsed"""
+    normalized = []
+    for part in parts:
+        if isinstance(part, str):
+            part = " ".join(part.lower().split())
+        normalized.append(part)
+    return tuple(normalized)
+
+
+class SingleFlight:
+    """Per-key deduplication of concurrent async work"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0  # Computations actually started
+        self.followers = 0  # Callers that joined one already in flight
+
+    async def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run ``fn(*args, **kwargs)`` once per key at a time. Coroutine functions are
+        awaited; plain functions run in a worker thread so file parsing stays off the loop.
+        """
+        loop = asyncio.get_running_loop()
+        call = self._calls.get(key)
+        if call is not None and not call.done() and call.get_loop() is loop:
+            self.followers += 1
+            # Shielded so one caller disconnecting does not cancel the work for the others
+            return await asyncio.shield(call)
+
+        if inspect.iscoroutinefunction(fn):
+            work: Awaitable = fn(*args, **kwargs)
+        else:
+            work = asyncio.to_thread(fn, *args, **kwargs)
+
+        call = asyncio.ensure_future(work)
+        self._calls[key] = call
+        self.leaders += 1
+        call.add_done_callback(lambda finished: self._forget(key, finished))
+        return await asyncio.shield(call)
+
+    def _forget(self, key: Hashable, call: asyncio.Future):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Mark the exception as retrieved when every caller has gone away
+        if not call.cancelled():
+            call.exception()
+
+    def in_flight(self) -> int:
+        return len(self._calls)
@@ -0,0 +1,165 @@
+"""
+In-memory aggregates over the JSON storage files
+- Per-collection counters (record count, active auctions, completed revenue, ...) kept
+  up to date incrementally as records are created, updated or deleted
+- A created_at-ordered index per collection for "most recent" queries
+- If a file is rewritten by a path that does not report its changes, the file's
+  (inode, mtime, size) signature no longer matches and that collection is rebuilt once
+"""
+
+from bisect import bisect_left, insort
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+import threading
+
+from app.utils.file_signature import FileSignature, file_signature
+
+logger = logging.getLogger(__name__)
+
+Record = Dict[str, Any]
+
+
+class CollectionIndex:
+    """Counters and a recency index for one collection"""
+
+    def __init__(
+        self,
+        name: str,
+        path: Callable[[], Path],
+        loader: Callable[[], Iterable[Record]],
+        created_field: str,
+        counters: Optional[Dict[str, Callable[[Record], float]]] = None,
+    ):
+        self.name = name
+        self._path = path
+        self._loader = loader
+        self._created_field = created_field
+        self._counter_fns = {"total": lambda record: 1, **(counters or {})}
+        self._lock = threading.RLock()
+        self._signature: Optional[FileSignature] = None
+        self._built = False
+        self._records: Dict[Any, Record] = {}  # id -> record, in storage order
+        self._by_created: List[Tuple[str, Any]] = []  # (created_at, id), ascending
+        self.counters: Dict[str, float] = {}
+        self.rebuilds = 0
+
+    def _created_key(self, record: Record) -> Tuple[str, Any]:
+        record_id = record.get("id")
+        # Mixed id types (int/str) must still compare inside the sorted index
+        return (str(record.get(self._created_field) or ""), (str(type(record_id).__name__), record_id))
+
+    def _rebuild(self):
+        self._records = {}
+        self._by_created = []
+        self.counters = {name: 0 for name in self._counter_fns}
+        for record in self._loader():
+            self._add(record)
+        self._by_created.sort()
+        self._signature = file_signature(self._path())
+        self._built = True
+        self.rebuilds += 1
+        logger.info(f"📇 Storage index rebuilt for {self.name}: {len(self._records)} records")
+
+    def _add(self, record: Record, keep_sorted: bool = False):
+        self._records[record.get("id")] = record
+        key = self._created_key(record)
+        if keep_sorted:
+            insort(self._by_created, key)
+        else:
+            self._by_created.append(key)
+        for name, fn in self._counter_fns.items():
+            self.counters[name] += fn(record)
+
+    def _remove(self, record_id: Any) -> Optional[Record]:
+        record = self._records.pop(record_id, None)
+        if record is None:
+            return None
+        key = self._created_key(record)
+        position = bisect_left(self._by_created, key)
+        if position < len(self._by_created) and self._by_created[position] == key:
+            del self._by_created[position]
+        for name, fn in self._counter_fns.items():
+            self.counters[name] -= fn(record)
+        return record
+
+    def ensure_current(self):
+        signature = file_signature(self._path())
+        if self._built and signature == self._signature:
+            return
+        with self._lock:
+            if not self._built or file_signature(self._path()) != self._signature:
+                self._rebuild()
+
+    def _applied(self):
+        # The write that was just reported is now the state this index reflects
+        self._signature = file_signature(self._path())
+
+    # Change notifications from the storage layer
+
+    def record_created(self, record: Record):
+        with self._lock:
+            if not self._built:
+                return  # The first read builds everything from the file anyway
+            self._remove(record.get("id"))
+            self._add(record, keep_sorted=True)
+            self._applied()
+
+    def record_updated(self, record: Record):
+        self.record_created(record)
+
+    def records_created(self, records: Iterable[Record]):
+        with self._lock:
+            if not self._built:
+                return
+            for record in records:
+                self._remove(record.get("id"))
+                self._add(record, keep_sorted=True)
+            self._applied()
+
+    def record_deleted(self, record_id: Any):
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(record_id)
+            self._applied()
+
+    # Queries
+
+    def counter(self, name: str) -> float:
+        self.ensure_current()
+        return self.counters.get(name, 0)
+
+    def count(self) -> int:
+        return int(self.counter("total"))
+
+    def recent(self, limit: int = 5) -> List[Record]:
+        """Newest records first (by the created-at field, ties broken by id)"""
+        self.ensure_current()
+        with self._lock:
+            keys = self._by_created[-limit:] if limit > 0 else []
+            return [self._records[key[1][1]] for key in reversed(keys)]
+
+    def page(self, skip: int = 0, limit: int = 100) -> List[Record]:
+        """Records in storage order"""
+        self.ensure_current()
+        with self._lock:
+            return list(islice(self._records.values(), skip, skip + limit))
+
+    def get(self, record_id: Any) -> Optional[Record]:
+        self.ensure_current()
+        return self._records.get(record_id)
+
+
+class StorageIndex:
+    """Registry of collection indexes"""
+
+    def __init__(self):
+        self._collections: Dict[str, CollectionIndex] = {}
+
+    def register(self, collection: CollectionIndex):
+        self._collections[collection.name] = collection
+
+    def __getitem__(self, name: str) -> CollectionIndex:
+        return self._collections[name]
@@ -0,0 +1,121 @@
+"""
+Verified-token cache
+Maps a SHA-256 of an access token to the user it resolved to, so authenticated
+requests skip the JWT decode and the users.json lookup. Entries live until the
+token's exp (optionally capped), are LRU-bounded, and are dropped when the user
+they belong to is updated.
+With a ``source`` file (users.json) the whole cache is also dropped whenever that
+file's signature changes, so an update made by another worker process is seen on
+the next request instead of after the TTL.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+import hashlib
+import threading
+import time
+
+from app.utils.file_signature import FileSignature, file_signature
+
+
+def _token_key(token: str) -> str:
+    # Raw tokens are never kept in memory longer than the request
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """LRU cache of token hash -> (user, expires_at)"""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_ttl_seconds: float = 0,
+        source: Optional[Callable[[], Path]] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_ttl_seconds = max_ttl_seconds
+        self._source = source
+        self._signature: Optional[FileSignature] = None
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Dict, float]]" = OrderedDict()
+        self._by_user: Dict[str, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _user_key(user: Dict) -> str:
+        return str(user.get("email") or user.get("id"))
+
+    def _source_signature(self) -> Optional[FileSignature]:
+        return file_signature(self._source()) if self._source is not None else None
+
+    def _sync_source(self, signature: Optional[FileSignature]) -> bool:
+        """Drop everything if the source file changed; True when it was unchanged"""
+        if signature == self._signature:
+            return True
+        self._entries.clear()
+        self._by_user.clear()
+        self._signature = signature
+        return False
+
+    def get(self, token: str) -> Optional[Dict]:
+        key = _token_key(token)
+        signature = self._source_signature()
+        with self._lock:
+            self._sync_source(signature)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            user, expires_at = entry
+            if expires_at <= time.time():
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return user
+
+    def set(self, token: str, user: Dict, expires_at: float):
+        if self.max_ttl_seconds:
+            expires_at = min(expires_at, time.time() + self.max_ttl_seconds)
+        if expires_at <= time.time() or self.max_entries <= 0:
+            return
+        key = _token_key(token)
+        signature = self._source_signature()
+        with self._lock:
+            if not self._sync_source(signature):
+                # The source changed since the get() that preceded this lookup, so
+                # ``user`` may come from the previous version of the file
+                return
+            self._drop(key)
+            self._entries[key] = (user, expires_at)
+            self._by_user.setdefault(self._user_key(user), set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_key = self._user_key(entry[0])
+        keys = self._by_user.get(user_key)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[user_key]
+
+    def invalidate_user(self, user: Dict):
+        """Forget every token resolved to ``user`` (after a role change, deactivation, ...)"""
+        with self._lock:
+            for key in list(self._by_user.get(self._user_key(user), ())):
+                self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
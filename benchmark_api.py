@@ -0,0 +1,439 @@
+"""
+API benchmark harness
+Generates synthetic datasets at multiples of mock_data/ and data/ (listings, machinery,
+orders, auctions, bids, users), then drives the hot endpoints in-process through the
+ASGI app and reports throughput, p50/p99 latency and peak RSS as JSON.
+
+Each scale runs in its own process against a temporary copy of the app, so the
+checked-in data is never touched and peak RSS is measured per scale. Watson is
+stubbed with a fixed latency; no network access or credentials are needed.
+
+Usage:
+    python benchmark_api.py                              # 1x, 10x, 100x, 1000x
+    python benchmark_api.py --scales 1 10 --requests 100 --output bench.json
+"""
+import argparse
+import asyncio
+import copy
+import itertools
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent
+MASTER_FILE = "waste_streams_dashboard_data.json"
+
+# Per scale unit, on top of the users already in data/users.json
+SELLERS_PER_UNIT = 10
+BUYERS_PER_UNIT = 10
+BIDS_PER_AUCTION = 3
+
+Request = Tuple[str, str, Dict[str, Any]]
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+
+def _load(path: Path) -> Any:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _dump(path: Path, data: Any):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, default=str)
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+def _jitter(rng: random.Random, value: Any, spread: float = 0.2) -> Any:
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return value
+    scaled = value * rng.uniform(1 - spread, 1 + spread)
+    return round(scaled, 2) if isinstance(value, float) else int(scaled)
+
+
+def _replicate_string_ids(records: List[Dict], scale: int, id_field: str, rng: random.Random) -> List[Dict]:
+    out = []
+    for replica in range(scale):
+        for record in records:
+            item = copy.deepcopy(record)
+            if replica:
+                item[id_field] = f"{record.get(id_field)}-{replica}"
+                item["views"] = _jitter(rng, item.get("views"))
+            out.append(item)
+    return out
+
+
+def build_dataset(root: Path, scale: int, seed: int = 42) -> Dict[str, Any]:
+    """Write a ``scale``-times copy of mock_data/ and data/ under ``root``; returns record counts"""
+    rng = random.Random(seed + scale)
+    now = datetime.now(timezone.utc)
+    mock_dir = root / "mock_data"
+    data_dir = root / "data"
+    shutil.copytree(REPO_ROOT / "mock_data", mock_dir)
+    data_dir.mkdir()
+
+    master = _load(REPO_ROOT / "mock_data" / MASTER_FILE)
+    stored_listings = _load(REPO_ROOT / "data" / "listings.json")
+    base_users = _load(REPO_ROOT / "data" / "users.json")
+    base_auctions = _load(REPO_ROOT / "data" / "auctions.json")
+    base_orders = _load(REPO_ROOT / "data" / "orders.json")
+
+    # Users: the checked-in ones plus generated sellers and buyers
+    users = list(base_users)
+    next_user_id = max((user.get("id", 0) for user in users), default=0) + 1
+    template_hash = base_users[0].get("hashed_password") if base_users else ""
+    sellers, buyers = [], []
+    for index in range(scale * (SELLERS_PER_UNIT + BUYERS_PER_UNIT)):
+        role = "seller" if index % 2 == 0 else "buyer"
+        user = {
+            "id": next_user_id,
+            "email": f"{role}{next_user_id}@bench.example.com",
+            "username": f"{role}{next_user_id}",
+            "hashed_password": template_hash,
+            "company_name": f"Bench {role.title()} {next_user_id}",
+            "role": role,
+            "is_active": True,
+            "created_at": _iso(now - timedelta(minutes=index)),
+            "updated_at": None,
+        }
+        users.append(user)
+        (sellers if role == "seller" else buyers).append(user["id"])
+        next_user_id += 1
+
+    # Listings share one id space between the master file and data/listings.json
+    listing_stride = max(
+        [listing.get("id", 0) for listing in master.get("waste_material_listings", [])]
+        + [listing.get("id", 0) for listing in stored_listings]
+    )
+    locations = sorted({listing.get("location") for listing in master.get("waste_material_listings", []) if listing.get("location")})
+
+    master_listings = []
+    listings = []
+    for replica in range(scale):
+        offset = replica * listing_stride
+        for listing in master.get("waste_material_listings", []):
+            item = copy.deepcopy(listing)
+            item["id"] = listing["id"] + offset
+            if replica:
+                item["title"] = f"{listing.get('title')} #{replica}"
+                item["location"] = rng.choice(locations) if locations else item.get("location")
+                item["price_per_unit"] = _jitter(rng, item.get("price_per_unit"))
+                item["views"] = _jitter(rng, item.get("views"))
+            master_listings.append(item)
+        for listing in stored_listings:
+            item = copy.deepcopy(listing)
+            item["id"] = listing["id"] + offset
+            if replica:
+                item["title"] = f"{listing.get('title')} #{replica}"
+                item["seller_id"] = rng.choice(sellers)
+            listings.append(item)
+
+    master["waste_material_listings"] = master_listings
+    master["machinery_listings"] = _replicate_string_ids(master.get("machinery_listings", []), scale, "id", rng)
+    master["all_shutdown_machinery"] = _replicate_string_ids(master.get("all_shutdown_machinery", []), scale, "id", rng)
+    master["company_shutdowns"] = _replicate_string_ids(master.get("company_shutdowns", []), scale, "company_id", rng)
+
+    # Auctions stay open for the whole run so bids are accepted
+    auction_stride = max((auction.get("id", 0) for auction in base_auctions), default=0)
+    auctions, bids = [], []
+    for replica in range(scale):
+        for auction in base_auctions:
+            item = copy.deepcopy(auction)
+            item["id"] = auction["id"] + replica * auction_stride
+            item["listing_id"] = auction["listing_id"] + replica * listing_stride
+            item["start_time"] = item["created_at"] = item["updated_at"] = _iso(now - timedelta(hours=rng.randint(1, 12)))
+            item["end_time"] = _iso(now + timedelta(hours=rng.randint(24, 72)))
+            item["is_active"] = True
+            amount = float(item.get("starting_bid") or 1000.0)
+            for bid_index in range(BIDS_PER_AUCTION):
+                amount = round(amount * rng.uniform(1.01, 1.1), 2)
+                bids.append({
+                    "id": len(bids) + 1,
+                    "auction_id": item["id"],
+                    "bidder_id": rng.choice(buyers),
+                    "amount": amount,
+                    "is_winning": bid_index == BIDS_PER_AUCTION - 1,
+                    "created_at": _iso(now - timedelta(minutes=rng.randint(1, 600))),
+                })
+            item["current_highest_bid"] = amount
+            item["bid_count"] = BIDS_PER_AUCTION
+            auctions.append(item)
+
+    # A sold/expired listing closes its auction, so auctioned lots are kept active
+    auctioned = {auction["listing_id"] for auction in auctions}
+    for listing in listings:
+        if listing["id"] in auctioned:
+            listing["status"] = "active"
+
+    order_stride = max((order.get("id", 0) for order in base_orders), default=0)
+    orders = []
+    for replica in range(scale):
+        for order in base_orders:
+            item = copy.deepcopy(order)
+            item["id"] = order["id"] + replica * order_stride
+            item["listing_id"] = order.get("listing_id", 0) + replica * listing_stride
+            if replica:
+                item["external_id"] = f"{order.get('external_id')}-{replica}"
+                item["buyer_id"] = rng.choice(buyers)
+                item["quantity"] = _jitter(rng, item.get("quantity"))
+            orders.append(item)
+
+    _dump(mock_dir / MASTER_FILE, master)
+    _dump(data_dir / "users.json", users)
+    _dump(data_dir / "listings.json", listings)
+    _dump(data_dir / "auctions.json", auctions)
+    _dump(data_dir / "bids.json", bids)
+    _dump(data_dir / "orders.json", orders)
+    shutil.copy(REPO_ROOT / "data" / "seller_applications.json", data_dir / "seller_applications.json")
+
+    return {
+        "users": len(users),
+        "master_listings": len(master_listings),
+        "listings": len(listings),
+        "machinery": len(master["machinery_listings"]) + len(master["all_shutdown_machinery"]),
+        "auctions": len(auctions),
+        "bids": len(bids),
+        "orders": len(orders),
+        "master_file_bytes": (mock_dir / MASTER_FILE).stat().st_size,
+        "buyer_ids": buyers[:50],
+        "auction_ids": [auction["id"] for auction in auctions],
+    }
+
+
+# ---------------------------------------------------------------------------
+# In-process load generation (runs inside the worker process)
+# ---------------------------------------------------------------------------
+
+def _peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _stub_watson(latency: float):
+    """Replace the upstream model calls with a fixed-latency canned answer"""
+    from app.services.watson_service import get_watson_service
+
+    service = get_watson_service()
+    service.orchestrate_enabled = False
+    service.watsonx_enabled = True
+
+    async def generate(message, conversation_history=None, context_data=None, user_role=None):
+        await asyncio.sleep(latency)
+        return f"Here is what I found about: {message[:60]}"
+
+    service._generate_from_backends = generate
+    service.prefetch_tokens = lambda message: None
+
+
+def _scenarios(meta: Dict[str, Any], tokens: Dict[str, str]) -> Dict[str, Callable[[int], Request]]:
+    auction_ids = meta["auction_ids"]
+    bid_amounts = itertools.count()
+    buyer_auth = {"Authorization": f"Bearer {tokens['buyer']}"}
+    searches = ["plastic", "metal", "paper", "textile", "glass"]
+    materials = ["HDPE", "cardboard", "copper scrap", "fly ash", "rice husk"]
+
+    def bid(k: int) -> Request:
+        # Amounts only grow, so bids are valid unless two on one auction land out of order
+        amount = 10_000_000 + next(bid_amounts)
+        auction_id = auction_ids[k % len(auction_ids)]
+        return "POST", f"/api/auctions/{auction_id}/bid", {
+            "json": {"amount": amount, "auction_id": auction_id},
+            "headers": buyer_auth,
+        }
+
+    return {
+        "listings": lambda k: ("GET", f"/api/listings?skip={(k * 20) % 200}&limit=20", {}),
+        "listings_search": lambda k: ("GET", f"/api/listings?search={searches[k % len(searches)]}", {}),
+        "machinery": lambda k: ("GET", f"/api/machinery?skip={(k * 10) % 50}&limit=20", {}),
+        "auctions_active": lambda k: ("GET", "/api/auctions/active", {}),
+        "bid": bid,
+        "dashboard_seller": lambda k: ("GET", "/api/dashboard/seller", {}),
+        "dashboard_buyer": lambda k: ("GET", "/api/dashboard/buyer", {}),
+        "orders": lambda k: ("GET", "/api/orders", {}),
+        "chat": lambda k: ("POST", "/api/chatbot/chat", {
+            "json": {"message": f"Which {materials[k % len(materials)]} lots are available near Pune, batch {k}?"},
+        }),
+    }
+
+
+async def _run_scenario(client, build: Callable[[int], Request], requests: int, concurrency: int, time_limit: float, warmup: int) -> Dict[str, Any]:
+    from app.services.circuit_breaker import percentile
+
+    for k in range(warmup):
+        method, url, kwargs = build(k)
+        await client.request(method, url, **kwargs)
+
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    counter = itertools.count(warmup)
+    started = time.perf_counter()
+    deadline = started + time_limit
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            k = next(counter)
+            if k >= warmup + requests:
+                return
+            method, url, kwargs = build(k)
+            sent = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - sent)
+            statuses[response.status_code] += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    def ms(value):
+        return round(value * 1000, 2) if value is not None else None
+
+    return {
+        "requests": len(latencies),
+        "errors": sum(count for status, count in statuses.items() if status >= 400),
+        "status_counts": {str(status): count for status, count in sorted(statuses.items())},
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": ms(percentile(latencies, 0.5)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+        "max_ms": ms(max(latencies) if latencies else None),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+async def _drive(args, meta: Dict[str, Any]) -> Dict[str, Any]:
+    import httpx
+    from app.main import app
+    from app.utils.auth import create_access_token
+    from app.utils.mock_storage import get_user_by_id
+
+    _stub_watson(args.watson_latency_ms / 1000)
+    buyer = get_user_by_id(meta["buyer_ids"][0])
+    tokens = {"buyer": create_access_token({"sub": buyer["email"]})}
+
+    scenarios = _scenarios(meta, tokens)
+    selected = args.scenarios or list(scenarios)
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name in selected:
+            results[name] = await _run_scenario(
+                client, scenarios[name], args.requests, args.concurrency, args.time_limit, args.warmup
+            )
+            print(f"   {name}: {results[name]['throughput_rps']} req/s, p99 {results[name]['p99_ms']} ms", file=sys.stderr)
+    return results
+
+
+def run_worker(args) -> Dict[str, Any]:
+    # The temporary copy of the app (cwd) must win over the checked-out one
+    sys.path.insert(0, os.getcwd())
+    import logging
+    # Request-level INFO logging would dominate the timings of the fast endpoints
+    logging.disable(logging.INFO)
+
+    meta = json.loads(Path("bench_meta.json").read_text())
+    import_started = time.perf_counter()
+    import app.main  # noqa: F401
+    import_seconds = time.perf_counter() - import_started
+    scenarios = asyncio.run(_drive(args, meta))
+    return {
+        "app_import_seconds": round(import_seconds, 3),
+        "scenarios": scenarios,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Orchestration
+# ---------------------------------------------------------------------------
+
+def run_scale(args, scale: int) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix=f"bench-{scale}x-") as tmp:
+        root = Path(tmp)
+        shutil.copytree(REPO_ROOT / "app", root / "app", ignore=shutil.ignore_patterns("__pycache__"))
+        (root / "uploads").mkdir()
+        generation_started = time.perf_counter()
+        meta = build_dataset(root, scale, args.seed)
+        generation_seconds = time.perf_counter() - generation_started
+        (root / "bench_meta.json").write_text(json.dumps(meta))
+
+        command = [sys.executable, str(Path(__file__).resolve()), "--worker"]
+        command += ["--requests", str(args.requests), "--concurrency", str(args.concurrency)]
+        command += ["--time-limit", str(args.time_limit), "--warmup", str(args.warmup)]
+        command += ["--watson-latency-ms", str(args.watson_latency_ms)]
+        if args.scenarios:
+            command += ["--scenarios", *args.scenarios]
+        env = {**os.environ, "PYTHONPATH": str(root), "PYTHONDONTWRITEBYTECODE": "1"}
+        proc = subprocess.run(command, cwd=root, env=env, stdout=subprocess.PIPE, text=True)
+
+        dataset = {key: value for key, value in meta.items() if not key.endswith("_ids")}
+        dataset["generation_seconds"] = round(generation_seconds, 2)
+        if proc.returncode != 0:
+            return {"scale": scale, "dataset": dataset, "error": f"worker exited with status {proc.returncode}"}
+        # The app may print to stdout; the report is the last line
+        report = json.loads(proc.stdout.strip().splitlines()[-1])
+        return {"scale": scale, "dataset": dataset, **report}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the hot API paths at growing data sizes")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100, 1000], help="Dataset multiples of mock_data")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--time-limit", type=float, default=30.0, help="Seconds per scenario before stopping early")
+    parser.add_argument("--warmup", type=int, default=3, help="Unmeasured requests before each scenario")
+    parser.add_argument("--watson-latency-ms", type=float, default=50.0, help="Latency of the stubbed Watson call")
+    parser.add_argument("--scenarios", nargs="+", help="Subset of scenarios to run (default: all)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.worker:
+        print(json.dumps(run_worker(args)))
+        return
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "time_limit_seconds": args.time_limit,
+            "watson_latency_ms": args.watson_latency_ms,
+        },
+        "scales": [],
+    }
+    for scale in args.scales:
+        print(f"📊 Benchmarking {scale}x dataset", file=sys.stderr)
+        report["scales"].append(run_scale(args, scale))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,14 @@ if [ -d "venv" ]; then
     source venv/bin/activate
 fi
 
-# Run the FastAPI server
-uvicorn app.main:app --reload --host 0.0.0.0 --port 8000
+# Prebuild the catalog snapshot and the shared catalog once, before any worker starts
+python -m app.utils.shared_catalog || true
+
+# Run the FastAPI server; WORKERS>1 runs several processes sharing the mapped catalog
+WORKERS=${WORKERS:-1}
+if [ "$WORKERS" -gt 1 ]; then
+    uvicorn app.main:app --workers "$WORKERS" --host 0.0.0.0 --port 8000
+else
+    uvicorn app.main:app --reload --host 0.0.0.0 --port 8000
+fi
 
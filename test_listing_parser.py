@@ -0,0 +1,86 @@
+"""
+Unit tests for the local listing parser (app/services/listing_parser.py)
+Run with: python -m pytest test_listing_parser.py
+"""
+from app.config import settings
+from app.services.listing_parser import parse_listing_message
+
+
+def _accepted(parsed) -> bool:
+    # The chatbot only skips watsonx when the local parse reaches this threshold
+    return parsed.confidence >= settings.LISTING_PARSER_MIN_CONFIDENCE
+
+
+def test_known_city_with_price_phrase():
+    parsed = parse_listing_message("20 tons copper scrap at 5000 per ton in Mumbai, auction")
+    assert parsed.fields["location"] == "Mumbai"
+    assert parsed.fields["price_per_unit"] == 5000
+    assert parsed.fields["sale_type"] == "auction"
+    assert _accepted(parsed)
+
+
+def test_currency_after_at_is_not_a_location():
+    parsed = parse_listing_message("I have 50 tons of rice husk at Rs 3000 per ton in Ludhiana")
+    assert parsed.fields["location"] == "Ludhiana"
+    assert parsed.fields["price_per_unit"] == 3000
+    # Ludhiana is not a known city, so watsonx gets to confirm it
+    assert not _accepted(parsed)
+
+
+def test_price_phrase_without_place():
+    for message in (
+        "50 tons rice husk at Rs 3000 per ton",
+        "50 tons rice husk at INR 3000 per ton",
+        "50 tons rice husk at USD 40 per ton",
+        "50 tons rice husk at Rupees 3000 per ton",
+    ):
+        parsed = parse_listing_message(message)
+        assert "location" not in parsed.fields, message
+        assert "location" in parsed.missing, message
+        assert not _accepted(parsed), message
+
+
+def test_in_phrase_preferred_over_at():
+    parsed = parse_listing_message("10 tons PET bottles at Rs 20 per kg at Green Park in Surat")
+    assert parsed.fields["location"] == "Surat"
+
+
+def test_rupee_symbol_and_per_unit_forms():
+    cases = {
+        "50 tons rice husk at Rs. 3000/ton from Pune": 3000,
+        "50 tons rice husk ₹3,000 per ton in Pune": 3000,
+        "50 tons rice husk 3000 rupees per ton in Pune": 3000,
+        "50 tons rice husk at 1.2 lakh per ton in Pune": 120000,
+    }
+    for message, price in cases.items():
+        parsed = parse_listing_message(message)
+        assert parsed.fields["price_per_unit"] == price, message
+        assert parsed.fields["location"] == "Pune", message
+
+
+def test_price_per_other_unit_lowers_confidence():
+    parsed = parse_listing_message("Selling 20 tons HDPE scrap at ₹45 per kg located in Surat")
+    assert parsed.fields["price_per_unit"] == 45
+    assert not _accepted(parsed)
+
+
+def test_lot_total_is_split_by_quantity():
+    for message in (
+        "5 tons of PET bottles for 30000 rupees total in Delhi",
+        "5 tons of PET bottles, total price 30000 rupees, Delhi",
+        "Lump sum ₹30000 for 5 tons HDPE scrap in Delhi",
+    ):
+        parsed = parse_listing_message(message)
+        assert parsed.fields["price_per_unit"] == 6000, message
+
+
+def test_lot_total_without_quantity_is_dropped():
+    parsed = parse_listing_message("30000 rupees total for PET bottles in Delhi")
+    assert "price_per_unit" in parsed.missing
+    assert not _accepted(parsed)
+
+
+def test_negated_sale_type_is_ignored():
+    parsed = parse_listing_message("Selling 10 tons aluminium at 1.2 lakh per ton in Chennai, not an auction")
+    assert "sale_type" not in parsed.fields
+    assert parsed.fields["price_per_unit"] == 120000